@@ -1,5 +1,6 @@
 from .connector import FedapayConnector  # noqa: F401
 from .integration import Integration # noqa: F401
+from .event_bus import EventBus, InProcessEventBus, SQLiteEventBus  # noqa: F401
 from .models import *  # noqa: F403
 from .enums import *  # noqa: F403
 from .types import *  # noqa: F403
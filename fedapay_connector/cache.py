@@ -0,0 +1,198 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .enums import TransactionStatus
+from .models import LazyWebhookTransaction, Transaction, TransactionCacheStats
+
+# statuts non finaux : l'état peut encore changer, l'entrée expire au bout de `ttl` secondes
+_PENDING_STATUSES = (TransactionStatus.created, TransactionStatus.pending)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "status", "expires_at")
+
+    def __init__(
+        self,
+        value: Transaction | LazyWebhookTransaction,
+        status: Optional[TransactionStatus],
+        expires_at: Optional[float],
+    ):
+        self.value = value
+        self.status = status
+        self.expires_at = expires_at
+
+
+class TransactionCache:
+    """
+    Cache mémoire LRU des transactions FedaPay, indexé par ID et par référence marchande.
+
+    Une transaction encore en attente ('created' ou 'pending') est conservée `ttl` secondes ;
+    une transaction dans un statut final est conservée `final_ttl` secondes (None = sans limite),
+    son évolution éventuelle (remboursement, transfert...) étant notifiée par webhook. Cette durée
+    borne l'écart avec FedaPay lorsqu'un webhook n'atteint pas ce processus. Au-delà de
+    `max_entries` transactions, les moins récemment consultées sont évincées.
+
+    Les webhooks reçus mettent le cache à jour sans validation complète : le webhook est
+    conservé tel quel et la transaction n'est validée qu'à sa première lecture. Un webhook
+    tardif qui ramènerait une transaction finale à un statut en attente est ignoré.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        ttl: float = 30,
+        max_entries: int = 10_000,
+        final_ttl: Optional[float] = 3600,
+    ):
+        self._logger = logger
+        self.ttl = ttl
+        self.final_ttl = final_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._merchant_references: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._webhook_updates = 0
+        self._evicted_expired = 0
+        self._evicted_capacity = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expires_at(self, status: Optional[TransactionStatus]) -> Optional[float]:
+        if status in _PENDING_STATUSES:
+            return time.time() + self.ttl
+        if self.final_ttl is not None:
+            return time.time() + self.final_ttl
+        return None
+
+    def _store(
+        self,
+        id_transaction: int,
+        value: Transaction | LazyWebhookTransaction,
+        status: Optional[TransactionStatus],
+    ):
+        self._entries.pop(id_transaction, None)
+        self._entries[id_transaction] = _CacheEntry(
+            value, status, self._expires_at(status)
+        )
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evicted_capacity += 1
+        # l'index par référence marchande peut pointer vers une entrée évincée : vérifié à la lecture
+        if len(self._merchant_references) > 2 * self.max_entries:
+            self._merchant_references = {
+                reference: id_transaction
+                for reference, id_transaction in self._merchant_references.items()
+                if id_transaction in self._entries
+            }
+
+    def put(self, transaction: Transaction):
+        """
+        Enregistre une transaction lue depuis l'API.
+        """
+        if transaction.id is None:
+            return
+        self._store(transaction.id, transaction, transaction.status)
+        if transaction.merchant_reference:
+            self._merchant_references[transaction.merchant_reference] = transaction.id
+
+    def update_from_webhook(self, event: LazyWebhookTransaction):
+        """
+        Remplace la transaction en cache par celle portée par le webhook, validée à la première lecture.
+        Un webhook en attente ('created', 'pending') ne remplace pas une transaction finale : arrivé
+        en retard ou dans le désordre, il ramènerait un statut périmé.
+        """
+        if event.id_transaction is None:
+            return
+        entry = self._entries.get(event.id_transaction)
+        if (
+            entry is not None
+            and event.status in _PENDING_STATUSES
+            and entry.status is not None
+            and entry.status not in _PENDING_STATUSES
+        ):
+            self._logger.debug(
+                f"Webhook {event.name} ignoré pour la transaction {event.id_transaction} : statut final déjà connu ({entry.status.value})."
+            )
+            return
+        self._store(event.id_transaction, event, event.status)
+        self._webhook_updates += 1
+
+    def get(
+        self, id_transaction: int, final_only: bool = False
+    ) -> Optional[Transaction]:
+        """
+        Retourne la transaction en cache, ou None si elle est absente ou expirée.
+
+        Args:
+            id_transaction (int): ID FedaPay de la transaction.
+            final_only (bool): N'accepte que les transactions dans un statut final.
+        """
+        entry = self._entries.get(id_transaction)
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.time():
+            del self._entries[id_transaction]
+            self._evicted_expired += 1
+            self._misses += 1
+            return None
+
+        value = entry.value
+        if isinstance(value, LazyWebhookTransaction):
+            try:
+                value = value.full.entity
+            except Exception as e:
+                self._logger.warning(
+                    f"Webhook en cache invalide pour la transaction {id_transaction} : {e}"
+                )
+                del self._entries[id_transaction]
+                self._misses += 1
+                return None
+            entry.value = value
+            if value.merchant_reference:
+                self._merchant_references[value.merchant_reference] = id_transaction
+
+        if final_only and value.status in _PENDING_STATUSES:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(id_transaction)
+        self._hits += 1
+        return value
+
+    def get_by_merchant_reference(
+        self, merchant_reference: str, final_only: bool = False
+    ) -> Optional[Transaction]:
+        """
+        Retourne la transaction en cache correspondant à la référence marchande, ou None.
+        """
+        id_transaction = self._merchant_references.get(merchant_reference)
+        if id_transaction is None:
+            self._misses += 1
+            return None
+        return self.get(id_transaction, final_only)
+
+    def invalidate(self, id_transaction: int):
+        """
+        Retire une transaction du cache (ex: après sa suppression côté FedaPay).
+        """
+        self._entries.pop(id_transaction, None)
+
+    def stats(self) -> TransactionCacheStats:
+        """
+        Retourne les métriques du cache (taille, succès, échecs, mises à jour par webhook, évictions).
+        """
+        return TransactionCacheStats(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl=self.ttl,
+            final_ttl=self.final_ttl,
+            hits=self._hits,
+            misses=self._misses,
+            webhook_updates=self._webhook_updates,
+            evicted_expired=self._evicted_expired,
+            evicted_capacity=self._evicted_capacity,
+        )
@@ -18,6 +18,7 @@ avec ce programme. Si ce n'est pas le cas, consultez <https://www.gnu.org/licens
 """
 
 import aiohttp
+from fastapi import APIRouter
 from .exceptions import (
     ConfigError,
     FedapayServerError,
@@ -25,30 +26,51 @@ from .exceptions import (
 )
 from .enums import (
     EventFutureStatus,
+    FinaliseReturnWhen,
     TypesPaiement,
     TransactionStatus,
     ExceptionOnProcessReloadBehavior,
+    PersistenceDurability,
+    WebhookServerMode,
 )
 from .event import FedapayEvent
-from .integrations import Transactions
+from .event_bus import EventBus, InProcessEventBus
+from .cache import TransactionCache
+from .inbox import WebhookInbox
+from .ingestion import WebhookIngestionQueue
+from .integrations import Transactions, HttpClient, RateLimiter, RetryPolicy
 from .models.models import (
     PaiementSetup,
     UserData,
     PaymentHistory,
+    PaymentRequest,
+    PaymentBatchResult,
     WebhookHistory,
     WebhookTransaction,
+    WebhookTransactionHeader,
+    LazyWebhookTransaction,
     FedapayPay,
     ListeningProcessData,
+    PaymentStagesLatency,
+    TransactionToken,
+    DeduplicationStats,
+    TransactionCacheStats,
+    SingleFlightStats,
+    RateLimitLaneStats,
+    RetryStats,
+    WebhookQueueStats,
+    Transaction,
 )
 from .utils import initialize_logger, validate_callback
 from .types import (
     OnPersistedProcessReloadFinishedCallback,
+    PersistedProcessReloadProgressCallback,
     WebhookCallback,
     PaymentCallback,
 )
 from .server import WebhookServer
-from typing import Dict, Optional
-import os, asyncio  # noqa: E401
+from typing import AsyncIterator, Dict, Optional
+import os, asyncio, json, time  # noqa: E401
 
 
 class FedapayConnector:
@@ -76,6 +98,40 @@ class FedapayConnector:
         save_log_to_file (Optional[bool]): Sauvegarder les logs dans un fichier.
         callback_timeout (Optional[float]): Délai max. d'attente pour la finalisation des tâches de callback lors de l'arrêt (`shutdown_cleanup`).
         db_url (Optional[str]): URL de connexion à la base de données pour la persistance des processus d'écoute (par défaut: SQLite).
+        http_pool_limit (Optional[int]): Nombre maximal de connexions HTTP simultanées vers l'API FedaPay (0 = illimité).
+        http_pool_limit_per_host (Optional[int]): Nombre maximal de connexions HTTP simultanées par hôte (0 = illimité).
+        http_keepalive_timeout (Optional[float]): Durée de conservation (en secondes) des connexions inactives du pool.
+        http_dns_cache_ttl (Optional[int]): Durée de vie (en secondes) du cache DNS du pool.
+        http_coalesce_reads (Optional[bool]): Regroupe les lectures identiques simultanées (GET, même URL, mêmes paramètres, même clé API) en une seule requête vers l'API FedaPay.
+        http_rate_limiting (Optional[bool]): Active la régulation côté client des appels à l'API FedaPay, par clé API et par classe d'endpoint : concurrence adaptative (AIMD) réduite à chaque 429 et pause respectant `Retry-After`.
+        http_rate_limit (Optional[float]): Débit maximal (requêtes par seconde) par clé API et par classe d'endpoint (None = non borné).
+        http_rate_burst (Optional[float]): Nombre de requêtes pouvant partir en rafale avant que `http_rate_limit` ne s'applique (par défaut: `http_rate_limit`).
+        http_max_concurrency (Optional[int]): Limite haute de requêtes simultanées par clé API et par classe d'endpoint.
+        http_max_retries (Optional[int]): Nombre maximal de nouvelles tentatives après une erreur transitoire (coupure réseau, délai dépassé, 429, 5xx) sur les requêtes idempotentes (GET, DELETE) ; une création de transaction n'est rejouée que si elle porte une `merchant_reference`, recherchée au préalable pour éviter un doublon (0 = désactivé).
+        http_retry_backoff (Optional[float]): Délai de base (en secondes) du backoff exponentiel avec gigue entre deux tentatives.
+        http_retry_backoff_max (Optional[float]): Délai maximal (en secondes) entre deux tentatives ; un `Retry-After` plus long n'est pas attendu.
+        http_hedge_after (Optional[float]): Délai (en secondes) au-delà duquel une requête GET sans réponse est doublée d'une seconde requête identique, la première réponse étant retenue (None = désactivé).
+        persistence_durability (Optional[PersistenceDurability]): Niveau de durabilité des écritures de persistance (SYNC : un commit par opération, GROUP_COMMIT : commit groupé attendu par l'appelant, ASYNC : écriture différée sans attente).
+        persistence_flush_interval (Optional[float]): Fenêtre (en secondes) de regroupement des écritures de persistance.
+        persistence_max_batch_size (Optional[int]): Nombre de processus en attente déclenchant une écriture immédiate du lot.
+        processed_events_ttl (Optional[float]): Durée (en secondes) pendant laquelle un événement webhook traité est mémorisé pour la déduplication.
+        processed_events_max_entries (Optional[int]): Nombre maximal d'événements webhook traités mémorisés (les plus anciens sont évincés au-delà).
+        persist_processed_events (Optional[bool]): Persiste les événements webhook traités afin que la déduplication survive à un redémarrage.
+        reload_chunk_size (Optional[int]): Nombre de processus d'écoute persistés lus par lot lors du rechargement.
+        reload_status_concurrency (Optional[int]): Nombre maximal de requêtes simultanées de vérification d'état lors du rechargement.
+        reload_status_rate_limit (Optional[float]): Nombre maximal de requêtes de vérification d'état par seconde lors du rechargement (None = illimité).
+        listen_server_mode (Optional[WebhookServerMode]): Mode d'exécution du serveur webhook intégré : THREAD (thread dédié) ou IN_LOOP (tâche de la boucle asyncio de l'application).
+        event_bus (Optional[EventBus]): Bus de diffusion des webhooks entre workers (ex: `SQLiteEventBus` pour plusieurs workers uvicorn/gunicorn). Par défaut `InProcessEventBus` (processus unique).
+        webhook_queue_size (Optional[int]): Capacité de la file d'ingestion des webhooks. Si fournie, la route webhook répond dès la signature vérifiée et le traitement est assuré en arrière-plan (503 si la file est saturée). None = traitement avant réponse.
+        webhook_queue_workers (Optional[int]): Nombre de tâches traitant la file d'ingestion des webhooks.
+        webhook_queue_spill_path (Optional[str]): Fichier de débordement de la file d'ingestion : les webhooks au-delà de la capacité y sont écrits au lieu d'être refusés, et y sont conservés à l'arrêt s'ils n'ont pas pu être traités.
+        webhook_inbox_dir (Optional[str]): Dossier de l'inbox durable des webhooks. Si fourni, chaque webhook vérifié y est enregistré (fsync groupé) avant d'être acquitté, puis relu par `load_persisted_listening_processes` au redémarrage. None = désactivé.
+        webhook_inbox_segment_size (Optional[int]): Taille (en octets) à partir de laquelle un nouveau segment de l'inbox est ouvert.
+        webhook_inbox_retention (Optional[float]): Durée (en secondes) de conservation et de relecture des webhooks de l'inbox.
+        store_webhook_payloads (Optional[bool]): Conserve en mémoire le webhook complet reçu pour chaque transaction suivie. Si False, seuls le nom, le statut et la date de réception sont gardés et `fedapay_finalise` retourne un `WebhookTransaction` partiel (nom, id, statut).
+        transaction_cache_size (Optional[int]): Nombre maximal de transactions gardées dans le cache des lectures (`fedapay_get_transaction_data`...). 0 ou None = cache désactivé.
+        transaction_cache_ttl (Optional[float]): Durée (en secondes) de conservation en cache d'une transaction en attente.
+        transaction_cache_final_ttl (Optional[float]): Durée (en secondes) de conservation en cache d'une transaction finalisée, mise à jour entre-temps par les webhooks reçus (None = jusqu'à son éviction).
 
     Note:
         La configuration utilise la hiérarchie: Arguments passés > Variables d'environnement.
@@ -105,6 +161,42 @@ class FedapayConnector:
         db_url: Optional[str] = os.getenv(
             "FEDAPAY_DB_URL", "sqlite:///fedapay_connector_persisted_data/processes.db"
         ),
+        http_pool_limit: Optional[int] = 100,
+        http_pool_limit_per_host: Optional[int] = 0,
+        http_keepalive_timeout: Optional[float] = 30,
+        http_dns_cache_ttl: Optional[int] = 300,
+        http_coalesce_reads: Optional[bool] = True,
+        http_rate_limiting: Optional[bool] = True,
+        http_rate_limit: Optional[float] = None,
+        http_rate_burst: Optional[float] = None,
+        http_max_concurrency: Optional[int] = 100,
+        http_max_retries: Optional[int] = 2,
+        http_retry_backoff: Optional[float] = 0.25,
+        http_retry_backoff_max: Optional[float] = 5.0,
+        http_hedge_after: Optional[float] = None,
+        persistence_durability: Optional[
+            PersistenceDurability
+        ] = PersistenceDurability.GROUP_COMMIT,
+        persistence_flush_interval: Optional[float] = 0.005,
+        persistence_max_batch_size: Optional[int] = 200,
+        processed_events_ttl: Optional[float] = 86400,
+        processed_events_max_entries: Optional[int] = 100_000,
+        persist_processed_events: Optional[bool] = False,
+        reload_chunk_size: Optional[int] = 500,
+        reload_status_concurrency: Optional[int] = 10,
+        reload_status_rate_limit: Optional[float] = None,
+        listen_server_mode: Optional[WebhookServerMode] = WebhookServerMode.THREAD,
+        event_bus: Optional[EventBus] = None,
+        webhook_queue_size: Optional[int] = None,
+        webhook_queue_workers: Optional[int] = 4,
+        webhook_queue_spill_path: Optional[str] = None,
+        webhook_inbox_dir: Optional[str] = None,
+        webhook_inbox_segment_size: Optional[int] = 64 * 1024 * 1024,
+        webhook_inbox_retention: Optional[float] = 86400,
+        store_webhook_payloads: Optional[bool] = True,
+        transaction_cache_size: Optional[int] = 10_000,
+        transaction_cache_ttl: Optional[float] = 30,
+        transaction_cache_final_ttl: Optional[float] = 3600,
     ):
         if self._init is False:
             self._logger = initialize_logger(print_log_to_console, save_log_to_file)
@@ -113,10 +205,47 @@ class FedapayConnector:
 
             self.default_api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY")
 
+            # Pool de connexions partagé par tous les appels à l'API FedaPay
+            self._http_client = HttpClient(
+                logger=self._logger,
+                pool_limit=http_pool_limit,
+                pool_limit_per_host=http_pool_limit_per_host,
+                keepalive_timeout=http_keepalive_timeout,
+                dns_cache_ttl=http_dns_cache_ttl,
+                coalesce_reads=http_coalesce_reads,
+                rate_limiter=RateLimiter(
+                    rate=http_rate_limit,
+                    burst=http_rate_burst,
+                    max_concurrency=http_max_concurrency,
+                )
+                if http_rate_limiting
+                else None,
+                retry_policy=RetryPolicy(
+                    max_retries=http_max_retries,
+                    backoff_base=http_retry_backoff,
+                    backoff_max=http_retry_backoff_max,
+                    hedge_after=http_hedge_after,
+                )
+                if http_max_retries or http_hedge_after
+                else None,
+            )
+
             self._transactions_service = Transactions(
-                api_url=self.fedapay_api_url, logger=self._logger
+                api_url=self.fedapay_api_url,
+                logger=self._logger,
+                http_client=self._http_client,
             )
 
+            # cache des transactions lues, tenu à jour par les webhooks reçus
+            self._transaction_cache: Optional[TransactionCache] = None
+            if transaction_cache_size:
+                self._transaction_cache = TransactionCache(
+                    logger=self._logger,
+                    ttl=transaction_cache_ttl,
+                    max_entries=transaction_cache_size,
+                    final_ttl=transaction_cache_final_ttl,
+                )
+
             self.listen_server_port = listen_server_port
             self.listen_server_endpoint_name = listen_server_endpoint_name
 
@@ -137,24 +266,63 @@ class FedapayConnector:
                 ExceptionOnProcessReloadBehavior.KEEP_AND_RETRY,
                 self.accepted_transaction,
                 db_url=db_url,
+                persistence_durability=persistence_durability,
+                persistence_flush_interval=persistence_flush_interval,
+                persistence_max_batch_size=persistence_max_batch_size,
+                processed_events_ttl=processed_events_ttl,
+                processed_events_max_entries=processed_events_max_entries,
+                persist_processed_events=persist_processed_events,
+                reload_chunk_size=reload_chunk_size,
+                store_webhook_payloads=store_webhook_payloads,
             )
             self._event_manager.set_run_at_persisted_process_reload_callback(
                 callback=self._run_on_reload_callback
             )
+            self._event_manager.set_run_at_persisted_processes_batch_reload_callback(
+                callback=self._run_on_reload_batch_callback
+            )
+            self.reload_status_concurrency = reload_status_concurrency
+            self.reload_status_rate_limit = reload_status_rate_limit
+            # partagés par tous les lots d'un même rechargement, dont les réconciliations sont concurrentes
+            self._reload_status_semaphore: Optional[asyncio.Semaphore] = None
+            self._reload_status_next_slot = 0.0
             self._event_manager.set_run_before_timeout_callback(
                 callback=self._run_on_transaction_timeout_callback
             )
             self._payment_callback: PaymentCallback = None
             self._webhooks_callback: WebhookCallback = None
 
-            if use_listen_server is True:
-                self.webhook_server = WebhookServer(
+            # diffusion des webhooks vers le worker propriétaire de l'écoute
+            self._event_bus: EventBus = event_bus or InProcessEventBus()
+            self._event_bus_lock = asyncio.Lock()
+
+            # file d'ingestion : acquittement immédiat des webhooks, traitement en arrière-plan
+            self._webhook_queue: Optional[WebhookIngestionQueue] = None
+            if webhook_queue_size:
+                self._webhook_queue = WebhookIngestionQueue(
                     logger=self._logger,
-                    endpoint=listen_server_endpoint_name,
-                    port=listen_server_port,
-                    fedapay_auth_key=fedapay_webhooks_secret_key,
+                    handler=self._process_webhook_data,
+                    max_size=webhook_queue_size,
+                    workers=webhook_queue_workers,
+                    spill_path=webhook_queue_spill_path,
                 )
 
+            # inbox durable : les webhooks sont journalisés avant acquittement et relus au redémarrage
+            self._webhook_inbox: Optional[WebhookInbox] = None
+            if webhook_inbox_dir:
+                self._webhook_inbox = WebhookInbox(
+                    logger=self._logger,
+                    directory=webhook_inbox_dir,
+                    segment_max_bytes=webhook_inbox_segment_size,
+                    retention=webhook_inbox_retention,
+                )
+
+            self.fedapay_webhooks_secret_key = fedapay_webhooks_secret_key
+            self.listen_server_mode = listen_server_mode
+            self.webhook_server: Optional[WebhookServer] = None
+            if use_listen_server is True:
+                self.webhook_server = self._create_webhook_server()
+
             self._on_reload_finished_callback: Optional[
                 OnPersistedProcessReloadFinishedCallback
             ] = None
@@ -189,11 +357,29 @@ class FedapayConnector:
         """
 
         try:
-            transaction = (
-                await self._transactions_service._get_transaction_by_fedapay_id(
-                    fedapay_id=data.id_transaction, api_key=self.default_api_key
-                )
+            transaction = await self._get_reload_status(data.id_transaction)
+        except asyncio.CancelledError:
+            self._logger.info(
+                f"Annulation de l'attente pour la transaction {data.id_transaction} -- arret normal"
             )
+            return EventFutureStatus.CANCELLED_INTERNALLY, None
+
+        except Exception as e:
+            self._logger.error(
+                f"Erreur dans le callback de rechargement : {e}", stack_info=True
+            )
+            raise e
+
+        return await self._reload_with_transaction(data, transaction)
+
+    async def _reload_with_transaction(
+        self, data: ListeningProcessData, transaction: Transaction
+    ):
+        """
+        Rétablit l'écoute d'une transaction persistée dont l'état FedaPay est déjà connu,
+        puis appelle le callback de fin de rechargement.
+        """
+        try:
             if transaction.status == TransactionStatus.pending:
                 # on remet l'écoute en place et on attend le timeout ou une notification de fedapay
 
@@ -209,7 +395,7 @@ class FedapayConnector:
                 )
 
                 result: EventFutureStatus = await asyncio.wait_for(future, None)
-                event_data = self._event_manager.pop_event_data(
+                event_data = await self._event_manager.pop_event_data_async(
                     id_transaction=data.id_transaction
                 )
             else:
@@ -238,6 +424,121 @@ class FedapayConnector:
             )
             raise e
 
+    async def _fetch_transactions(
+        self, ids_transactions: list[int]
+    ) -> Dict[int, Transaction | Exception]:
+        """
+        Récupère l'état de plusieurs transactions auprès de FedaPay.
+
+        L'API FedaPay ne documente pas de filtre par liste d'IDs sur `/v1/transactions/search` :
+        les requêtes unitaires sont donc lancées en parallèle sur le pool HTTP partagé (voir `_get_reload_status`).
+
+        Returns:
+            Dict[int, Transaction | Exception]: La transaction, ou l'erreur rencontrée, pour chaque ID.
+        """
+        results = await asyncio.gather(
+            *(
+                self._get_reload_status(id_transaction)
+                for id_transaction in ids_transactions
+            ),
+            return_exceptions=True,
+        )
+        return dict(zip(ids_transactions, results))
+
+    async def _get_reload_status(self, id_transaction: int) -> Transaction:
+        """
+        Récupère l'état d'une transaction à réconcilier au rechargement.
+
+        Les lots étant réconciliés en parallèle, la limite de `reload_status_concurrency` requêtes
+        simultanées et de `reload_status_rate_limit` requêtes par seconde est commune à tout le rechargement.
+        """
+        if self._reload_status_semaphore is None:
+            self._reload_status_semaphore = asyncio.Semaphore(
+                self.reload_status_concurrency
+            )
+        async with self._reload_status_semaphore:
+            if self.reload_status_rate_limit:
+                now = asyncio.get_running_loop().time()
+                delay = max(0.0, self._reload_status_next_slot - now)
+                self._reload_status_next_slot = (
+                    max(now, self._reload_status_next_slot)
+                    + 1 / self.reload_status_rate_limit
+                )
+                if delay:
+                    await asyncio.sleep(delay)
+            return await self._transactions_service._get_transaction_by_fedapay_id(
+                fedapay_id=id_transaction, api_key=self.default_api_key
+            )
+
+    async def _run_on_reload_batch_callback(
+        self, processes_data: list[ListeningProcessData]
+    ):
+        """
+        Version groupée de `_run_on_reload_callback`, lancée une fois par lot de processus persistés.
+
+        Les états de toutes les transactions du lot sont récupérés en parallèle, les transactions déjà
+        finalisées sont résolues immédiatement et l'écoute n'est rétablie que pour celles encore 'pending'.
+        Les transactions dont l'état n'a pu être récupéré repassent par le rechargement unitaire.
+        """
+        transactions = await self._fetch_transactions(
+            [data.id_transaction for data in processes_data]
+        )
+        pending = failed = 0
+        reloads = []
+        for data in processes_data:
+            transaction = transactions[data.id_transaction]
+            if isinstance(transaction, asyncio.CancelledError):
+                raise transaction
+            if isinstance(transaction, Exception):
+                self._logger.warning(
+                    f"État de la transaction {data.id_transaction} indisponible ({transaction}) -- rechargement unitaire"
+                )
+                failed += 1
+                reloads.append(self._run_on_reload_callback(data))
+                continue
+            if transaction.status == TransactionStatus.pending:
+                pending += 1
+            reloads.append(self._reload_with_transaction(data, transaction))
+
+        self._logger.info(
+            f"Réconciliation de {len(processes_data)} transactions : {len(processes_data) - pending - failed} déjà finalisées, {pending} en attente, {failed} à vérifier unitairement."
+        )
+        results = await asyncio.gather(*reloads, return_exceptions=True)
+        for data, result in zip(processes_data, results):
+            if isinstance(result, Exception):
+                self._logger.error(
+                    f"Erreur lors du rechargement de la transaction {data.id_transaction} : {result}"
+                )
+
+    async def _get_transaction(
+        self,
+        id_transaction: int,
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+        final_only: bool = False,
+    ) -> Transaction:
+        """
+        Lit une transaction depuis le cache si possible, sinon depuis l'API (le résultat est alors mis en cache).
+
+        Args:
+            final_only (bool): Ne se contente du cache que pour une transaction dans un statut final.
+        """
+        if self._transaction_cache is not None and use_cache:
+            cached = self._transaction_cache.get(id_transaction, final_only)
+            if cached is not None:
+                self._logger.debug(f"Transaction {id_transaction} lue depuis le cache.")
+                return cached
+        transaction = await self._transactions_service._get_transaction_by_fedapay_id(
+            fedapay_id=id_transaction, api_key=api_key or self.default_api_key
+        )
+        if self._transaction_cache is not None:
+            self._transaction_cache.put(transaction)
+        return transaction
+
+    def _invalidate_cached_transaction(self, id_transaction: int):
+        if self._transaction_cache is not None:
+            self._transaction_cache.invalidate(id_transaction)
+
     async def _run_on_transaction_timeout_callback(self, id_transaction: int) -> bool:
         """
         Exécuté juste avant qu'une transaction n'expire. Vérifie l'état actuel de la transaction
@@ -254,9 +555,8 @@ class FedapayConnector:
                 - **False** si le timeout doit être annulé et la Future résolue immédiatement (statut final trouvé).
         """
 
-        transaction = await self._transactions_service._get_transaction_by_fedapay_id(
-            fedapay_id=id_transaction, api_key=self.default_api_key
-        )
+        # un statut final déjà reçu par webhook évite l'appel à l'API
+        transaction = await self._get_transaction(id_transaction, final_only=True)
         if transaction.status == TransactionStatus.pending:
             # au timeout on suprime la transaction pour qu'elle ne soit plus disponible pour le client
             try:
@@ -267,10 +567,8 @@ class FedapayConnector:
                 if e.status == 403:
                     # operation non autorisée le status de la transaction a probablement changé entre temps
                     # on refresh la transaction et on resolve
-                    transaction = (
-                        await self._transactions_service._get_transaction_by_fedapay_id(
-                            fedapay_id=id_transaction, api_key=self.default_api_key
-                        )
+                    transaction = await self._get_transaction(
+                        id_transaction, final_only=True
                     )
                     await self._event_manager.set_event_data(
                         WebhookTransaction(
@@ -282,7 +580,7 @@ class FedapayConnector:
 
                 else:
                     # une erreur inattendue est survenue
-                    error = f"Erreur inattendue lors de la suppression de la transaction {id_transaction} -- status code: {resp.status_code} -- message: {resp.message}"
+                    error = f"Erreur inattendue lors de la suppression de la transaction {id_transaction} -- status code: {e.status} -- message: {e.message}"
                     self._logger.error(error)
                     # l'erreur déclenchera le timeout de la transaction
                     return True
@@ -290,8 +588,16 @@ class FedapayConnector:
             if resp.delete_status:
                 # Transaction supprimée coté fedapay
                 # On peut timeout la transaction en sécurité
+                self._invalidate_cached_transaction(id_transaction)
                 return True
 
+            # suppression non confirmée : le lien de paiement peut rester actif côté FedaPay
+            self._logger.error(
+                f"Suppression de la transaction {id_transaction} non confirmée -- status code: {resp.status_code} -- message: {resp.message}"
+            )
+            # l'erreur déclenchera le timeout de la transaction
+            return True
+
         else:
             # Pour une raison ou une autre on a pas recu la notification mais le status a changé
             # On ne timeout plus on resolve plutot
@@ -304,6 +610,15 @@ class FedapayConnector:
             )
             return False
 
+    async def _run_webhook_callback(self, event: LazyWebhookTransaction):
+        # la validation complète du webhook est faite dans la tâche du callback, hors du chemin de réception
+        await self._webhooks_callback(event.validate(WebhookHistory))
+
+    async def _run_payment_callback(self, result: FedapayPay):
+        # copie construite dans la tâche du callback, hors du chemin de paiement ; les champs
+        # étant déjà validés, elle ne repasse ni par la sérialisation ni par la validation
+        await self._payment_callback(PaymentHistory.model_construct(**dict(result)))
+
     def _handle_payment_callback_exception(self, task: asyncio.Task):
         try:
             task.result()
@@ -328,6 +643,33 @@ class FedapayConnector:
     # Events management
     # ----------------------------------------
 
+    async def start_event_bus(self):
+        """
+        Abonne ce worker au bus d'événements partagé (sans effet avec le bus par défaut).
+
+        L'abonnement est fait automatiquement à la première écoute ou au premier webhook reçu ;
+        l'appeler au démarrage de l'application garantit qu'aucun événement publié par un autre worker n'est manqué.
+        """
+        if self._event_bus.started or not self._event_bus.is_distributed:
+            return
+        async with self._event_bus_lock:
+            if not self._event_bus.started:
+                await self._event_bus.start(self._on_bus_event)
+
+    async def _on_bus_event(self, event: LazyWebhookTransaction):
+        """
+        Reçoit un webhook publié par un autre worker et résout l'écoute locale correspondante, s'il y en a une.
+        Sans écoute, le webhook est gardé en mémoire pour une durée limitée, sans être persisté : une
+        écoute ouverte ensuite sur ce worker (`fedapay_finalise`) le trouvera déjà reçu. Le callback de
+        webhook personnalisé n'est exécuté que par le worker ayant reçu le webhook.
+        """
+        self._logger.info(
+            f"Webhook {event.name} reçu d'un autre worker pour la transaction {event.id_transaction}."
+        )
+        if self._transaction_cache is not None:
+            self._transaction_cache.update_from_webhook(event)
+        await self._event_manager.set_remote_event_data(event)
+
     async def _await_external_event(self, id_transaction: int, timeout_return: int):
         """
         Bloque l'exécution de manière asynchrone en attente d'une résolution.
@@ -350,10 +692,14 @@ class FedapayConnector:
                 f"Début de l'écoute d'un événement externe pour la transaction ID: {id_transaction}. Délai: {timeout_return}s."
             )
 
-            # Crée une nouvelle Future pour cette transaction
-            future = await self._event_manager.create_future(
-                id_transaction=id_transaction, timeout=timeout_return
-            )
+            await self.start_event_bus()
+
+            # Réutilise l'écoute déjà mise en place (ex: fedapay_pay_many), sinon en crée une nouvelle
+            future = self._event_manager.get_future(id_transaction)
+            if future is None:
+                future = await self._event_manager.create_future(
+                    id_transaction=id_transaction, timeout=timeout_return
+                )
 
             # Vérifie si le webhook est arrivé juste avant le début de l'attente
             await self._event_manager.resolve_if_final_event_already_received(
@@ -365,7 +711,9 @@ class FedapayConnector:
             result: EventFutureStatus = await asyncio.wait_for(future, None)
 
             # Récupère et efface les données de l'événement de la mémoire
-            data = self._event_manager.pop_event_data(id_transaction=id_transaction)
+            data = await self._event_manager.pop_event_data_async(
+                id_transaction=id_transaction
+            )
 
             self._logger.info(
                 f"Événement externe résolu pour {id_transaction} avec le statut: {result.name}."
@@ -453,6 +801,19 @@ class FedapayConnector:
         if callback:
             self._on_reload_finished_callback = callback
 
+    def set_on_persisted_listening_processes_loading_progress_callback(
+        self, callback: PersistedProcessReloadProgressCallback
+    ):
+        """
+        Définit le callback appelé après chaque lot de processus d'écoute persistés rechargés,
+        avec le nombre de processus traités et le nombre total à recharger.
+        """
+        validate_callback(
+            callback,
+            "persisted_listening_processes_loading_progress callback",
+        )
+        self._event_manager.set_reload_progress_callback(callback)
+
     def set_payment_callback_function(self, callback_function: PaymentCallback):
         """
         le callback à appeler lorsqu'un nouveau paiement est initialisé (appel de fedapay_pay)
@@ -468,13 +829,84 @@ class FedapayConnector:
 
         self._webhooks_callback = callback_function
 
+    def get_processed_events_stats(self) -> DeduplicationStats:
+        """
+        Retourne les métriques du registre de déduplication des webhooks (taille, évictions, mémoire estimée).
+        """
+        return self._event_manager.processed_events.stats()
+
+    def get_transaction_cache_stats(self) -> Optional[TransactionCacheStats]:
+        """
+        Retourne les métriques du cache des transactions (taille, succès, échecs, mises à jour par webhook),
+        ou None si le cache est désactivé (`transaction_cache_size`).
+        """
+        if self._transaction_cache is None:
+            return None
+        return self._transaction_cache.stats()
+
+    def get_http_single_flight_stats(self) -> Optional[SingleFlightStats]:
+        """
+        Retourne les compteurs de regroupement des lectures identiques simultanées vers l'API
+        (appels, requêtes réellement émises, appels regroupés), ou None s'il est désactivé (`http_coalesce_reads`).
+        """
+        return self._http_client.single_flight_stats()
+
+    def get_http_retry_stats(self) -> Optional[RetryStats]:
+        """
+        Retourne les compteurs de la politique de reprise HTTP (tentatives rejouées, abandons,
+        créations retrouvées par `merchant_reference`, requêtes GET doublées), ou None si elle est désactivée.
+        """
+        return self._http_client.retry_stats()
+
+    def get_http_rate_limit_stats(self) -> Optional[list[RateLimitLaneStats]]:
+        """
+        Retourne l'état de chaque voie du régulateur de débit (limite de concurrence courante, 429 reçus,
+        pause en cours), ou None si la régulation est désactivée (`http_rate_limiting`).
+        """
+        return self._http_client.rate_limit_stats()
+
+    def get_webhook_queue_stats(self) -> Optional[WebhookQueueStats]:
+        """
+        Retourne les métriques de la file d'ingestion des webhooks (profondeur, débordement, refus),
+        ou None si la file n'est pas activée (`webhook_queue_size`).
+        """
+        if self._webhook_queue is None:
+            return None
+        return self._webhook_queue.stats()
+
     # ----------------------------------------
     # Fedapay connector
     # ----------------------------------------
 
+    def _create_webhook_server(self) -> WebhookServer:
+        return WebhookServer(
+            logger=self._logger,
+            endpoint=self.listen_server_endpoint_name,
+            port=self.listen_server_port,
+            fedapay_auth_key=self.fedapay_webhooks_secret_key,
+            mode=self.listen_server_mode,
+            owner_loop=self._event_manager._asyncio_event_loop,
+        )
+
+    def get_webhook_router(self) -> APIRouter:
+        """
+        Retourne le routeur FastAPI de réception des webhooks FedaPay (vérification de signature incluse),
+        à monter dans l'application FastAPI hôte : `app.include_router(fedapay.get_webhook_router())`.
+
+        Les webhooks sont alors traités directement dans la boucle asyncio de l'application,
+        sans serveur ni thread supplémentaire.
+        """
+        if self.webhook_server is None:
+            self.webhook_server = self._create_webhook_server()
+        return self.webhook_server.get_router()
+
     def start_webhook_server(self):
         """
-        Démarre le serveur FastAPI pour écouter les webhooks de FedaPay dans un thread isolé n'impactant pas le thread principal de l'application
+        Démarre le serveur FastAPI pour écouter les webhooks de FedaPay.
+
+        En mode `WebhookServerMode.THREAD`, le serveur tourne dans un thread isolé n'impactant pas le thread principal de l'application.
+        En mode `WebhookServerMode.IN_LOOP`, il tourne comme une tâche de la boucle asyncio de l'application
+        (la méthode doit alors être appelée depuis une coroutine).
         """
         if self.use_internal_listener:
             self._logger.info(
@@ -486,7 +918,38 @@ class FedapayConnector:
                 "L'instance Fedapay connector n'est pas configurée pour utiliser cette methode, passer l'argument use_listen_server a True "
             )
 
-    async def fedapay_save_webhook_data(self, event_dict: dict):
+    async def fedapay_enqueue_webhook_data(self, payload: bytes) -> bool:
+        """
+        Dépose le corps brut d'un webhook (signature déjà vérifiée) dans la file d'ingestion et rend la main
+        sans attendre son traitement. Sans file configurée (`webhook_queue_size`), le webhook est traité
+        immédiatement. Si l'inbox est activée (`webhook_inbox_dir`), le webhook y est d'abord enregistré
+        durablement, puis marqué comme consommé une fois traité.
+
+        Args:
+            payload (bytes): Corps brut de la requête POST du webhook.
+
+        Returns:
+            bool: False si la file est saturée : l'endpoint doit alors répondre 503 pour que FedaPay renvoie le webhook.
+        """
+        if self._webhook_inbox is None:
+            position = None
+        else:
+            position = await self._webhook_inbox.append(payload)
+        if self._webhook_queue is None:
+            await self._process_webhook_data(payload)
+            if position is not None:
+                self._webhook_inbox.ack(position)
+            return True
+        if not self._webhook_queue.started:
+            await self._webhook_queue.start()
+        return self._webhook_queue.submit(
+            payload,
+            on_done=None
+            if position is None
+            else (lambda: self._webhook_inbox.ack(position)),
+        )
+
+    async def fedapay_save_webhook_data(self, event_dict: dict | bytes | str):
         """
         Méthode à utiliser dans un endpoint de l'API configuré pour recevoir les événements webhook de FedaPay.
         Traite, valide et sauvegarde les données d'un webhook FedaPay pour résolution ultérieure.
@@ -494,10 +957,11 @@ class FedapayConnector:
         Cette méthode est essentielle pour l'intégration manuelle des webhooks dans une API existante.
 
         Args:
-            event_dict (dict): Données brutes du webhook, généralement le corps JSON de la requête POST.
+            event_dict (dict | bytes | str): Données du webhook : le corps brut de la requête POST (bytes/str, validé
+                directement depuis le JSON sans passer par un dict) ou le JSON déjà décodé (dict).
 
         Raises:
-            pydantic.ValidationError: Si le format des données du webhook est invalide.
+            pydantic.ValidationError: Si les champs de routage du webhook (`name`, `entity.id`, `entity.status`) sont invalides.
             EventError: Si une erreur survient lors du traitement interne de l'événement.
 
         Example:
@@ -522,17 +986,41 @@ class FedapayConnector:
             fedapay_connector.utils.verify_signature(
                 payload, header.get("x-fedapay-signature"), os.getenv("FEDAPAY_AUTH_KEY")
             )
-            event = await request.json()
-            fd.fedapay_save_webhook_data(event)
+            await fd.fedapay_save_webhook_data(payload)
 
             return {"ok"}
 
         Note:
         Seuls les événements configurés dans 'self.accepted_transaction' (états finaux) sont traités.
         Les callbacks configurés (`set_webhook_callback_function`) sont exécutés de façon asynchrone après l'enregistrement.
+        Seuls les champs de routage sont validés à la réception : le webhook complet (`WebhookTransaction`)
+        n'est validé que lorsqu'il est consommé (callback de webhook, résultat de `fedapay_finalise`).
+        Si l'inbox est activée (`webhook_inbox_dir`), le webhook y est enregistré durablement avant d'être traité.
+        """
+        if self._webhook_inbox is None:
+            await self._process_webhook_data(event_dict)
+            return
+        if isinstance(event_dict, dict):
+            payload = json.dumps(event_dict).encode("utf-8")
+        elif isinstance(event_dict, str):
+            payload = event_dict.encode("utf-8")
+        else:
+            payload = event_dict
+        position = await self._webhook_inbox.append(payload)
+        await self._process_webhook_data(event_dict)
+        self._webhook_inbox.ack(position)
+
+    async def _process_webhook_data(self, event_dict: dict | bytes | str):
+        """
+        Traite un webhook déjà vérifié (et journalisé dans l'inbox si elle est activée) :
+        voir `fedapay_save_webhook_data`.
         """
         try:
-            event_model = WebhookTransaction.model_validate(event_dict)
+            if isinstance(event_dict, (bytes, str)):
+                header = WebhookTransactionHeader.model_validate_json(event_dict)
+            else:
+                header = WebhookTransactionHeader.model_validate(event_dict)
+            event_model = LazyWebhookTransaction(event_dict, header)
         except Exception as e:
             self._logger.error(
                 f"Erreur de validation Pydantic pour les données webhook reçues : {e}"
@@ -555,17 +1043,28 @@ class FedapayConnector:
             f"Enregistrement des données du webhook pour l'événement: {event_model.name}"
         )
 
+        if self._transaction_cache is not None:
+            self._transaction_cache.update_from_webhook(event_model)
+
+        await self.start_event_bus()
+        if self._event_bus.is_distributed and not self._event_manager.has_future(
+            event_model.id_transaction
+        ):
+            # l'écoute de cette transaction est peut-être ouverte sur un autre worker
+            try:
+                await self._event_bus.publish(event_model)
+            except Exception as e:
+                self._logger.error(
+                    f"Erreur lors de la publication du webhook sur le bus d'événements : {e}"
+                )
+
         is_set = await self._event_manager.set_event_data(event_model)
 
         if self._webhooks_callback and is_set:
             async with self._callback_lock:
                 self._logger.debug("Lancement du callback personnalisé de webhook.")
                 try:
-                    task = asyncio.create_task(
-                        self._webhooks_callback(
-                            WebhookHistory(**event_model.model_dump())
-                        )
-                    )
+                    task = asyncio.create_task(self._run_webhook_callback(event_model))
                     self._callback_tasks.add(task)
                     task.add_done_callback(self._handle_webhook_callback_exception)
                 except Exception as e:
@@ -601,7 +1100,12 @@ class FedapayConnector:
             description (str | None): Description de la transaction.
 
         Returns:
-            FedapayPay: Instance contenant la transaction, le token/lien, et la réponse de définition de méthode (si sans redirection).
+            FedapayPay: Instance contenant la transaction, le token/lien, la réponse de définition de méthode (si sans redirection)
+                et les latences de chaque étape (`latency`).
+
+        Note:
+            Lorsque la réponse de création contient déjà le jeton et le lien de paiement, l'appel
+            au endpoint `/token` est évité (un aller-retour réseau de moins).
 
         Raises:
             aiohttp.ClientResponseError: Erreur d'API FedaPay (ex: 400 Bad Request, 401 Unauthorized, 404 Not Found, 500 Server Error).
@@ -610,37 +1114,63 @@ class FedapayConnector:
         self._logger.info(
             f"Début du processus de paiement pour un montant de {montant_paiement}."
         )
+        api_key = api_key or self.default_api_key
+        started_at = time.perf_counter()
 
         # Utilisation de l'instance de service : self._transactions_service
         transaction_data = await self._transactions_service._create_transaction(
             setup=setup,
             client_infos=client_infos,
             montant_paiement=montant_paiement,
-            api_key=api_key or self.default_api_key,
+            api_key=api_key,
             callback_url=callback_url,
             merchant_reference=merchant_reference,
             custom_metadata=custom_metadata,
             description=description,
         )
-
-        token_data = await self._transactions_service._get_token_and_payment_link(
-            id_transaction=transaction_data.id, api_key=api_key or self.default_api_key
-        )
+        created_at = time.perf_counter()
+        token_latency = None
+
+        if transaction_data.payment_token and transaction_data.payment_url:
+            # FedaPay retourne déjà le token et le lien dans la réponse de création :
+            # on économise un aller-retour réseau complet
+            token_data = TransactionToken(
+                token=transaction_data.payment_token,
+                url=transaction_data.payment_url,
+            )
+        else:
+            token_data = await self._transactions_service._get_token_and_payment_link(
+                id_transaction=transaction_data.id, api_key=api_key
+            )
+            token_latency = time.perf_counter() - created_at
 
         last_status = transaction_data.status
         set_methode = None
+        set_methode_latency = None
 
         if setup.type_paiement == TypesPaiement.SANS_REDIRECTION:
+            set_methode_started_at = time.perf_counter()
             set_methode = await self._transactions_service._set_payment_method(
                 client_infos=client_infos,
                 setup=setup,
                 token=token_data.token,
-                api_key=api_key or self.default_api_key,
+                api_key=api_key,
             )
+            set_methode_latency = time.perf_counter() - set_methode_started_at
             last_status = set_methode.status
 
+        latency = PaymentStagesLatency(
+            create_transaction=created_at - started_at,
+            get_token=token_latency,
+            set_payment_method=set_methode_latency,
+            total=time.perf_counter() - started_at,
+        )
+
         self._logger.info(
-            f"Paiement créé (ID: {transaction_data.id}) avec statut initial: {last_status}."
+            f"Paiement créé (ID: {transaction_data.id}) avec statut initial: {last_status} en {latency.total:.3f}s."
+        )
+        self._logger.debug(
+            f"Latences du paiement {transaction_data.id} : {latency.model_dump()}"
         )
 
         result = FedapayPay(
@@ -648,14 +1178,13 @@ class FedapayConnector:
             set_methode_data=set_methode,
             transaction_data=transaction_data,
             link_and_token_data=token_data,
+            latency=latency,
         )
 
         if self._payment_callback:
             self._logger.debug("Lancement du callback personnalisé de paiement.")
             try:
-                task = asyncio.create_task(
-                    self._payment_callback(PaymentHistory(**result.model_dump()))
-                )
+                task = asyncio.create_task(self._run_payment_callback(result))
                 task.add_done_callback(self._handle_payment_callback_exception)
                 self._callback_tasks.add(task)
             except Exception as e:
@@ -665,15 +1194,121 @@ class FedapayConnector:
 
         return result
 
+    async def fedapay_pay_many(
+        self,
+        requests: list[PaymentRequest],
+        concurrency: int = 10,
+        register_listeners: bool = False,
+        listen_timeout: Optional[int] = 600,
+    ) -> AsyncIterator[PaymentBatchResult]:
+        """
+        Initie plusieurs paiements en parallèle et restitue chaque résultat dès qu'il est disponible.
+
+        Au plus `concurrency` paiements sont en cours à la fois ; ils partagent le pool de connexions
+        du client HTTP. L'échec d'un paiement n'interrompt pas les autres : il est restitué dans
+        `PaymentBatchResult.error`. Les résultats arrivent dans leur ordre d'achèvement, `index`
+        permet de les rattacher aux demandes. Si le parcours est interrompu (`break`), les paiements
+        déjà lancés ne sont pas annulés : ils se poursuivent en arrière-plan (écoute comprise) et sont
+        attendus par `shutdown_cleanup`.
+
+        Args:
+            requests (list[PaymentRequest]): Paiements à initier.
+            concurrency (int): Nombre maximum de paiements initiés simultanément.
+            register_listeners (bool): Met en place l'écoute de chaque transaction dès sa création,
+                avant que son résultat ne soit restitué. Les processus d'écoute créés simultanément
+                sont persistés ensemble par le journal (écriture groupée) ; `fedapay_finalise`
+                réutilise ensuite l'écoute existante.
+            listen_timeout (Optional[int]): Délai d'attente de chaque écoute (en secondes), à partir
+                de la création de sa transaction.
+
+        Yields:
+            PaymentBatchResult: Résultat (ou erreur) de chaque paiement.
+
+        Example:
+            async for item in fedapay.fedapay_pay_many(demandes, concurrency=20):
+                if item.succeeded:
+                    print(item.index, item.result.transaction_data.id)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency doit être supérieur ou égal à 1")
+
+        self._logger.info(
+            f"Initiation de {len(requests)} paiement(s) (concurrence: {concurrency})."
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        if register_listeners:
+            await self.start_event_bus()
+
+        async def pay(index: int, request: PaymentRequest) -> PaymentBatchResult:
+            async with semaphore:
+                try:
+                    result = await self.fedapay_pay(
+                        setup=request.setup,
+                        client_infos=request.client_infos,
+                        montant_paiement=request.montant_paiement,
+                        callback_url=request.callback_url,
+                        api_key=request.api_key,
+                        merchant_reference=request.merchant_reference,
+                        custom_metadata=request.custom_metadata,
+                        description=request.description,
+                    )
+                except Exception as e:
+                    self._logger.error(f"Échec du paiement n°{index} du lot : {e}")
+                    return PaymentBatchResult(index=index, request=request, error=e)
+            if register_listeners:
+                # écoute persistée dès la création : un arrêt en cours de lot ne la perd pas
+                try:
+                    await self._event_manager.create_futures(
+                        [result.transaction_data.id], listen_timeout
+                    )
+                except Exception as e:
+                    self._logger.error(
+                        f"Échec de la mise en place de l'écoute de la transaction {result.transaction_data.id} : {e}"
+                    )
+            return PaymentBatchResult(index=index, request=request, result=result)
+
+        tasks = [
+            asyncio.create_task(pay(index, request))
+            for index, request in enumerate(requests)
+        ]
+        succeeded = 0
+        try:
+            for completed in asyncio.as_completed(tasks):
+                item = await completed
+                if item.result is not None:
+                    succeeded += 1
+                yield item
+        finally:
+            running = [task for task in tasks if not task.done()]
+            if running:
+                # parcours interrompu : les paiements lancés vont à leur terme en arrière-plan
+                for task in running:
+                    self._callback_tasks.add(task)
+                    task.add_done_callback(self._callback_tasks.discard)
+                self._logger.info(
+                    f"Lot de paiements interrompu : {len(running)} paiement(s) en cours poursuivi(s) en arrière-plan."
+                )
+            self._logger.info(
+                f"Lot de paiements terminé : {succeeded}/{len(requests)} réussi(s) restitué(s)."
+            )
+
     async def fedapay_get_transaction_data(
-        self, id_transaction: int, api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY")
+        self,
+        id_transaction: int,
+        api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY"),
+        use_cache: bool = True,
     ):
         """
         Récupère les détails complets d'une transaction FedaPay par son identifiant unique.
 
+        La transaction est servie depuis le cache local lorsqu'elle y est présente : une transaction
+        en attente y reste `transaction_cache_ttl` secondes, une transaction finalisée indéfiniment
+        (mise à jour par les webhooks reçus).
+
         Args:
             id_transaction (int): L'ID FedaPay de la transaction.
             api_key (Optional[str]): Clé API à utiliser.
+            use_cache (bool): Si False, interroge toujours l'API (le cache est tout de même mis à jour).
 
         Returns:
             Transaction: L'objet Transaction complet.
@@ -682,20 +1317,25 @@ class FedapayConnector:
             aiohttp.ClientResponseError: Erreur d'API (ex: 404 Not Found si l'ID est inconnu, 401 Unauthorized).
         """
         self._logger.info(f"Récupération de la transaction ID: {id_transaction}.")
-        result = await self._transactions_service._get_transaction_by_fedapay_id(
-            api_key=api_key or self.default_api_key, fedapay_id=id_transaction
+        return await self._get_transaction(
+            id_transaction, api_key=api_key, use_cache=use_cache
         )
-        return result
 
     async def fedapay_get_transaction_data_by_merchant_id(
-        self, merchant_id: str, api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY")
+        self,
+        merchant_id: str,
+        api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY"),
+        use_cache: bool = True,
     ):
         """
         Récupère les détails d'une transaction FedaPay en utilisant la référence marchande (`merchant_reference`).
 
+        Comme `fedapay_get_transaction_data`, la transaction est servie depuis le cache local lorsqu'elle y est présente.
+
         Args:
             merchant_id (str): La référence marchande utilisée lors de la création de la transaction.
             api_key (Optional[str]): Clé API à utiliser.
+            use_cache (bool): Si False, interroge toujours l'API (le cache est tout de même mis à jour).
 
         Returns:
             Transaction: L'objet Transaction correspondant.
@@ -706,11 +1346,17 @@ class FedapayConnector:
         self._logger.info(
             f"Récupération de la transaction par référence marchande: {merchant_id}."
         )
+        if self._transaction_cache is not None and use_cache:
+            cached = self._transaction_cache.get_by_merchant_reference(merchant_id)
+            if cached is not None:
+                return cached
         result = (
             await self._transactions_service._get_transaction_by_merchant_reference(
                 api_key=api_key or self.default_api_key, merchant_reference=merchant_id
             )
         )
+        if self._transaction_cache is not None and result is not None:
+            self._transaction_cache.put(result)
         return result
 
     async def fedapay_finalise(
@@ -752,6 +1398,126 @@ class FedapayConnector:
         )
         return future_event_result, data
 
+    async def _iter_finalised_batches(
+        self, id_transactions: list[int], timeout: Optional[int]
+    ) -> AsyncIterator[
+        list[tuple[int, EventFutureStatus, Optional[list[WebhookTransaction]]]]
+    ]:
+        """
+        Met en place l'écoute groupée des transactions puis restitue, à chaque réveil, le lot
+        des transactions finalisées depuis le précédent.
+        """
+        id_transactions = list(dict.fromkeys(id_transactions))
+        await self.start_event_bus()
+
+        # une seule échéance et une seule écriture en base pour tout le groupe
+        futures = await self._event_manager.create_futures(id_transactions, timeout)
+        await asyncio.gather(
+            *(
+                self._event_manager.resolve_if_final_event_already_received(
+                    id_transaction
+                )
+                for id_transaction in id_transactions
+            )
+        )
+
+        waiting = {future: id_transaction for id_transaction, future in futures.items()}
+        try:
+            while waiting:
+                done, _ = await asyncio.wait(
+                    set(waiting), return_when=asyncio.FIRST_COMPLETED
+                )
+                finished = [waiting.pop(future) for future in done]
+                data = await asyncio.gather(
+                    *(
+                        self._event_manager.pop_event_data_async(id_transaction)
+                        for id_transaction in finished
+                    )
+                )
+                yield [
+                    (id_transaction, futures[id_transaction].result(), events)
+                    for id_transaction, events in zip(finished, data)
+                ]
+        except asyncio.CancelledError:
+            self._logger.warning(
+                f"Annulation asynchrone de l'attente groupée : {len(waiting)} écoute(s) annulée(s)."
+            )
+            for id_transaction in waiting.values():
+                await self._event_manager.cancel(id_transaction)
+            raise
+
+    async def as_finalised(
+        self, id_transactions: list[int], timeout: Optional[int] = 600
+    ) -> AsyncIterator[
+        tuple[int, EventFutureStatus, Optional[list[WebhookTransaction]]]
+    ]:
+        """
+        Attend la finalisation de plusieurs transactions et restitue chacune dès qu'elle est finalisée.
+
+        Les écoutes sont mises en place en une fois : une seule échéance partagée (`timeout` secondes
+        à partir de l'appel) et une seule écriture en base pour tout le groupe. Une écoute déjà en
+        place (ex: `fedapay_pay_many`) est réutilisée.
+
+        Args:
+            id_transactions (list[int]): IDs des transactions à finaliser.
+            timeout (Optional[int]): Délai d'attente maximum en secondes, commun à tout le groupe.
+
+        Yields:
+            tuple[int, EventFutureStatus, Optional[list[WebhookTransaction]]]:
+                ID de la transaction, statut de l'événement et webhooks reçus, dans l'ordre de finalisation.
+
+        Note:
+            Interrompre le parcours laisse les transactions restantes en écoute ; annuler la tâche
+            qui parcourt l'itérateur annule leurs écoutes.
+        """
+        self._logger.info(
+            f"Début de la finalisation groupée de {len(id_transactions)} transaction(s). Timeout: {timeout}s."
+        )
+        async for batch in self._iter_finalised_batches(id_transactions, timeout):
+            for item in batch:
+                yield item
+
+    async def fedapay_finalise_many(
+        self,
+        id_transactions: list[int],
+        timeout: Optional[int] = 600,
+        return_when: FinaliseReturnWhen = FinaliseReturnWhen.ALL_COMPLETED,
+    ) -> dict[int, tuple[EventFutureStatus, Optional[list[WebhookTransaction]]]]:
+        """
+        Attend la finalisation de plusieurs transactions avec une échéance commune.
+
+        Args:
+            id_transactions (list[int]): IDs des transactions à finaliser.
+            timeout (Optional[int]): Délai d'attente maximum en secondes, commun à tout le groupe.
+            return_when (FinaliseReturnWhen): ALL_COMPLETED attend toutes les transactions ;
+                FIRST_COMPLETED rend la main dès qu'au moins une transaction est finalisée.
+
+        Returns:
+            dict[int, tuple[EventFutureStatus, Optional[list[WebhookTransaction]]]]:
+                Statut et webhooks reçus des transactions finalisées, par ID de transaction.
+
+        Note:
+            Avec FIRST_COMPLETED, les transactions non finalisées restent en écoute : un nouvel appel
+            (ou `fedapay_finalise`) reprend leur attente sans recréer les écoutes.
+        """
+        self._logger.info(
+            f"Début de la finalisation groupée de {len(id_transactions)} transaction(s). Timeout: {timeout}s. Mode: {return_when.value}."
+        )
+        results = {}
+        batches = self._iter_finalised_batches(id_transactions, timeout)
+        try:
+            async for batch in batches:
+                for id_transaction, status, data in batch:
+                    results[id_transaction] = (status, data)
+                if return_when == FinaliseReturnWhen.FIRST_COMPLETED:
+                    break
+        finally:
+            await batches.aclose()
+        self._logger.info(
+            f"Finalisation groupée terminée : {len(results)}/{len(id_transactions)} transaction(s) finalisée(s)."
+        )
+        return results
+
     async def fedapay_cancel_transaction(
         self, id_transaction: int, api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY")
     ):
@@ -784,6 +1550,7 @@ class FedapayConnector:
                 self._logger.info(
                     f"Transaction avec l'id {id_transaction} supprimée avec succès (statut: {result.status_code})."
                 )
+                self._invalidate_cached_transaction(id_transaction)
                 await self._event_manager.cancel(id_transaction=id_transaction)
                 self._logger.info(
                     f"Écoute interne pour la transaction {id_transaction} annulée."
@@ -817,19 +1584,83 @@ class FedapayConnector:
             self._logger.error(error_msg)
             raise ConfigError(error_msg)
 
+        self._reload_status_semaphore = asyncio.Semaphore(
+            self.reload_status_concurrency
+        )
+        self._reload_status_next_slot = 0.0
+        await self._replay_webhook_inbox()
         await self._event_manager.load_persisted_processes()
         self._logger.info(
             "Chargement des processus d'écoute terminé. Les callbacks de rechargement sont maintenant en cours d'exécution."
         )
 
+    async def _replay_webhook_inbox(self):
+        """
+        Restitue au gestionnaire d'événements les webhooks finaux enregistrés dans l'inbox avant l'arrêt
+        et jamais traités (non consommés).
+        """
+        if self._webhook_inbox is None:
+            return
+        restored = 0
+        # les événements déjà traités (déduplication persistée) ne sont pas restitués
+        await self._event_manager.processed_events.load()
+        async for records in self._webhook_inbox.replay():
+            for position, payload in records:
+                try:
+                    event_model = LazyWebhookTransaction(payload)
+                except Exception as e:
+                    self._logger.error(f"Webhook illisible ignoré dans l'inbox : {e}")
+                else:
+                    if await self._event_manager.restore_event_data(event_model):
+                        restored += 1
+                # restitué une seule fois : il n'est plus relu aux démarrages suivants
+                self._webhook_inbox.ack(position)
+        self._logger.info(
+            f"{restored} webhook(s) final(aux) restitué(s) depuis l'inbox"
+        )
+
+    async def _await_callback_tasks(self):
+        """
+        Attend les tâches de callback en cours (`self.callback_timeout` au plus), puis annule celles qui restent.
+        """
+        if not self._callback_tasks:
+            return
+        pending = list(self._callback_tasks)
+        self._logger.info(
+            f"Attente de {len(pending)} tâches de callback en cours d'exécution (timeout: {self.callback_timeout}s)."
+        )
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*pending, return_exceptions=True),
+                timeout=self.callback_timeout,
+            )
+            self._logger.info(
+                "Toutes les tâches de callback ont été terminées dans le temps imparti."
+            )
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                f"Timeout ({self.callback_timeout}s) pendant l'attente des callbacks. Les tâches restantes seront annulées."
+            )
+        finally:
+            # Annuler les tâches restantes
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+            self._callback_tasks.difference_update(pending)
+
     async def shutdown_cleanup(self):
         """
         Nettoie proprement toutes les ressources asynchrones avant l'arrêt de l'application.
 
         Effectue les étapes suivantes dans l'ordre sécurisé :
-        1. Annule toutes les futures d'événements en attente (`fedapay_finalise`).
-        2. Attend l'achèvement des tâches de callback en cours (`_payment_callback`, `_webhooks_callback`) avec un délai (`self.callback_timeout`).
-        3. Arrête le serveur webhook FastAPI interne (si actif).
+        1. Arrête le serveur webhook FastAPI interne (si actif).
+        2. Traite les webhooks déjà acquittés de la file d'ingestion (avec le délai `self.callback_timeout`) puis l'arrête.
+        3. Attend l'achèvement des tâches de callback en cours (`_payment_callback`, `_webhooks_callback`), y compris celles lancées par la file, avec le même délai.
+        4. Annule les futures d'événements encore en attente (`fedapay_finalise`) et attend les callbacks que cette annulation déclenche.
+        5. Ferme l'inbox durable des webhooks.
+        6. Ferme le bus d'événements partagé entre workers.
+        7. Ferme le pool de connexions HTTP partagé.
+        8. Libère les ressources de persistance des processus d'écoute.
 
         Raises:
             Exception: Toute erreur survenant pendant le nettoyage est capturée, loguée, mais l'arrêt se poursuit pour assurer la fermeture de l'application.
@@ -843,49 +1674,85 @@ class FedapayConnector:
                     "Début du processus de nettoyage et d'arrêt ordonné du FedapayConnector."
                 )
 
-                # 1. Annulation de tous les futures en attente
+                # 1. Arrêt du serveur webhook : plus aucun webhook n'est reçu
+                if self.use_internal_listener:
+                    self._logger.info("Arrêt du serveur webhook interne.")
+                    try:
+                        await self.webhook_server.stop_webhook_listenning_async()
+                        self._logger.debug("Le serveur webhook interne a été arrêté.")
+                    except Exception as e:
+                        self._logger.error(
+                            f"Erreur lors de l'arrêt du serveur webhook : {e}",
+                            exc_info=True,
+                        )
+
+                # 2. Vidage de la file d'ingestion : les webhooks déjà acquittés résolvent encore leurs écoutes
+                if self._webhook_queue is not None:
+                    try:
+                        await self._webhook_queue.close(timeout=self.callback_timeout)
+                        self._logger.debug(
+                            "La file d'ingestion des webhooks a été arrêtée."
+                        )
+                    except Exception as e:
+                        self._logger.error(
+                            f"Erreur lors de l'arrêt de la file d'ingestion des webhooks : {e}",
+                            exc_info=True,
+                        )
+
+                # 3. Attente des callbacks en cours d'exécution avec timeout
+                await self._await_callback_tasks()
+
+                # 4. Annulation de tous les futures encore en attente
                 await self._event_manager.cancel_all("Application shutdown cleanup")
                 self._logger.debug(
                     "Toutes les écoutes d'événements FedaPay ont été annulées."
                 )
+                # callbacks de paiement lancés par les écoutes qui viennent d'être annulées
+                await self._await_callback_tasks()
 
-                # 2. Attente des callbacks en cours d'exécution avec timeout
-                if self._callback_tasks:
-                    pending = list(self._callback_tasks)
-                    self._logger.info(
-                        f"Attente de {len(pending)} tâches de callback en cours d'exécution (timeout: {self.callback_timeout}s)."
-                    )
-                    try:
-                        await asyncio.wait_for(
-                            asyncio.gather(*pending, return_exceptions=True),
-                            timeout=self.callback_timeout,
-                        )
-                        self._logger.info(
-                            "Toutes les tâches de callback ont été terminées dans le temps imparti."
-                        )
-                    except asyncio.TimeoutError:
-                        self._logger.warning(
-                            f"Timeout ({self.callback_timeout}s) pendant l'attente des callbacks. Les tâches restantes seront annulées."
-                        )
-                    finally:
-                        # Annuler les tâches restantes
-                        for task in pending:
-                            if not task.done():
-                                task.cancel()
-                        self._callback_tasks.clear()
-
-                # 3. Arrêt du serveur webhook en dernier
-                if self.use_internal_listener:
-                    self._logger.info("Arrêt du serveur webhook interne.")
+                # 5. Fermeture de l'inbox
+                if self._webhook_inbox is not None:
                     try:
-                        self.webhook_server.stop_webhook_listenning()
-                        self._logger.debug("Le serveur webhook interne a été arrêté.")
+                        await self._webhook_inbox.close()
+                        self._logger.debug("L'inbox des webhooks a été fermée.")
                     except Exception as e:
                         self._logger.error(
-                            f"Erreur lors de l'arrêt du serveur webhook : {e}",
+                            f"Erreur lors de la fermeture de l'inbox des webhooks : {e}",
                             exc_info=True,
                         )
 
+                # 6. Fermeture du bus d'événements
+                try:
+                    await self._event_bus.close()
+                    self._logger.debug("Le bus d'événements a été fermé.")
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de la fermeture du bus d'événements : {e}",
+                        exc_info=True,
+                    )
+
+                # 7. Fermeture du pool de connexions HTTP
+                try:
+                    await self._http_client.close()
+                    self._logger.debug("Le pool de connexions HTTP a été fermé.")
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de la fermeture du pool de connexions HTTP : {e}",
+                        exc_info=True,
+                    )
+
+                # 8. Libération des ressources de persistance
+                try:
+                    await self._event_manager.close()
+                    self._logger.debug(
+                        "Les ressources de persistance ont été libérées."
+                    )
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de la fermeture de la persistance : {e}",
+                        exc_info=True,
+                    )
+
             except Exception as e:
                 # Cette exception capture toute erreur non gérée dans les blocs précédents
                 self._logger.critical(
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped
-from sqlalchemy.types import DateTime
+from sqlalchemy.types import DateTime, String
 from datetime import datetime
-from sqlalchemy import func
+from typing import Optional
+from sqlalchemy import Index, func
 
 
 class Base(DeclarativeBase):
@@ -10,6 +11,18 @@ class Base(DeclarativeBase):
 
 class StoredListeningProcess(Base):
     __tablename__ = "StoredListeningProcess"
+    __table_args__ = (
+        # toutes les lectures/écritures ciblent une transaction : une seule ligne par ID
+        Index(
+            "ix_StoredListeningProcess_transaction_id",
+            "StoredListeningProcess_transaction_id",
+            unique=True,
+        ),
+        Index(
+            "ix_StoredListeningProcess_created_at",
+            "StoredListeningProcess_created_at",
+        ),
+    )
 
     StoredEventWaitingProcess_id: Mapped[int] = mapped_column(
         primary_key=True, autoincrement=True
@@ -19,3 +32,17 @@ class StoredListeningProcess(Base):
     StoredListeningProcess_created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, server_default=func.now()
     )
+    StoredListeningProcess_deadline: Mapped[Optional[float]] = mapped_column(
+        nullable=True
+    )
+
+
+class ProcessedWebhookEvent(Base):
+    __tablename__ = "ProcessedWebhookEvent"
+
+    ProcessedWebhookEvent_key: Mapped[str] = mapped_column(
+        String(255), primary_key=True
+    )
+    ProcessedWebhookEvent_expires_at: Mapped[float] = mapped_column(
+        nullable=False, index=True
+    )
@@ -0,0 +1,129 @@
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .event_storage import ProcessPersistance
+from .models import DeduplicationStats
+
+
+class DeduplicationStore:
+    """
+    Registre borné des événements webhook déjà traités.
+
+    Les clés sont conservées `ttl` secondes au plus, et au plus `max_entries` clés sont
+    gardées en mémoire : au-delà, les plus anciennes sont évincées. Les clés étant insérées
+    avec une durée de vie constante, l'ordre d'insertion est aussi l'ordre d'expiration,
+    ce qui rend l'éviction en O(1) amorti.
+
+    Si une persistance est fournie, chaque clé est également enregistrée en base afin que
+    la déduplication survive à un redémarrage ; seules les clés non expirées, dans la limite
+    de `max_entries`, sont rechargées par `load()`.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        ttl: float = 86400,
+        max_entries: int = 100_000,
+        storage: Optional[ProcessPersistance] = None,
+    ):
+        self._logger = logger
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._storage = storage
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._hits = 0
+        self._evicted_expired = 0
+        self._evicted_capacity = 0
+        self._last_purge = time.time()
+        self._loaded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._evicted_expired += 1
+            return False
+        self._hits += 1
+        return True
+
+    def _evict(self, now: float):
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
+            self._evicted_expired += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evicted_capacity += 1
+
+    async def add(self, key: str):
+        """
+        Marque `key` comme traitée pour `ttl` secondes.
+        """
+        now = time.time()
+        expires_at = now + self.ttl
+        self._entries.pop(key, None)
+        self._entries[key] = expires_at
+        self._evict(now)
+
+        if self._storage:
+            try:
+                await self._storage.save_processed_event(key, expires_at)
+            except Exception as e:
+                self._logger.error(
+                    f"Erreur lors de la persistance de l'événement traité '{key}' : {e}"
+                )
+            # les clés expirées sont purgées de la base au plus une fois par durée de vie
+            if now - self._last_purge >= self.ttl:
+                self._last_purge = now
+                try:
+                    await self._storage.purge_processed_events(now)
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de la purge des événements traités expirés : {e}"
+                    )
+
+    async def load(self):
+        """
+        Recharge depuis la persistance les clés non expirées (au plus `max_entries`).
+        Seul le premier appel lit la base.
+        """
+        if not self._storage or self._loaded:
+            return
+        self._loaded = True
+        now = time.time()
+        for key, expires_at in await self._storage.load_processed_events(
+            now, self.max_entries
+        ):
+            self._entries[key] = expires_at
+        self._evict(now)
+        self._logger.info(
+            f"{len(self._entries)} événement(s) webhook déjà traité(s) rechargé(s)"
+        )
+
+    def stats(self) -> DeduplicationStats:
+        """
+        Retourne les métriques du registre, dont une estimation de son empreinte mémoire.
+        """
+        approx_memory = sys.getsizeof(self._entries) + sum(
+            sys.getsizeof(key) + sys.getsizeof(expires_at)
+            for key, expires_at in self._entries.items()
+        )
+        return DeduplicationStats(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl=self.ttl,
+            hits=self._hits,
+            evicted_expired=self._evicted_expired,
+            evicted_capacity=self._evicted_capacity,
+            approx_memory_bytes=approx_memory,
+        )
@@ -47,6 +47,17 @@ class EventFutureStatus(str, Enum):
     CANCELLED_INTERNALLY = "cancelled_internally"
 
 
+class FinaliseReturnWhen(str, Enum):
+    FIRST_COMPLETED = "first_completed"
+    ALL_COMPLETED = "all_completed"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
 class TypesPaiement(str, Enum):
     AVEC_REDIRECTION = "avec_redirection"
     SANS_REDIRECTION = "sans_redirection"
@@ -56,3 +67,14 @@ class ExceptionOnProcessReloadBehavior(str, Enum):
     DROP_AND_REMOVE_PERSISTANCE = "drop_and_remove_persistence"
     DROP_AND_KEEP_PERSISTED = "drop_and_keep_persisted"
     KEEP_AND_RETRY = "keep_and_retry"
+
+
+class PersistenceDurability(str, Enum):
+    SYNC = "sync"
+    GROUP_COMMIT = "group_commit"
+    ASYNC = "async"
+
+
+class WebhookServerMode(str, Enum):
+    THREAD = "thread"
+    IN_LOOP = "in_loop"
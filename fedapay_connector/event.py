@@ -1,18 +1,31 @@
 import os
+from collections import OrderedDict
+from datetime import timezone
 from typing import Optional
 import asyncio
 import logging
+import time
 
 from .db_models import StoredListeningProcess
 from .types import (
+    PersistedProcessReloadProgressCallback,
     RunAtPersistedProcessReloadCallback,
+    RunAtPersistedProcessesBatchReloadCallback,
     RunBeforeTimemoutCallback,
 )
 
 from .event_storage import ProcessPersistance  # noqa: E401
-from .models import WebhookTransaction, ListeningProcessData
+from .journal import ProcessJournal
+from .dedup import DeduplicationStore
+from .scheduler import TimeoutScheduler
+from .pending import PendingRecord, ReceivedEvent
+from .models import WebhookTransaction, LazyWebhookTransaction, ListeningProcessData
 from .exceptions import EventError
-from .enums import EventFutureStatus, ExceptionOnProcessReloadBehavior
+from .enums import (
+    EventFutureStatus,
+    ExceptionOnProcessReloadBehavior,
+    PersistenceDurability,
+)
 
 
 class FedapayEvent:
@@ -34,16 +47,48 @@ class FedapayEvent:
         db_url: Optional[str] = os.getenv(
             "FEDAPAY_DB_URL", "sqlite:///fedapay_connector_persisted_data/processes.db"
         ),
+        persistence_durability: PersistenceDurability = PersistenceDurability.GROUP_COMMIT,
+        persistence_flush_interval: float = 0.005,
+        persistence_max_batch_size: int = 200,
+        processed_events_ttl: float = 86400,
+        processed_events_max_entries: int = 100_000,
+        persist_processed_events: bool = False,
+        reload_chunk_size: int = 500,
+        store_webhook_payloads: bool = True,
+        remote_events_ttl: float = 3600,
+        remote_events_max_entries: int = 10_000,
     ):
         if self._init is False:
             self._logger = logger
-            self.processed_events = set()
-            self._processing_results_futures_lock = asyncio.Lock()
-            self._processing_results_futures: dict[int, asyncio.Future] = {}
-            self._event_data: dict[int, list[WebhookTransaction]] = {}
+            # un seul enregistrement compact par transaction suivie (future, échéance, webhooks reçus, tentatives).
+            # Il n'est modifié que depuis la boucle propriétaire et jamais de part et d'autre d'un `await` :
+            # chaque opération est donc atomique sans verrou.
+            self._pending: dict[int, PendingRecord] = {}
+            self.store_webhook_payloads = store_webhook_payloads
+            # webhooks reçus d'autres workers pour des transactions non écoutées ici : conservés
+            # en mémoire seulement, au plus `remote_events_ttl` secondes et `remote_events_max_entries`
+            # transactions, pour une écoute ouverte ensuite sur ce worker
+            self._remote_events: OrderedDict[
+                int, tuple[float, list[WebhookTransaction | LazyWebhookTransaction]]
+            ] = OrderedDict()
+            self.remote_events_ttl = remote_events_ttl
+            self.remote_events_max_entries = remote_events_max_entries
             self._asyncio_event_loop = asyncio.get_event_loop()
-            self._event_persit_storage = ProcessPersistance(
-                logger=logger, db_url=db_url
+            storage = ProcessPersistance(logger=logger, db_url=db_url)
+            # les écritures sont regroupées par lots devant la base de persistance
+            self._event_persit_storage = ProcessJournal(
+                logger=logger,
+                storage=storage,
+                durability=persistence_durability,
+                flush_interval=persistence_flush_interval,
+                max_batch_size=persistence_max_batch_size,
+            )
+            # registre borné (durée de vie + capacité) des événements webhook déjà traités
+            self.processed_events = DeduplicationStore(
+                logger=logger,
+                ttl=processed_events_ttl,
+                max_entries=processed_events_max_entries,
+                storage=storage if persist_processed_events else None,
             )
             self._run_before_timeout_callback: Optional[RunBeforeTimemoutCallback] = (
                 None
@@ -51,22 +96,54 @@ class FedapayEvent:
             self._run_at_persisted_process_reload_callback: Optional[
                 RunAtPersistedProcessReloadCallback
             ] = None
+            self._run_at_persisted_processes_batch_reload_callback: Optional[
+                RunAtPersistedProcessesBatchReloadCallback
+            ] = None
+            self._reload_progress_callback: Optional[
+                PersistedProcessReloadProgressCallback
+            ] = None
+            self.reload_chunk_size = reload_chunk_size
             self.max_reload_attempts = max_reload_attempts
             self.on_listening_reload_exception = on_listening_reload_exception
-            self.retry_attempts = {}
             self.sleeping_before_retry_delay = sleeping_before_retry_delay
             self.final_event_names = final_event_names
+            # un seul ordonnanceur pilote les timeouts de toutes les transactions en attente
+            self._timeout_scheduler = TimeoutScheduler(
+                logger=logger,
+                on_timeout=self._auto_cancel,
+                loop=self._asyncio_event_loop,
+            )
+            self._background_tasks: set[asyncio.Task] = set()
             self._init = True
 
-    async def _auto_cancel(self, id_transaction: int, timeout: float):
-        self._logger.info(
-            f"Auto-cancel for id_transaction '{id_transaction}' started with timeout {timeout}"
-        )
-        await asyncio.sleep(timeout)
-        if (
-            id_transaction in self._processing_results_futures
-            and not self._processing_results_futures[id_transaction].done()
-        ):
+    def _handle_background_task_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self._logger.error(f"Erreur dans une tâche de fond : {task.exception()}")
+
+    def _record(self, id_transaction: int) -> PendingRecord:
+        record = self._pending.get(id_transaction)
+        if record is None:
+            record = self._pending[id_transaction] = PendingRecord()
+        return record
+
+    def _discard_if_empty(self, id_transaction: int, record: PendingRecord):
+        if record.is_empty():
+            self._pending.pop(id_transaction, None)
+
+    def _pop_future(self, id_transaction: int) -> Optional[asyncio.Future]:
+        record = self._pending.get(id_transaction)
+        if record is None:
+            return None
+        future = record.future
+        record.future = None
+        record.deadline = None
+        self._discard_if_empty(id_transaction, record)
+        return future
+
+    async def _auto_cancel(self, id_transaction: int):
+        future = self.get_future(id_transaction)
+        if future is not None and not future.done():
             self._logger.info(
                 f"Auto-cancel for id_transaction '{id_transaction}' triggered"
             )
@@ -87,13 +164,12 @@ class FedapayEvent:
                     )
                     pass
 
-            async with self._processing_results_futures_lock:
-                future = self._processing_results_futures.pop(id_transaction, None)
+            future = self._pop_future(id_transaction)
             if future and not future.done():
-                self._asyncio_event_loop.call_soon_threadsafe(
-                    future.set_result, EventFutureStatus.TIMEOUT
-                )
-            self._event_persit_storage.delete_process(transaction_id=id_transaction)
+                self._set_future_result(future, EventFutureStatus.TIMEOUT)
+            await self._event_persit_storage.delete_process(
+                transaction_id=id_transaction
+            )
         else:
             self._logger.info(
                 f"Future for id_transaction '{id_transaction}' already resolved or cancelled before timeout"
@@ -102,6 +178,25 @@ class FedapayEvent:
             f"Auto-cancel for id_transaction '{id_transaction}' completed"
         )
 
+    def _set_future_result(self, future: asyncio.Future, result: EventFutureStatus):
+        """
+        Renseigne le résultat d'une future de la boucle propriétaire.
+        Depuis cette boucle, le résultat est posé directement ; depuis un autre thread,
+        il est transmis via `call_soon_threadsafe`.
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._asyncio_event_loop:
+            if not future.done():
+                future.set_result(result)
+        else:
+            self._asyncio_event_loop.call_soon_threadsafe(
+                self._set_future_result, future, result
+            )
+
     def _persisted_process_reload_callback_exception(self, task: asyncio.Task):
         try:
             task.result()
@@ -112,15 +207,28 @@ class FedapayEvent:
                 stack_info=True,
             )
 
+    @staticmethod
+    def _parse_persisted_process(
+        process: StoredListeningProcess,
+    ) -> ListeningProcessData:
+        process_data = ListeningProcessData.model_validate_json(
+            process.StoredListeningProcess_process_data
+        )
+        if process_data.created_at is None:
+            # processus persisté avant l'ajout de l'échéance : on se rabat sur la date de création
+            created_at = process.StoredListeningProcess_created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            process_data.created_at = created_at.timestamp()
+        return process_data
+
     async def _load_persisted_process(self, process: StoredListeningProcess):
         if self._run_at_persisted_process_reload_callback:
             try:
+                process_data = self._parse_persisted_process(process)
+
                 task = asyncio.create_task(
-                    self._run_at_persisted_process_reload_callback(
-                        ListeningProcessData.model_validate_json(
-                            process.StoredListeningProcess_process_data
-                        )
-                    )
+                    self._run_at_persisted_process_reload_callback(process_data)
                 )
                 task.add_done_callback(
                     self._persisted_process_reload_callback_exception
@@ -131,12 +239,13 @@ class FedapayEvent:
                 # elle meme de la persistance si necessaire et si la tache lancé ici peut ne pas aboutir a
                 # un reload_future en fonction de l'exec du callback
 
-                self._event_persit_storage.delete_process(
+                await self._event_persit_storage.delete_process(
                     transaction_id=process.StoredListeningProcess_transaction_id
                 )
                 self._logger.info(
                     f"run_at_persisted_process_reload_callback for process {process.StoredListeningProcess_transaction_id} completed successfully"
                 )
+                self._end_reload_retries(process.StoredListeningProcess_transaction_id)
             except Exception as e:
                 self._logger.error(
                     f"Error in run_at_persisted_process_reload_callback for process {process.StoredListeningProcess_transaction_id}: {e} -- loading failled"
@@ -148,7 +257,7 @@ class FedapayEvent:
                     self._logger.error(
                         f"Removing persisted process {process.StoredListeningProcess_transaction_id} due to reload exception"
                     )
-                    self._event_persit_storage.delete_process(
+                    await self._event_persit_storage.delete_process(
                         transaction_id=process.StoredListeningProcess_transaction_id
                     )
                 elif (
@@ -166,21 +275,18 @@ class FedapayEvent:
                     self._logger.error(
                         f"Keeping persisted process {process.StoredListeningProcess_transaction_id} and retrying later"
                     )
-                    retry_count = self.retry_attempts.get(
-                        process.StoredListeningProcess_transaction_id, None
-                    )
-                    if retry_count is None:
-                        retry_count = 0
-                    if retry_count < self.max_reload_attempts:
-                        self.retry_attempts[
+                    record = self._record(process.StoredListeningProcess_transaction_id)
+                    if record.retry_attempts < self.max_reload_attempts:
+                        record.retry_attempts += 1
+                        # la nouvelle tentative est différée sans occuper de place dans le rechargement en cours
+                        asyncio.create_task(self._retry_load_persisted_process(process))
+                    else:
+                        self._logger.error(
+                            f"maximum retry attempts reached for process {process.StoredListeningProcess_transaction_id}"
+                        )
+                        self._end_reload_retries(
                             process.StoredListeningProcess_transaction_id
-                        ] = retry_count + 1
-                        await asyncio.sleep(self.sleeping_before_retry_delay)
-                        asyncio.create_task(self._load_persisted_process(process))
-
-                    self._logger.error(
-                        f"maximum retry attempts reached for process {process.StoredListeningProcess_transaction_id}"
-                    )
+                        )
 
                 else:
                     self._logger.error(
@@ -188,6 +294,48 @@ class FedapayEvent:
                     )
                     raise e
 
+    async def _load_persisted_chunk(self, chunk: list[StoredListeningProcess]):
+        """
+        Recharge un lot de processus persistés en un seul appel du callback de rechargement groupé.
+        Les processus illisibles sont confiés au rechargement unitaire et à sa gestion d'erreur.
+        """
+        processes_data: list[ListeningProcessData] = []
+        for process in chunk:
+            try:
+                processes_data.append(self._parse_persisted_process(process))
+            except Exception:
+                await self._load_persisted_process(process)
+
+        if not processes_data:
+            return
+        task = asyncio.create_task(
+            self._run_at_persisted_processes_batch_reload_callback(processes_data)
+        )
+        task.add_done_callback(self._persisted_process_reload_callback_exception)
+        # comme pour le rechargement unitaire, la persistance est supprimée dès la tâche créée
+        await asyncio.gather(
+            *(
+                self._event_persit_storage.delete_process(
+                    transaction_id=process_data.id_transaction
+                )
+                for process_data in processes_data
+            )
+        )
+        self._logger.info(
+            f"run_at_persisted_processes_batch_reload_callback started for {len(processes_data)} processes"
+        )
+
+    def _end_reload_retries(self, id_transaction: int):
+        # fin des tentatives de rechargement : le compteur ne doit plus retenir l'enregistrement
+        record = self._pending.get(id_transaction)
+        if record is not None and record.retry_attempts:
+            record.retry_attempts = 0
+            self._discard_if_empty(id_transaction, record)
+
+    async def _retry_load_persisted_process(self, process: StoredListeningProcess):
+        await asyncio.sleep(self.sleeping_before_retry_delay)
+        await self._load_persisted_process(process)
+
     def set_run_before_timeout_callback(self, callback: RunBeforeTimemoutCallback):
         self._run_before_timeout_callback = callback
 
@@ -196,6 +344,20 @@ class FedapayEvent:
     ):
         self._run_at_persisted_process_reload_callback = callback
 
+    def set_run_at_persisted_processes_batch_reload_callback(
+        self, callback: Optional[RunAtPersistedProcessesBatchReloadCallback]
+    ):
+        """
+        Définit un callback de rechargement appelé une fois par lot de processus persistés.
+        Lorsqu'il est défini, il remplace le callback de rechargement unitaire.
+        """
+        self._run_at_persisted_processes_batch_reload_callback = callback
+
+    def set_reload_progress_callback(
+        self, callback: Optional[PersistedProcessReloadProgressCallback]
+    ):
+        self._reload_progress_callback = callback
+
     async def resolve_if_final_event_already_received(self, id_transaction):
         """
         Vérifie si un event final n'a pas deja été reçu avant la mise en place de l'ecoute
@@ -203,10 +365,11 @@ class FedapayEvent:
         Dans certains cas fedapay retourne la webhook immediatement et pour eviter d'attendre un future qui est deja résolu on peut verifier avec cette fonction
 
         """
-        events = self._event_data.get(id_transaction, None)
-        if events is None:
+        await self._take_remote_events(id_transaction)
+        record = self._pending.get(id_transaction)
+        if record is None or not record.events:
             return False
-        for event in events:
+        for event in record.events:
             if event.name in self.final_event_names:
                 self._logger.info(
                     f"Final event '{event.name}' already received for id_transaction '{id_transaction}'"
@@ -215,10 +378,13 @@ class FedapayEvent:
                 return True
         return False
 
-    async def create_future(
-        self, id_transaction: int, timeout: Optional[float] = None
-    ) -> asyncio.Future:
-        if id_transaction in self._processing_results_futures:
+    def _register_future(
+        self,
+        id_transaction: int,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> tuple[asyncio.Future, ListeningProcessData]:
+        if self.has_future(id_transaction):
             self._logger.error(
                 f"Future for id_transaction '{id_transaction}' already exists"
             )
@@ -227,25 +393,72 @@ class FedapayEvent:
             )
 
         future = self._asyncio_event_loop.create_future()
-        async with self._processing_results_futures_lock:
-            self._processing_results_futures[id_transaction] = future
-
-        if timeout:
-            asyncio.create_task(self._auto_cancel(id_transaction, timeout))
+        record = self._record(id_transaction)
+        record.future = future
+
+        if deadline is not None:
+            self._timeout_scheduler.schedule_at(id_transaction, deadline)
+        elif timeout:
+            deadline = self._timeout_scheduler.schedule(id_transaction, timeout)
+        record.deadline = deadline
         self._logger.info(
             f"Future created for id_transaction '{id_transaction}' with timeout {timeout}"
         )
-        self._event_persit_storage.save_process(
-            transaction_id=id_transaction,
-            process_data=ListeningProcessData(id_transaction=id_transaction),
+        return future, ListeningProcessData(
+            id_transaction=id_transaction,
+            created_at=time.time(),
+            deadline=deadline,
+        )
+
+    async def create_future(
+        self, id_transaction: int, timeout: Optional[float] = None
+    ) -> asyncio.Future:
+        future, process_data = self._register_future(id_transaction, timeout)
+        await self._event_persit_storage.save_process(
+            transaction_id=id_transaction, process_data=process_data
         )
 
         return future
 
+    async def create_futures(
+        self, id_transactions: list[int], timeout: Optional[float] = None
+    ) -> dict[int, asyncio.Future]:
+        """
+        Met en place l'écoute de plusieurs transactions et persiste tous les processus d'écoute en un seul lot.
+
+        Les futures créées partagent une même échéance (`timeout` secondes à partir de l'appel) et
+        leurs processus d'écoute sont écrits dans une seule transaction de base de données.
+        Les transactions déjà écoutées sont ignorées : leur future existante est retournée telle quelle.
+        """
+        deadline = time.time() + timeout if timeout else None
+        futures = {}
+        processes = []
+        for id_transaction in id_transactions:
+            existing = self.get_future(id_transaction)
+            if existing is not None:
+                futures[id_transaction] = existing
+                continue
+            future, process_data = self._register_future(
+                id_transaction, timeout, deadline
+            )
+            futures[id_transaction] = future
+            processes.append((id_transaction, process_data))
+
+        if processes:
+            await self._event_persit_storage.save_processes(processes)
+        return futures
+
     async def reload_future(
         self, process_data: ListeningProcessData, timeout: Optional[float] = None
     ) -> asyncio.Future:
-        if process_data.id_transaction in self._processing_results_futures:
+        """
+        Rétablit l'écoute d'un processus persisté.
+
+        L'échéance d'origine est conservée : elle est lue dans `process_data.deadline` ou, à défaut,
+        recalculée à partir de la date de création persistée et de `timeout`. Une échéance déjà
+        dépassée déclenche immédiatement le traitement du timeout.
+        """
+        if self.has_future(process_data.id_transaction):
             self._logger.error(
                 f"Future for id_transaction '{process_data.id_transaction}' already exists"
             )
@@ -254,15 +467,21 @@ class FedapayEvent:
             )
 
         future = self._asyncio_event_loop.create_future()
-        async with self._processing_results_futures_lock:
-            self._processing_results_futures[process_data.id_transaction] = future
+        record = self._record(process_data.id_transaction)
+        record.future = future
 
         if timeout:
-            asyncio.create_task(self._auto_cancel(process_data.id_transaction, timeout))
+            if process_data.deadline is None:
+                created_at = process_data.created_at or time.time()
+                process_data.deadline = created_at + timeout
+            self._timeout_scheduler.schedule_at(
+                process_data.id_transaction, process_data.deadline
+            )
+            record.deadline = process_data.deadline
         self._logger.info(
             f"Future created for id_transaction '{process_data.id_transaction}' with timeout {timeout}"
         )
-        self._event_persit_storage.save_process(
+        await self._event_persit_storage.save_process(
             transaction_id=process_data.id_transaction, process_data=process_data
         )
 
@@ -270,32 +489,29 @@ class FedapayEvent:
 
     async def resolve(self, id_transaction: int):
         self._logger.info(f"Resolving future for id_transaction '{id_transaction}'")
-        async with self._processing_results_futures_lock:
-            future = self._processing_results_futures.pop(id_transaction, None)
+        self._timeout_scheduler.cancel(id_transaction)
+        future = self._pop_future(id_transaction)
         if future and not future.done():
-            self._asyncio_event_loop.call_soon_threadsafe(
-                future.set_result, EventFutureStatus.RESOLVED
+            self._set_future_result(future, EventFutureStatus.RESOLVED)
+            await self._event_persit_storage.delete_process(
+                transaction_id=id_transaction
             )
-            self._event_persit_storage.delete_process(transaction_id=id_transaction)
             self._logger.info(f"Future for id_transaction '{id_transaction}' resolved")
         else:
             self._logger.info(
                 f"Future for id_transaction '{id_transaction}' already resolved or cancelled before"
             )
 
-    async def cancel(self, id_transaction: int, lock_acquire: bool = True):
+    async def cancel(self, id_transaction: int):
         self._logger.info(f"Cancelling future for id_transaction '{id_transaction}'")
-        if lock_acquire:
-            async with self._processing_results_futures_lock:
-                future = self._processing_results_futures.pop(id_transaction, None)
-        else:
-            future = self._processing_results_futures.pop(id_transaction, None)
+        self._timeout_scheduler.cancel(id_transaction)
+        future = self._pop_future(id_transaction)
 
         if future and not future.done():
-            self._asyncio_event_loop.call_soon_threadsafe(
-                future.set_result, EventFutureStatus.CANCELLED
+            self._set_future_result(future, EventFutureStatus.CANCELLED)
+            await self._event_persit_storage.delete_process(
+                transaction_id=id_transaction
             )
-            self._event_persit_storage.delete_process(transaction_id=id_transaction)
             self._logger.info(f"Future for id_transaction '{id_transaction}' cancelled")
             return True
         else:
@@ -307,45 +523,58 @@ class FedapayEvent:
     async def cancel_all(
         self, reason: Optional[str] = "All waiting event cancelled by user"
     ):
+        """
+        Annule toutes les écoutes en un seul parcours, sans attente par transaction :
+        les futures sont renseignées immédiatement et les processus persistés sont supprimés en un seul lot.
+        """
         self._logger.info(f"Cancelling all futures -- reason : {reason} ")
-        async with self._processing_results_futures_lock:
-            keys = list(self._processing_results_futures.keys())
-            for id in keys:
-                try:
-                    await self.cancel(id, False)
-                except Exception as e:
-                    self._logger.error(
-                        f"Error cancelling future for id_transaction '{id}': {e} -- dropping future cancelling"
-                    )
+        cancelled = []
+        for id_transaction in list(self._pending):
+            future = self._pop_future(id_transaction)
+            if future is None:
+                continue
+            self._timeout_scheduler.cancel(id_transaction)
+            if not future.done():
+                self._set_future_result(future, EventFutureStatus.CANCELLED)
+                cancelled.append(id_transaction)
+
+        if cancelled:
+            try:
+                await self._event_persit_storage.delete_processes(cancelled)
+            except Exception as e:
+                self._logger.error(
+                    f"Error deleting {len(cancelled)} cancelled persisted processes: {e}"
+                )
+        self._logger.info(f"{len(cancelled)} future(s) cancelled")
 
     def has_future(self, id_transaction: int) -> bool:
-        return id_transaction in self._processing_results_futures
+        record = self._pending.get(id_transaction)
+        return record is not None and record.future is not None
 
     def get_future(self, id_transaction: int) -> Optional[asyncio.Future]:
-        return self._processing_results_futures.get(id_transaction, None)
+        record = self._pending.get(id_transaction)
+        return record.future if record is not None else None
 
-    async def set_event_data(self, data: WebhookTransaction):
-        id_transaction = data.entity.id
-        event_id = f"{data.entity.id}.{data.name}"
+    async def set_event_data(self, data: WebhookTransaction | LazyWebhookTransaction):
+        id_transaction = data.id_transaction
+        event_id = f"{id_transaction}.{data.name}"
         if event_id in self.processed_events:
             self._logger.info(f"Event '{event_id}' already processed")
             return False
-        self.processed_events.add(event_id)
+        await self.processed_events.add(event_id)
         self._logger.info(f"Setting event data for id_transaction '{id_transaction}'")
-        datalist = self._event_data.get(id_transaction, None)
-        if datalist is None:
-            datalist = [data]
-        else:
-            datalist.append(data)
-
-        self._event_data[id_transaction] = datalist
-        self._event_persit_storage.update_process(
-            transaction_id=id_transaction,
-            process_data=ListeningProcessData(
-                id_transaction=id_transaction, received_webhooks=datalist
-            ),
+        record = self._record(id_transaction)
+        if record.events is None:
+            record.events = []
+        record.events.append(
+            ReceivedEvent.from_webhook(data, self.store_webhook_payloads)
         )
 
+        if record.future is None:
+            # avec une écoute active, la résolution ci-dessous supprime le processus persisté :
+            # le mettre à jour (et donc valider le webhook complet) serait inutile
+            await self._persist_received_events(id_transaction, record)
+
         # pas besoin de verifier le type d'event reçu vu que la selection est faite en amont pour filtrer
         # les event et que tous les event sont exclusif l'un pour l'autre
 
@@ -355,18 +584,165 @@ class FedapayEvent:
         self._logger.info(f"Event data for id_transaction '{id_transaction}' resolved")
         return True
 
+    async def set_remote_event_data(
+        self, data: WebhookTransaction | LazyWebhookTransaction
+    ) -> bool:
+        """
+        Enregistre un webhook reçu d'un autre worker via le bus d'événements.
+
+        Si la transaction est écoutée ici, le webhook la résout comme `set_event_data`. Sinon il est
+        seulement gardé en mémoire, sans persistance ni déduplication, dans un registre borné
+        (`remote_events_ttl`, `remote_events_max_entries`) : une écoute ouverte ensuite sur ce worker
+        le retrouve via `resolve_if_final_event_already_received`.
+        """
+        id_transaction = data.id_transaction
+        if self.has_future(id_transaction):
+            return await self.set_event_data(data)
+
+        now = time.time()
+        entry = self._remote_events.get(id_transaction)
+        if entry is None or entry[0] <= now:
+            self._remote_events.pop(id_transaction, None)
+            entry = self._remote_events[id_transaction] = (
+                now + self.remote_events_ttl,
+                [],
+            )
+        entry[1].append(data)
+        self._evict_remote_events(now)
+        return True
+
+    def _evict_remote_events(self, now: float):
+        # durée de vie constante : l'ordre d'insertion est aussi l'ordre d'expiration
+        while self._remote_events:
+            expires_at, _ = next(iter(self._remote_events.values()))
+            if expires_at > now:
+                break
+            self._remote_events.popitem(last=False)
+        while len(self._remote_events) > self.remote_events_max_entries:
+            self._remote_events.popitem(last=False)
+
+    async def _take_remote_events(self, id_transaction: int):
+        entry = self._remote_events.pop(id_transaction, None)
+        if entry is None or entry[0] <= time.time():
+            return
+        for data in entry[1]:
+            await self.set_event_data(data)
+
+    async def restore_event_data(
+        self, data: WebhookTransaction | LazyWebhookTransaction
+    ) -> bool:
+        """
+        Réinjecte un webhook final relu depuis l'inbox au redémarrage : il est remis à disposition des
+        écoutes, enregistré en base (l'inbox le marque ensuite comme consommé) et marqué comme traité
+        pour ignorer une nouvelle livraison. Un webhook déjà traité (présent dans `processed_events`)
+        n'est pas réinjecté.
+        """
+        if data.name not in self.final_event_names:
+            return False
+        id_transaction = data.id_transaction
+        event_id = f"{id_transaction}.{data.name}"
+        if event_id in self.processed_events:
+            return False
+        record = self._record(id_transaction)
+        if record.events is None:
+            record.events = []
+        if any(event.name == data.name for event in record.events):
+            return False
+        record.events.append(
+            ReceivedEvent.from_webhook(data, self.store_webhook_payloads)
+        )
+        await self.processed_events.add(event_id)
+        if self.has_future(id_transaction):
+            await self.resolve(id_transaction)
+        else:
+            await self._persist_received_events(id_transaction, record)
+        return True
+
+    async def _persist_received_events(
+        self, id_transaction: int, record: PendingRecord
+    ):
+        await self._event_persit_storage.update_process(
+            transaction_id=id_transaction,
+            process_data=ListeningProcessData(
+                id_transaction=id_transaction,
+                received_webhooks=[
+                    event.to_model(id_transaction) for event in record.events
+                ],
+            ),
+        )
+
     def pop_event_data(self, id_transaction: int) -> Optional[list[WebhookTransaction]]:
+        """
+        Variante synchrone de `pop_event_data_async`, conservée pour compatibilité : la
+        suppression du processus persisté est lancée en tâche de fond au lieu d'être attendue.
+        Doit être appelée depuis la boucle du gestionnaire d'événements.
+        """
+        self._logger.info(f"Getting event data for id_transaction '{id_transaction}'")
+        task = self._asyncio_event_loop.create_task(
+            self._event_persit_storage.delete_process(transaction_id=id_transaction)
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._handle_background_task_done)
+        return self._take_event_data(id_transaction)
+
+    async def pop_event_data_async(
+        self, id_transaction: int
+    ) -> Optional[list[WebhookTransaction]]:
+        """
+        Retourne et efface les webhooks reçus pour `id_transaction`, après suppression de son
+        processus persisté.
+        """
         self._logger.info(f"Getting event data for id_transaction '{id_transaction}'")
-        self._event_persit_storage.delete_process(transaction_id=id_transaction)
-        return self._event_data.pop(id_transaction, None)
+        await self._event_persit_storage.delete_process(transaction_id=id_transaction)
+        return self._take_event_data(id_transaction)
+
+    def _take_event_data(
+        self, id_transaction: int
+    ) -> Optional[list[WebhookTransaction]]:
+        record = self._pending.get(id_transaction)
+        if record is None or record.events is None:
+            return None
+        events = record.events
+        record.events = None
+        self._discard_if_empty(id_transaction, record)
+        # validation complète différée des webhooks reçus, au moment où ils sont consommés
+        return [event.to_model(id_transaction) for event in events]
 
     async def load_persisted_processes(self):
         self._logger.info("Loading persisted processes")
         print(
             "[FEDAPAY CONNECTOR WARNING] Loading persisted processes ongoing please don't stop or restart process until finished or you may loose listening for fedapay webhook event"
         )
-        processes = self._event_persit_storage.load_processes()
-        for process in processes:
-            await self._load_persisted_process(process)
+        await self.processed_events.load()
+        total = await self._event_persit_storage.count_processes()
+        loaded = 0
+        # lecture par lots : seul le lot en cours est en mémoire. Le rechargement d'un processus
+        # lance son callback en tâche de fond (l'écoute rétablie peut durer jusqu'au timeout) :
+        # seules les suppressions de persistance du lot sont attendues, et regroupées par le journal
+        async for chunk in self._event_persit_storage.iter_processes(
+            self.reload_chunk_size
+        ):
+            if self._run_at_persisted_processes_batch_reload_callback:
+                await self._load_persisted_chunk(chunk)
+            else:
+                await asyncio.gather(
+                    *(self._load_persisted_process(process) for process in chunk)
+                )
+            loaded += len(chunk)
+            self._logger.info(f"Persisted processes reloaded: {loaded}/{total}")
+            if self._reload_progress_callback:
+                try:
+                    await self._reload_progress_callback(loaded, total)
+                except Exception as e:
+                    self._logger.error(f"Error in reload progress callback: {e}")
         self._logger.info("Loading persisted processes finished")
         print("[FEDAPAY CONNECTOR INFO] Loading persisted processes finished")
+
+    async def close(self):
+        """
+        Arrête l'ordonnanceur des timeouts et libère les ressources de persistance.
+        """
+        self._timeout_scheduler.stop()
+        # suppressions lancées par `pop_event_data` : confiées au journal avant sa fermeture
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self._event_persit_storage.close()
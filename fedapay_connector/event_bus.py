@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional
+
+from .models import LazyWebhookTransaction, WebhookTransaction
+
+EventBusHandler = Callable[[LazyWebhookTransaction], Awaitable[None]]
+
+
+class EventBus(ABC):
+    """
+    Bus de diffusion des événements webhook finaux entre les workers d'une application.
+
+    Un webhook reçu par un worker doit pouvoir résoudre une écoute (`fedapay_finalise`)
+    ouverte sur un autre worker : le worker récepteur publie l'événement sur le bus et
+    chaque worker abonné le transmet à son gestionnaire d'événements.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[EventBusHandler] = None
+
+    @property
+    def started(self) -> bool:
+        return self._handler is not None
+
+    @property
+    def is_distributed(self) -> bool:
+        """Indique si le bus relie plusieurs processus."""
+        return True
+
+    async def start(self, handler: EventBusHandler):
+        """
+        Abonne `handler` aux événements publiés par les autres workers.
+        """
+        self._handler = handler
+
+    @abstractmethod
+    async def publish(self, event: WebhookTransaction | LazyWebhookTransaction):
+        """
+        Publie un événement à destination des autres workers.
+        """
+
+    async def close(self):
+        """
+        Arrête la réception des événements et libère les ressources du bus.
+        """
+        self._handler = None
+
+
+class InProcessEventBus(EventBus):
+    """
+    Bus par défaut pour une application à un seul processus : il n'y a pas d'autre worker
+    à notifier, la publication est donc sans effet.
+    """
+
+    @property
+    def is_distributed(self) -> bool:
+        return False
+
+    async def publish(self, event: WebhookTransaction | LazyWebhookTransaction):
+        pass
+
+
+class SQLiteEventBus(EventBus):
+    """
+    Bus inter-processus adossé à un fichier SQLite partagé par les workers d'une même machine.
+
+    Chaque événement publié est inséré dans une table journal ; chaque worker interroge cette
+    table toutes les `poll_interval` secondes et ne lit que les lignes postérieures à la dernière
+    vue (index sur la clé primaire) et publiées par un autre worker. Les lignes plus anciennes
+    que `retention` secondes sont purgées par les publications.
+    """
+
+    _TABLE = "FedapayEventBus"
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        db_path: str = "fedapay_connector_persisted_data/event_bus.db",
+        poll_interval: float = 0.05,
+        retention: float = 300,
+    ):
+        super().__init__()
+        self._logger = logger
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fedapay-event-bus"
+        )
+        self._connection: Optional[sqlite3.Connection] = None
+        self._last_id = 0
+        self._last_purge = 0.0
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.db_path, timeout=5, check_same_thread=False
+            )
+            # WAL : les lectures des workers ne bloquent pas les publications
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._TABLE} ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "worker_id TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    async def _run(self, operation: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, operation, *args)
+
+    def _read_last_id(self) -> int:
+        row = self._connect().execute(f"SELECT MAX(id) FROM {self._TABLE}").fetchone()
+        return row[0] or 0
+
+    def _insert(self, payload: str, now: float):
+        connection = self._connect()
+        connection.execute(
+            f"INSERT INTO {self._TABLE} (worker_id, payload, created_at) VALUES (?, ?, ?)",
+            (self.worker_id, payload, now),
+        )
+        if now - self._last_purge >= self.retention:
+            self._last_purge = now
+            connection.execute(
+                f"DELETE FROM {self._TABLE} WHERE created_at < ?",
+                (now - self.retention,),
+            )
+        connection.commit()
+
+    def _fetch(self, after_id: int) -> list[tuple[int, str, str]]:
+        return (
+            self._connect()
+            .execute(
+                f"SELECT id, worker_id, payload FROM {self._TABLE} WHERE id > ? ORDER BY id",
+                (after_id,),
+            )
+            .fetchall()
+        )
+
+    async def start(self, handler: EventBusHandler):
+        await super().start(handler)
+        # seuls les événements publiés après l'abonnement sont diffusés
+        self._last_id = await self._run(self._read_last_id)
+        self._poll_task = asyncio.create_task(self._poll())
+        self._logger.info(
+            f"Bus d'événements SQLite démarré (worker {self.worker_id}, fichier {self.db_path})"
+        )
+
+    async def publish(self, event: WebhookTransaction | LazyWebhookTransaction):
+        await self._run(self._insert, event.model_dump_json(), time.time())
+
+    async def _poll(self):
+        while True:
+            try:
+                rows = await self._run(self._fetch, self._last_id)
+            except Exception as e:
+                self._logger.error(f"Erreur de lecture du bus d'événements : {e}")
+                rows = []
+            for row_id, worker_id, payload in rows:
+                self._last_id = max(self._last_id, row_id)
+                if worker_id == self.worker_id:
+                    continue
+                try:
+                    await self._handler(LazyWebhookTransaction(payload))
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors du traitement d'un événement du bus : {e}"
+                    )
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self):
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        await super().close()
+        if self._connection is not None:
+            await self._run(self._connection.close)
+            self._connection = None
+        self._executor.shutdown(wait=True)
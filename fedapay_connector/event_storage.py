@@ -1,15 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker
-from typing import Optional
+from sqlalchemy import create_engine, func, inspect, make_url, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+import asyncio
 import logging
 from pydantic import BaseModel
-from .db_models import Base, StoredListeningProcess
+from .db_models import Base, ProcessedWebhookEvent, StoredListeningProcess
 import os
 from urllib.parse import urlparse
 
 
+class ProcessOperation(str, Enum):
+    SAVE = "save"
+    UPDATE = "update"
+    DELETE = "delete"
+    REPLACE = "replace"
+
+
 class ProcessPersistance:
+    """
+    Persistance des processus d'écoute.
+
+    Toutes les opérations sont awaitables et ne bloquent jamais la boucle asyncio :
+    - avec un pilote asynchrone (ex: `sqlite+aiosqlite://`, `postgresql+asyncpg://`),
+      le moteur asyncio de SQLAlchemy est utilisé ;
+    - avec un pilote synchrone (ex: `sqlite://`), les requêtes sont déléguées à un thread dédié
+      unique, ce qui conserve l'ordre des écritures.
+    """
+
+    # nombre maximal d'identifiants par requête de suppression groupée
+    _DELETE_CHUNK_SIZE = 500
+
     def __init__(
         self,
         logger: logging.Logger,
@@ -19,9 +44,22 @@ class ProcessPersistance:
     ):
         self.logger = logger
         self._ensure_sqlite_path(db_url)
-        self.engine = create_engine(db_url)
-        self.session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self._init_db()
+        self.is_async = make_url(db_url).get_dialect().is_async
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        if self.is_async:
+            self.engine = create_async_engine(db_url)
+            self.session = async_sessionmaker(bind=self.engine, autoflush=False)
+            # l'initialisation du schéma nécessite une boucle active : elle est faite au premier accès
+            self._db_initialized = False
+            self._init_lock = asyncio.Lock()
+        else:
+            self.engine = create_engine(db_url)
+            self.session = sessionmaker(
+                autocommit=False, autoflush=False, bind=self.engine
+            )
+            self._init_db()
+            self._db_initialized = True
 
     def _ensure_sqlite_path(self, db_url: str):
         """
@@ -31,7 +69,7 @@ class ProcessPersistance:
         """
         parsed_url = urlparse(db_url)
 
-        if parsed_url.scheme == "sqlite":
+        if parsed_url.scheme.split("+")[0] == "sqlite":
             db_path = parsed_url.path
             if not db_path:
                 return
@@ -42,7 +80,7 @@ class ProcessPersistance:
 
             # Si l'URL est de la forme sqlite:///relative/path.db (trois slashes),
             # on considère le chemin comme relatif au répertoire courant.
-            if db_url.startswith("sqlite:///") and not db_url.startswith("sqlite:////"):
+            if not db_url.split("://", 1)[1].startswith("//"):
                 rel_path = db_path.lstrip("/")
                 db_path_resolved = os.path.join(os.getcwd(), rel_path)
             else:
@@ -55,16 +93,105 @@ class ProcessPersistance:
                 os.makedirs(db_dir, exist_ok=True)
                 self.logger.info(f"Répertoire créé ou déjà existant : {db_dir}")
 
-    def _init_db(self):
-        inspector = inspect(self.engine)
+    def _init_schema(self, connection: Connection):
+        inspector = inspect(connection)
         tables = inspector.get_table_names()
 
         if StoredListeningProcess.__tablename__ not in tables:
             self.logger.info("Creating database tables...")
-            Base.metadata.create_all(self.engine)
+            Base.metadata.create_all(connection)
             self.logger.info("Database tables created successfully")
         else:
             self.logger.info("Database tables already exist")
+            self._upgrade_schema(connection)
+            # tables ajoutées par les versions ultérieures
+            Base.metadata.create_all(connection)
+
+    def _upgrade_schema(self, connection: Connection):
+        """
+        Met à niveau une table `StoredListeningProcess` créée par une version antérieure :
+        ajout de la colonne d'échéance, suppression des doublons par ID de transaction
+        (la ligne la plus récente est conservée) puis création des index.
+        """
+        table = StoredListeningProcess.__table__
+        inspector = inspect(connection)
+        preparer = connection.dialect.identifier_preparer
+
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name not in existing_columns:
+                self.logger.info(
+                    f"Ajout de la colonne {column.name} à la table {table.name}"
+                )
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {preparer.quote(table.name)} "
+                        f"ADD COLUMN {preparer.quote(column.name)} "
+                        f"{column.type.compile(dialect=connection.dialect)}"
+                    )
+                )
+
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        missing_indexes = [
+            index for index in table.indexes if index.name not in existing_indexes
+        ]
+        if not missing_indexes:
+            return
+
+        if any(index.unique for index in missing_indexes):
+            duplicates = self._delete_duplicate_processes(connection)
+            if duplicates:
+                self.logger.info(
+                    f"{duplicates} processus d'écoute en double supprimé(s) avant la création de l'index unique"
+                )
+
+        for index in missing_indexes:
+            self.logger.info(f"Création de l'index {index.name}")
+            index.create(connection, checkfirst=True)
+
+    def _delete_duplicate_processes(self, connection: Connection) -> int:
+        """
+        Supprime les doublons par ID de transaction en conservant la ligne la plus récente.
+
+        Les lignes à conserver sont lues au préalable puis les doublons supprimés par paquets :
+        MySQL refuse une suppression filtrée par une sous-requête sur la même table (erreur 1093).
+        """
+        table = StoredListeningProcess.__table__
+        transaction_id = table.c.StoredListeningProcess_transaction_id
+        process_id = table.c.StoredEventWaitingProcess_id
+        latest_rows = connection.execute(
+            select(transaction_id, func.max(process_id))
+            .group_by(transaction_id)
+            .having(func.count() > 1)
+        ).all()
+
+        deleted = 0
+        for start in range(0, len(latest_rows), self._DELETE_CHUNK_SIZE):
+            chunk = latest_rows[start : start + self._DELETE_CHUNK_SIZE]
+            deleted += connection.execute(
+                table.delete().where(
+                    transaction_id.in_([row[0] for row in chunk]),
+                    process_id.not_in([row[1] for row in chunk]),
+                )
+            ).rowcount
+        return deleted
+
+    def _init_db(self):
+        with self.engine.begin() as connection:
+            self._init_schema(connection)
+
+    async def _init_async_db(self):
+        if self._db_initialized:
+            return
+        async with self._init_lock:
+            if not self._db_initialized:
+                async with self.engine.begin() as connection:
+                    await connection.run_sync(self._init_schema)
+                self._db_initialized = True
 
     def _get_db(self):
         db = self.session()
@@ -81,53 +208,263 @@ class ProcessPersistance:
         finally:
             db.close()
 
-    def save_process(
-        self, transaction_id: int, process_data: Optional[BaseModel] = None
-    ):
-        """Sauvegarde un processus d'ecoute dans la base"""
+    def _run_in_session(self, operation: Callable[..., Any], *args):
         with self._get_db_session() as db:
-            process_data_json = process_data.model_dump_json() if process_data else None
+            return operation(db, *args)
+
+    async def _run(self, operation: Callable[..., Any], *args):
+        """
+        Exécute `operation(session, *args)` sans bloquer la boucle asyncio.
+        """
+        if self.is_async:
+            await self._init_async_db()
+            async with self.session() as db:
+                return await db.run_sync(operation, *args)
 
-            stored_process = StoredListeningProcess(
-                StoredListeningProcess_transaction_id=transaction_id,
-                StoredListeningProcess_process_data=process_data_json,
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fedapay-persistence"
             )
-            db.add(stored_process)
-            db.commit()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._run_in_session, operation, *args
+        )
 
-    def load_processes(self) -> list[StoredListeningProcess]:
-        """Charge tous les processus d'ecoute de la base"""
+    @staticmethod
+    def _serialize(process_data: Optional[BaseModel]) -> dict:
+        return {
+            "StoredListeningProcess_process_data": process_data.model_dump_json()
+            if process_data
+            else None,
+            "StoredListeningProcess_deadline": getattr(process_data, "deadline", None),
+        }
+
+    @classmethod
+    def _upsert_process(
+        cls, db: Session, transaction_id: int, process_data: Optional[BaseModel]
+    ):
+        # l'index unique sur l'ID de transaction rend la mise à jour en place aussi rapide qu'une insertion
+        values = cls._serialize(process_data)
+        count = (
+            db.query(StoredListeningProcess)
+            .filter(
+                StoredListeningProcess.StoredListeningProcess_transaction_id
+                == transaction_id
+            )
+            .update(values)
+        )
+        if count == 0:
+            db.add(
+                StoredListeningProcess(
+                    StoredListeningProcess_transaction_id=transaction_id, **values
+                )
+            )
+
+    @classmethod
+    def _save_process(
+        cls, db: Session, transaction_id: int, process_data: Optional[BaseModel]
+    ):
+        cls._upsert_process(db, transaction_id, process_data)
+        db.commit()
+
+    @staticmethod
+    def _load_processes(db: Session) -> list[StoredListeningProcess]:
         processes = []
-        with self._get_db_session() as db:
-            for process in db.query(StoredListeningProcess).all():
-                processes.append(process)
+        for process in db.query(StoredListeningProcess).order_by(
+            StoredListeningProcess.StoredListeningProcess_created_at
+        ):
+            processes.append(process)
         return processes
 
-    def delete_process(self, transaction_id: int):
-        """Supprime un processus d'ecoute"""
-        with self._get_db_session() as db:
-            count = (
-                db.query(StoredListeningProcess)
-                .filter(
-                    StoredListeningProcess.StoredListeningProcess_transaction_id
-                    == transaction_id
-                )
-                .delete()
+    @staticmethod
+    def _get_processes_bounds(db: Session) -> tuple[int, Optional[int]]:
+        return db.query(
+            func.count(StoredListeningProcess.StoredEventWaitingProcess_id),
+            func.max(StoredListeningProcess.StoredEventWaitingProcess_id),
+        ).one()
+
+    @staticmethod
+    def _load_processes_page(
+        db: Session, after_id: int, max_id: int, limit: int
+    ) -> list[StoredListeningProcess]:
+        # pagination par clé (keyset) sur la clé primaire : coût constant quelle que soit la page
+        return (
+            db.query(StoredListeningProcess)
+            .filter(
+                StoredListeningProcess.StoredEventWaitingProcess_id > after_id,
+                StoredListeningProcess.StoredEventWaitingProcess_id <= max_id,
             )
-            db.commit()
-            return count != 0
+            .order_by(StoredListeningProcess.StoredEventWaitingProcess_id)
+            .limit(limit)
+            .all()
+        )
 
-    def update_process(self, transaction_id: int, process_data: BaseModel):
-        """Met à jour un processus d'ecoute"""
-        with self._get_db_session() as db:
-            process_data_json = process_data.model_dump_json() if process_data else None
-            count = (
-                db.query(StoredListeningProcess)
-                .filter(
+    @staticmethod
+    def _delete_process(db: Session, transaction_id: int):
+        count = (
+            db.query(StoredListeningProcess)
+            .filter(
+                StoredListeningProcess.StoredListeningProcess_transaction_id
+                == transaction_id
+            )
+            .delete()
+        )
+        db.commit()
+        return count != 0
+
+    @classmethod
+    def _update_process(cls, db: Session, transaction_id: int, process_data: BaseModel):
+        count = (
+            db.query(StoredListeningProcess)
+            .filter(
+                StoredListeningProcess.StoredListeningProcess_transaction_id
+                == transaction_id
+            )
+            .update(cls._serialize(process_data))
+        )
+        db.commit()
+        return count != 0
+
+    @classmethod
+    def _apply_batch(
+        cls,
+        db: Session,
+        operations: Sequence[tuple[int, ProcessOperation, Optional[BaseModel]]],
+    ):
+        deleted_ids = []
+        for transaction_id, operation, process_data in operations:
+            if operation in (ProcessOperation.SAVE, ProcessOperation.REPLACE):
+                cls._upsert_process(db, transaction_id, process_data)
+            elif operation == ProcessOperation.DELETE:
+                deleted_ids.append(transaction_id)
+            elif operation == ProcessOperation.UPDATE:
+                db.query(StoredListeningProcess).filter(
                     StoredListeningProcess.StoredListeningProcess_transaction_id
                     == transaction_id
+                ).update(cls._serialize(process_data))
+        # les suppressions sont regroupées en requêtes IN (...) de taille bornée
+        for start in range(0, len(deleted_ids), cls._DELETE_CHUNK_SIZE):
+            db.query(StoredListeningProcess).filter(
+                StoredListeningProcess.StoredListeningProcess_transaction_id.in_(
+                    deleted_ids[start : start + cls._DELETE_CHUNK_SIZE]
                 )
-                .update({"StoredListeningProcess_process_data": process_data_json})
+            ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def _save_processed_event(db: Session, key: str, expires_at: float):
+        db.merge(
+            ProcessedWebhookEvent(
+                ProcessedWebhookEvent_key=key,
+                ProcessedWebhookEvent_expires_at=expires_at,
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def _purge_processed_events(db: Session, now: float) -> int:
+        count = (
+            db.query(ProcessedWebhookEvent)
+            .filter(ProcessedWebhookEvent.ProcessedWebhookEvent_expires_at <= now)
+            .delete()
+        )
+        db.commit()
+        return count
+
+    @classmethod
+    def _load_processed_events(
+        cls, db: Session, now: float, limit: int
+    ) -> list[tuple[str, float]]:
+        # purge des entrées expirées puis chargement des plus récentes uniquement
+        cls._purge_processed_events(db, now)
+        rows = (
+            db.query(
+                ProcessedWebhookEvent.ProcessedWebhookEvent_key,
+                ProcessedWebhookEvent.ProcessedWebhookEvent_expires_at,
+            )
+            .order_by(ProcessedWebhookEvent.ProcessedWebhookEvent_expires_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(key, expires_at) for key, expires_at in reversed(rows)]
+
+    async def save_processed_event(self, key: str, expires_at: float):
+        """Enregistre un événement webhook traité jusqu'à son expiration"""
+        await self._run(self._save_processed_event, key, expires_at)
+
+    async def purge_processed_events(self, now: float) -> int:
+        """Supprime les événements webhook traités expirés et retourne leur nombre"""
+        return await self._run(self._purge_processed_events, now)
+
+    async def load_processed_events(
+        self, now: float, limit: int
+    ) -> list[tuple[str, float]]:
+        """
+        Supprime les événements webhook traités expirés et retourne au plus `limit`
+        couples (clé, expiration) parmi les plus récents, triés par expiration croissante.
+        """
+        return await self._run(self._load_processed_events, now, limit)
+
+    async def save_process(
+        self, transaction_id: int, process_data: Optional[BaseModel] = None
+    ):
+        """Sauvegarde un processus d'ecoute dans la base"""
+        await self._run(self._save_process, transaction_id, process_data)
+
+    async def load_processes(self) -> list[StoredListeningProcess]:
+        """Charge tous les processus d'ecoute de la base"""
+        return await self._run(self._load_processes)
+
+    async def count_processes(self) -> int:
+        """Retourne le nombre de processus d'ecoute persistés"""
+        count, _ = await self._run(self._get_processes_bounds)
+        return count
+
+    async def iter_processes(
+        self, chunk_size: int = 500
+    ) -> AsyncIterator[list[StoredListeningProcess]]:
+        """
+        Parcourt les processus d'ecoute de la base par lots de `chunk_size` lignes.
+
+        Seules les lignes présentes au début du parcours sont retournées : celles insérées
+        pendant le parcours (ex: processus rechargés puis re-persistés) sont ignorées.
+        """
+        _, max_id = await self._run(self._get_processes_bounds)
+        if max_id is None:
+            return
+        after_id = 0
+        while True:
+            page = await self._run(
+                self._load_processes_page, after_id, max_id, chunk_size
             )
-            db.commit()
-            return count != 0
+            if not page:
+                return
+            yield page
+            if len(page) < chunk_size:
+                return
+            after_id = page[-1].StoredEventWaitingProcess_id
+
+    async def delete_process(self, transaction_id: int):
+        """Supprime un processus d'ecoute"""
+        return await self._run(self._delete_process, transaction_id)
+
+    async def update_process(self, transaction_id: int, process_data: BaseModel):
+        """Met à jour un processus d'ecoute"""
+        return await self._run(self._update_process, transaction_id, process_data)
+
+    async def apply_batch(
+        self,
+        operations: Sequence[tuple[int, ProcessOperation, Optional[BaseModel]]],
+    ):
+        """Applique une série d'opérations sur les processus d'ecoute dans une seule transaction"""
+        await self._run(self._apply_batch, operations)
+
+    async def close(self):
+        """Libère les connexions de la base et le thread dédié aux requêtes synchrones"""
+        if self.is_async:
+            await self.engine.dispose()
+        else:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self.engine.dispose()
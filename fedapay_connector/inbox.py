@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Optional
+
+# longueur, crc32 du corps, date de réception
+_RECORD_HEADER = struct.Struct(">IId")
+_SEGMENT_PREFIX = "inbox-"
+_SEGMENT_SUFFIX = ".log"
+# position (dans le segment) d'un enregistrement acquitté
+_ACK_RECORD = struct.Struct(">Q")
+_ACK_SUFFIX = ".ack"
+
+# nom du segment et position de l'enregistrement dans ce segment
+InboxPosition = tuple[str, int]
+
+
+class WebhookInbox:
+    """
+    Journal d'écriture anticipée (write-ahead) des webhooks reçus.
+
+    Chaque webhook vérifié est ajouté à la fin du segment courant avant d'être acquitté :
+    les ajouts concurrents sont regroupés en une seule écriture suivie d'un seul `fsync`
+    (fsync groupé). Au démarrage, `replay()` relit séquentiellement les segments (via `mmap`)
+    pour restituer au `FedapayEvent` les webhooks reçus avant un arrêt, sans requête en base.
+
+    Un webhook traité est marqué comme consommé (`ack`) : sa position est ajoutée au fichier `.ack`
+    de son segment, sans `fsync` (un acquittement perdu ne fait que rejouer un webhook déjà traité,
+    que la déduplication ignore). `replay()` ne restitue que les webhooks non consommés, et supprime
+    les segments clos qui n'en contiennent plus.
+
+    Un segment est clos dès qu'il dépasse `segment_max_bytes` ; les segments clos dont le dernier
+    ajout date de plus de `retention` secondes sont supprimés. Chaque démarrage ouvre un nouveau
+    segment, de sorte qu'une fin d'enregistrement tronquée par un arrêt brutal n'est jamais suivie
+    de nouvelles données.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        directory: str = "fedapay_connector_persisted_data/inbox",
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        retention: float = 86400,
+    ):
+        self._logger = logger
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.retention = retention
+        # un seul thread d'écriture : les lots sont écrits dans leur ordre d'arrivée
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fedapay-webhook-inbox"
+        )
+        self._file: Optional[BinaryIO] = None
+        self._file_size = 0
+        self._pending: list[bytes] = []
+        self._waiters: list[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._acks: list[InboxPosition] = []
+        self._ack_task: Optional[asyncio.Task] = None
+
+    def _segment_paths(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in sorted(os.listdir(self.directory))
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+        ]
+
+    def _ack_path(self, segment: str) -> str:
+        return os.path.join(
+            self.directory, segment[: -len(_SEGMENT_SUFFIX)] + _ACK_SUFFIX
+        )
+
+    def _remove_segment(self, path: str):
+        os.remove(path)
+        ack_path = self._ack_path(os.path.basename(path))
+        if os.path.exists(ack_path):
+            os.remove(ack_path)
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._segment_paths()
+        sequence = 0
+        if segments:
+            last = os.path.basename(segments[-1])
+            sequence = int(last[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)]) + 1
+        path = os.path.join(
+            self.directory, f"{_SEGMENT_PREFIX}{sequence:012d}{_SEGMENT_SUFFIX}"
+        )
+        # sans tampon : une écriture échouée ne laisse aucune donnée en attente d'être vidée plus tard
+        self._file = open(path, "ab", buffering=0)
+        self._file_size = 0
+
+    def _purge_expired_segments(self):
+        limit = time.time() - self.retention
+        current = self._file.name if self._file else None
+        for path in self._segment_paths():
+            if path != current and os.path.getmtime(path) < limit:
+                self._remove_segment(path)
+
+    def _write(self, data: bytes) -> InboxPosition:
+        if self._file is None or self._file_size >= self.segment_max_bytes:
+            if self._file is not None:
+                self._file.close()
+            self._open_segment()
+            self._purge_expired_segments()
+        start = self._file_size
+        try:
+            view = memoryview(data)
+            written = 0
+            while written < len(view):
+                written += self._file.write(view[written:])
+            os.fsync(self._file.fileno())
+        except OSError:
+            self._rollback(start)
+            raise
+        self._file_size += len(data)
+        return os.path.basename(self._file.name), start
+
+    def _rollback(self, size: int):
+        # un lot écrit en partie est retiré : les ajouts suivants ne doivent pas le suivre, sans quoi
+        # `replay()` s'arrêterait sur l'enregistrement incomplet et ignorerait tout ce qui vient après
+        try:
+            os.ftruncate(self._file.fileno(), size)
+        except OSError as e:
+            self._logger.error(
+                f"Impossible de tronquer {self._file.name} après un échec d'écriture : {e} -- segment clos"
+            )
+            self._file.close()
+            self._file = None
+
+    async def append(self, payload: bytes) -> InboxPosition:
+        """
+        Enregistre durablement le corps brut d'un webhook ; rend la main une fois le `fsync` effectué.
+
+        Returns:
+            InboxPosition: Position de l'enregistrement, à passer à `ack` une fois le webhook traité.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.append(
+            _RECORD_HEADER.pack(len(payload), zlib.crc32(payload), time.time())
+            + payload
+        )
+        self._waiters.append(waiter)
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await waiter
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        try:
+            # les ajouts arrivés pendant une écriture forment le lot suivant
+            while self._pending:
+                records, waiters = self._pending, self._waiters
+                self._pending, self._waiters = [], []
+                try:
+                    segment, offset = await loop.run_in_executor(
+                        self._executor, self._write, b"".join(records)
+                    )
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de l'écriture de {len(records)} webhook(s) dans l'inbox : {e}"
+                    )
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    continue
+                for record, waiter in zip(records, waiters):
+                    if not waiter.done():
+                        waiter.set_result((segment, offset))
+                    offset += len(record)
+        finally:
+            self._flush_task = None
+
+    def ack(self, position: InboxPosition):
+        """
+        Marque comme consommé le webhook enregistré à `position` : il ne sera plus restitué par `replay()`.
+        """
+        self._acks.append(position)
+        if self._ack_task is None:
+            self._ack_task = asyncio.get_running_loop().create_task(self._flush_acks())
+
+    def _write_acks(self, acks: list[InboxPosition]):
+        by_segment: dict[str, list[int]] = {}
+        for segment, offset in acks:
+            by_segment.setdefault(segment, []).append(offset)
+        for segment, offsets in by_segment.items():
+            if not os.path.exists(os.path.join(self.directory, segment)):
+                # segment déjà supprimé (rétention) : rien à rejouer
+                continue
+            with open(self._ack_path(segment), "ab") as file:
+                file.write(b"".join(_ACK_RECORD.pack(offset) for offset in offsets))
+
+    async def _flush_acks(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._acks:
+                acks, self._acks = self._acks, []
+                try:
+                    await loop.run_in_executor(self._executor, self._write_acks, acks)
+                except Exception as e:
+                    self._logger.error(
+                        f"Erreur lors de l'acquittement de {len(acks)} webhook(s) de l'inbox : {e}"
+                    )
+        finally:
+            self._ack_task = None
+
+    def _read_acks(self, segment: str) -> set[int]:
+        ack_path = self._ack_path(segment)
+        if not os.path.exists(ack_path):
+            return set()
+        with open(ack_path, "rb") as file:
+            data = file.read()
+        # une fin d'acquittement tronquée par un arrêt brutal est ignorée
+        end = len(data) - len(data) % _ACK_RECORD.size
+        return {offset for (offset,) in _ACK_RECORD.iter_unpack(data[:end])}
+
+    def _read_segment(self, path: str, since: float) -> list[tuple[int, bytes]]:
+        records = []
+        acked = self._read_acks(os.path.basename(path))
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return records
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                offset, end = 0, len(view)
+                while offset + _RECORD_HEADER.size <= end:
+                    length, crc, received_at = _RECORD_HEADER.unpack_from(view, offset)
+                    start = offset + _RECORD_HEADER.size
+                    payload = view[start : start + length]
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        self._logger.warning(
+                            f"Enregistrement incomplet ou corrompu ignoré dans {path} (position {offset})"
+                        )
+                        break
+                    if received_at >= since and offset not in acked:
+                        records.append((offset, payload))
+                    offset = start + length
+        return records
+
+    async def replay(self) -> AsyncIterator[list[tuple[InboxPosition, bytes]]]:
+        """
+        Relit, segment par segment et dans l'ordre de réception, les webhooks non consommés reçus
+        depuis moins de `retention` secondes. Chaque webhook est accompagné de sa position, à passer
+        à `ack` une fois restitué. Les segments clos sans webhook à restituer sont supprimés.
+        """
+        loop = asyncio.get_running_loop()
+        since = time.time() - self.retention
+        current = self._file.name if self._file else None
+        for path in await loop.run_in_executor(self._executor, self._segment_paths):
+            if path == current:
+                continue
+            records = await loop.run_in_executor(
+                self._executor, self._read_segment, path, since
+            )
+            if not records:
+                await loop.run_in_executor(self._executor, self._remove_segment, path)
+                continue
+            segment = os.path.basename(path)
+            yield [((segment, offset), payload) for offset, payload in records]
+
+    async def close(self):
+        """
+        Attend l'écriture des webhooks en cours puis ferme le segment courant.
+        """
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._ack_task is not None:
+            await asyncio.gather(self._ack_task, return_exceptions=True)
+        if self._file is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._file.close
+            )
+            self._file = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import os
+import struct
+from typing import Awaitable, BinaryIO, Callable, Optional
+
+from .models import WebhookQueueStats
+
+WebhookIngestionHandler = Callable[[bytes], Awaitable[None]]
+# appelé après le traitement réussi d'un webhook (ex: acquittement dans l'inbox)
+WebhookDoneCallback = Callable[[], None]
+
+_RECORD_HEADER = struct.Struct(">I")
+
+
+class WebhookIngestionQueue:
+    """
+    File bornée de webhooks acquittés mais pas encore traités.
+
+    La route webhook vérifie la signature puis dépose le corps brut dans la file et répond
+    immédiatement : le traitement (validation, persistance, résolution des futures, callbacks)
+    est assuré par `workers` tâches qui vident la file. La latence de réponse à FedaPay ne
+    dépend donc plus de la base de données.
+
+    Au-delà de `max_size` webhooks en mémoire, les suivants sont déversés dans `spill_path`
+    (enregistrements préfixés par leur longueur) s'il est fourni, puis réinjectés dans la file
+    dans leur ordre d'arrivée à mesure qu'elle se vide ; sinon ils sont refusés et la route
+    répond 503 afin que FedaPay les renvoie plus tard. Le callback `on_done` d'un webhook
+    n'est conservé qu'en mémoire : il n'est pas appelé pour un webhook passé par le disque.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        handler: WebhookIngestionHandler,
+        max_size: int = 10_000,
+        workers: int = 4,
+        spill_path: Optional[str] = None,
+    ):
+        self._logger = logger
+        self._handler = handler
+        self.max_size = max_size
+        self.workers = workers
+        self.spill_path = spill_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._spill_file: Optional[BinaryIO] = None
+        self._spill_read_offset = 0
+        self._spilled = 0
+        # webhooks en cours de traitement interrompus par l'arrêt des workers
+        self._interrupted: list[bytes] = []
+        self._received = 0
+        self._processed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_depth_seen = 0
+
+    @property
+    def started(self) -> bool:
+        return self._queue is not None
+
+    def _open_spill(self):
+        spill_dir = os.path.dirname(self.spill_path)
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        mode = "r+b" if os.path.exists(self.spill_path) else "w+b"
+        self._spill_file = open(self.spill_path, mode)
+
+        # webhooks déversés mais non traités avant l'arrêt précédent
+        end = self._spill_file.seek(0, os.SEEK_END)
+        offset = 0
+        self._spill_file.seek(0)
+        while offset + _RECORD_HEADER.size <= end:
+            (length,) = _RECORD_HEADER.unpack(
+                self._spill_file.read(_RECORD_HEADER.size)
+            )
+            if offset + _RECORD_HEADER.size + length > end:
+                # enregistrement tronqué par un arrêt brutal
+                self._spill_file.truncate(offset)
+                break
+            offset = self._spill_file.seek(length, os.SEEK_CUR)
+            self._spilled += 1
+        if self._spilled:
+            self._logger.info(
+                f"{self._spilled} webhook(s) en attente rechargé(s) depuis {self.spill_path}"
+            )
+
+    async def start(self):
+        """
+        Démarre les workers de traitement dans la boucle asyncio courante.
+        """
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        if self.spill_path:
+            self._open_spill()
+            self._refill()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        self._logger.info(
+            f"File d'ingestion des webhooks démarrée ({self.workers} worker(s), capacité {self.max_size})"
+        )
+
+    def submit(
+        self, payload: bytes, on_done: Optional[WebhookDoneCallback] = None
+    ) -> bool:
+        """
+        Dépose un webhook dans la file sans attendre son traitement.
+
+        Args:
+            payload (bytes): Corps brut du webhook.
+            on_done (Optional[WebhookDoneCallback]): Appelé une fois le webhook traité sans erreur.
+
+        Returns:
+            bool: False si la file est saturée et que le webhook n'a pas pu être accepté.
+        """
+        self._received += 1
+        # tant que des webhooks sont déversés sur disque, les nouveaux les suivent pour préserver l'ordre
+        if not self._spilled:
+            try:
+                self._queue.put_nowait((payload, on_done))
+                self._max_depth_seen = max(self._max_depth_seen, self._queue.qsize())
+                return True
+            except asyncio.QueueFull:
+                pass
+
+        if self._spill_file is not None:
+            try:
+                self._spill(payload)
+                return True
+            except OSError as e:
+                self._logger.error(
+                    f"Erreur lors du déversement d'un webhook sur disque : {e}"
+                )
+
+        self._rejected += 1
+        self._logger.warning(
+            f"File d'ingestion des webhooks saturée ({self.max_size}) : webhook refusé"
+        )
+        return False
+
+    def _spill(self, payload: bytes):
+        self._spill_file.seek(0, os.SEEK_END)
+        self._spill_file.write(_RECORD_HEADER.pack(len(payload)) + payload)
+        self._spill_file.flush()
+        self._spilled += 1
+
+    def _refill(self):
+        if not self._spilled:
+            return
+        self._spill_file.seek(self._spill_read_offset)
+        while self._spilled and not self._queue.full():
+            (length,) = _RECORD_HEADER.unpack(
+                self._spill_file.read(_RECORD_HEADER.size)
+            )
+            self._queue.put_nowait((self._spill_file.read(length), None))
+            self._spilled -= 1
+        self._spill_read_offset = self._spill_file.tell()
+        if not self._spilled:
+            # tout a été réinjecté : le fichier repart de zéro
+            self._spill_file.truncate(0)
+            self._spill_read_offset = 0
+
+    async def _worker(self):
+        while True:
+            payload, on_done = await self._queue.get()
+            try:
+                await self._handler(payload)
+                self._processed += 1
+                if on_done is not None:
+                    on_done()
+            except asyncio.CancelledError:
+                # arrêt pendant le traitement : le webhook, déjà acquitté, est conservé avec les non traités
+                self._interrupted.append(payload)
+                raise
+            except Exception as e:
+                self._failed += 1
+                self._logger.error(
+                    f"Erreur lors du traitement d'un webhook de la file d'ingestion : {e}"
+                )
+            finally:
+                # réinjection avant task_done : join() ne rend pas la main tant que le disque n'est pas vidé
+                self._refill()
+                self._queue.task_done()
+
+    def stats(self) -> WebhookQueueStats:
+        """
+        Retourne les métriques de la file (profondeur, débordement disque, refus, erreurs).
+        """
+        return WebhookQueueStats(
+            queue_depth=self._queue.qsize() if self._queue else 0,
+            spilled=self._spilled,
+            max_size=self.max_size,
+            workers=self.workers,
+            received=self._received,
+            processed=self._processed,
+            failed=self._failed,
+            rejected=self._rejected,
+            max_depth_seen=self._max_depth_seen,
+        )
+
+    def _persist_remaining(self):
+        # les webhooks interrompus puis ceux restés en mémoire sont réécrits en tête du fichier,
+        # devant ceux encore déversés
+        pending, self._interrupted = self._interrupted, []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait()[0])
+        self._spill_file.seek(self._spill_read_offset)
+        remaining = self._spill_file.read()
+        self._spill_file.seek(0)
+        self._spill_file.truncate(0)
+        for payload in pending:
+            self._spill_file.write(_RECORD_HEADER.pack(len(payload)) + payload)
+        self._spill_file.write(remaining)
+        self._spill_file.flush()
+        self._spill_read_offset = 0
+        self._spilled += len(pending)
+
+    async def close(self, timeout: Optional[float] = None):
+        """
+        Traite les webhooks déjà acquittés (dans la limite de `timeout` secondes) puis arrête les workers.
+
+        Si un fichier de débordement est configuré, les webhooks non traités, y compris ceux dont
+        le traitement a été interrompu par l'arrêt, y sont conservés pour le prochain démarrage.
+        """
+        if not self.started:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        unprocessed = len(self._interrupted) + self._queue.qsize() + self._spilled
+        if unprocessed:
+            self._logger.warning(
+                f"{unprocessed} webhook(s) non traité(s) à l'arrêt de la file d'ingestion"
+                + (
+                    f", conservé(s) dans {self.spill_path}"
+                    if self._spill_file is not None
+                    else " (aucun fichier de débordement configuré)"
+                )
+            )
+        if self._spill_file is not None:
+            self._persist_remaining()
+            self._spill_file.close()
+            self._spill_file = None
+        self._interrupted = []
+        self._queue = None
@@ -19,7 +19,7 @@ avec ce programme. Si ce n'est pas le cas, consultez <https://www.gnu.org/licens
 
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any, Sequence
 
 from fedapay_connector import utils
 from fedapay_connector.models import (
@@ -40,8 +40,20 @@ from fedapay_connector.models import (
     UserData,
     WebhookListResponse,
     WebhookResponse,
+    TransactionExportSummary,
 )
-from .integrations import Transactions, Balances, Currencies, Events, Logs, Webhooks
+from fedapay_connector.enums import ExportFormat
+from .integrations import (
+    Transactions,
+    Balances,
+    Currencies,
+    Events,
+    Logs,
+    Webhooks,
+    HttpClient,
+    TransactionExporter,
+)
+from .integrations.pagination import iter_paginated
 
 
 class Integration:
@@ -52,6 +64,9 @@ class Integration:
     en un seul point d'entrée. Elle permet aux utilisateurs avancés de gérer manuellement
     le cycle de vie complet des ressources FedaPay (CRUD) sans passer par les workflows automatiques
     du connecteur.
+
+    Tous les services partagent un même pool de connexions HTTP ; appelez `close()` (ou utilisez
+    l'instance comme gestionnaire de contexte asynchrone) pour le libérer.
     """
 
     def __init__(
@@ -59,6 +74,7 @@ class Integration:
         api_url: str = os.getenv("FEDAPAY_API_URL"),
         logger: logging.Logger = None,
         default_api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY"),
+        http_client: Optional[HttpClient] = None,
     ):
         """
         Initialise le connecteur d'intégration FedaPay.
@@ -67,6 +83,8 @@ class Integration:
             api_url (str): L'URL de base de l'API FedaPay (par défaut, lue depuis FEDAPAY_API_URL).
             logger: Instance de logger pour l'enregistrement des événements. Par défaut, un logger standard est initialisé.
             default_api_key (Optional[str]): Clé API par défaut à utiliser si non spécifiée dans les méthodes.
+            http_client (Optional[HttpClient]): Client HTTP partagé à réutiliser (ex: celui du `FedapayConnector`).
+                Si non fourni, un client dédié est créé et sera fermé par `close()`.
 
         Raises:
             ValueError: Si `api_url` ou `default_api_key` ne sont pas fournis.
@@ -84,22 +102,59 @@ class Integration:
         self.fedapay_api_url = api_url
         self._logger = logger or utils.initialize_logger()
         self.default_api_key = default_api_key
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or HttpClient(logger=self._logger)
 
         # Initialisation des classes de service
         self._transactions_service = Transactions(
-            api_url=self.fedapay_api_url, logger=self._logger
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
         )
         self._balances_service = Balances(
-            api_url=self.fedapay_api_url, logger=self._logger
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
         )
         self._currencies_service = Currencies(
-            api_url=self.fedapay_api_url, logger=self._logger
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
+        )
+        self._events_service = Events(
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
+        )
+        self._logs_service = Logs(
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
         )
-        self._events_service = Events(api_url=self.fedapay_api_url, logger=self._logger)
-        self._logs_service = Logs(api_url=self.fedapay_api_url, logger=self._logger)
         self._webhooks_service = Webhooks(
-            api_url=self.fedapay_api_url, logger=self._logger
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
         )
+        self._exporter = TransactionExporter(
+            api_url=self.fedapay_api_url,
+            logger=self._logger,
+            http_client=self._http_client,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Ferme le pool de connexions HTTP s'il a été créé par cette instance.
+        Un client HTTP fourni à la construction reste sous la responsabilité de son propriétaire.
+        """
+        if self._owns_http_client:
+            await self._http_client.close()
 
     # ----------------------------------------
     # FAÇADE : Transactions
@@ -124,6 +179,78 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_transactions(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[Transaction]:
+        """
+        Parcourt toutes les transactions du compte marchand, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage (ex: {'status': 'approved'}).
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            Transaction: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._transactions_service._get_all_transactions(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "transactions", params, per_page):
+            yield item
+
+    async def export_transactions(
+        self,
+        directory: str,
+        params: Optional[Dict[str, Any]] = None,
+        export_format: ExportFormat = ExportFormat.CSV,
+        columns: Optional[Sequence[str]] = None,
+        per_page: int = 100,
+        concurrency: int = 4,
+        rows_per_file: int = 100_000,
+        checkpoint_path: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> TransactionExportSummary:
+        """
+        Exporte l'historique des transactions vers des fichiers CSV, JSON Lines ou Parquet, en mémoire constante.
+
+        Les pages sont téléchargées en parallèle (au plus `concurrency`) et converties directement en
+        lignes, sans modèles pydantic. Avec `checkpoint_path`, un export interrompu reprend au dernier
+        fichier terminé lorsqu'il est relancé avec les mêmes paramètres.
+
+        Args:
+            directory (str): Dossier de destination des fichiers.
+            params (Optional[Dict[str, Any]]): Filtres de recherche (ex: période, statut).
+            export_format (ExportFormat): Format des fichiers (PARQUET nécessite `pyarrow`).
+            columns (Optional[Sequence[str]]): Champs exportés (par défaut : identifiants, montants, statut et dates).
+            per_page (int): Nombre de transactions par page demandée.
+            concurrency (int): Nombre maximum de pages téléchargées simultanément.
+            rows_per_file (int): Nombre de lignes au-delà duquel un nouveau fichier est commencé.
+            checkpoint_path (Optional[str]): Fichier du point de reprise.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Returns:
+            TransactionExportSummary: Fichiers produits, nombre de transactions et durée de l'export.
+        """
+        return await self._exporter._export(
+            directory=directory,
+            params=params,
+            export_format=export_format,
+            columns=columns,
+            per_page=per_page,
+            concurrency=concurrency,
+            rows_per_file=rows_per_file,
+            checkpoint_path=checkpoint_path,
+            api_key=api_key or self.default_api_key,
+        )
+
     async def get_transaction_by_fedapay_id(
         self, fedapay_id: str, api_key: Optional[str] = None
     ) -> Transaction:
@@ -305,6 +432,33 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_balances(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[BalanceResponse]:
+        """
+        Parcourt tous les soldes du compte marchand, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage.
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            BalanceResponse: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._balances_service._get_all_balances(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "balances", params, per_page):
+            yield item
+
     async def get_balance_by_id(
         self, balance_id: str, api_key: Optional[str] = None
     ) -> BalanceResponse:
@@ -343,6 +497,33 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_currencies(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[CurrencyResponse]:
+        """
+        Parcourt toutes les devises supportées, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage.
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            CurrencyResponse: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._currencies_service._get_all_currencies(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "currencies", params, per_page):
+            yield item
+
     async def get_currency_by_id(
         self, currency_id: int, api_key: Optional[str] = None
     ) -> CurrencyResponse:
@@ -381,6 +562,33 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_events(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[EventResponse]:
+        """
+        Parcourt tous les événements du compte marchand, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage (ex: {'type': 'transaction.approved'}).
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            EventResponse: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._events_service._get_all_events(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "events", params, per_page):
+            yield item
+
     async def get_event_by_id(
         self, event_id: str, api_key: Optional[str] = None
     ) -> EventResponse:
@@ -419,6 +627,33 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_logs(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[LogResponse]:
+        """
+        Parcourt tous les logs des requêtes API, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage.
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            LogResponse: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._logs_service._get_all_logs(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "logs", params, per_page):
+            yield item
+
     async def get_log_by_id(
         self, log_id: str, api_key: Optional[str] = None
     ) -> LogResponse:
@@ -457,6 +692,33 @@ class Integration:
             params=params, api_key=api_key or self.default_api_key
         )
 
+    async def iter_webhooks(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[WebhookResponse]:
+        """
+        Parcourt tous les webhooks enregistrés, page par page, en préchargeant la page suivante.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Paramètres de requête pour le filtrage.
+            per_page (int): Nombre d'éléments demandés par page.
+            api_key (Optional[str]): Clé API à utiliser.
+
+        Yields:
+            WebhookResponse: Chaque élément, dans l'ordre de l'API.
+        """
+        api_key = api_key or self.default_api_key
+
+        async def fetch_page(page_params: Dict[str, Any]):
+            return await self._webhooks_service._get_all_webhooks(
+                params=page_params, api_key=api_key
+            )
+
+        async for item in iter_paginated(fetch_page, "webhooks", params, per_page):
+            yield item
+
     async def get_webhook_by_id(
         self, webhook_id: str, api_key: Optional[str] = None
     ) -> WebhookResponse:
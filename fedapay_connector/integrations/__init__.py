@@ -4,3 +4,7 @@ from .currencies import Currencies  # noqa: F401
 from .events import Events  # noqa: F401
 from .logs import Logs  # noqa: F401
 from .webhooks import Webhooks  # noqa: F401
+from .http_client import HttpClient  # noqa: F401
+from .rate_limiter import RateLimiter  # noqa: F401
+from .retry import RetryPolicy  # noqa: F401
+from .export import TransactionExporter  # noqa: F401
@@ -1,10 +1,8 @@
 import os
 from typing import Optional, Dict, Any
 
-import aiohttp
-
-from fedapay_connector import utils
 from fedapay_connector.models import BalanceListResponse, BalanceResponse
+from .http_client import HttpClient
 
 
 class Balances:
@@ -13,16 +11,18 @@ class Balances:
     sur l'API FedaPay.
     """
 
-    def __init__(self, api_url: str, logger):
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
         """
         Initialise le service Balances.
 
         Args:
             api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
             logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
         """
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _get_all_balances(
         self,
@@ -43,17 +43,12 @@ class Balances:
         self._logger.info(
             "Récupération de la liste des soldes (balances) avec les paramètres de requête."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/balances", params=params
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/balances",
+            api_key=api_key,
+            params=params,
+        )
         return BalanceListResponse(**data) if data else None
 
     async def _get_balance_by_id(
@@ -72,16 +67,10 @@ class Balances:
         self._logger.info(
             f"Récupération des détails du solde (balance) ID: {balance_id}."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/balances/{balance_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/balances/{balance_id}",
+            api_key=api_key,
+        )
         balance = data.get("v1/balance", None)
         return BalanceResponse(**balance) if balance else None
@@ -1,9 +1,7 @@
 from typing import Any, Dict, Optional
 
-import aiohttp
-
-from fedapay_connector import utils
 from fedapay_connector.models import CurrencyListResponse, CurrencyResponse
+from .http_client import HttpClient
 
 
 class Currencies:
@@ -12,16 +10,18 @@ class Currencies:
     sur l'API FedaPay.
     """
 
-    def __init__(self, api_url: str, logger):
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
         """
         Initialise le service Currencies.
 
         Args:
             api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
             logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
         """
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _get_all_currencies(
         self, params: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None
@@ -38,17 +38,12 @@ class Currencies:
             CurrencyListResponse: Objet contenant la liste des devises et les métadonnées.
         """
         self._logger.info("Récupération de la liste complète des devises supportées.")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/currencies", params=params
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/currencies",
+            api_key=api_key,
+            params=params,
+        )
         return CurrencyListResponse(**data) if data else None
 
     async def _get_currency_by_id(
@@ -68,16 +63,10 @@ class Currencies:
         self._logger.info(
             f"Récupération des détails de la devise ID/ISO : {currency_id}."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/currencies/{currency_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/currencies/{currency_id}",
+            api_key=api_key,
+        )
         currency = data.get("v1/currency", None)
         return CurrencyResponse(**currency) if currency else None
@@ -1,9 +1,7 @@
 from typing import Any, Dict, Optional
 
-import aiohttp
-
-from fedapay_connector import utils
 from fedapay_connector.models import EventListResponse, EventResponse
+from .http_client import HttpClient
 
 
 class Events:
@@ -13,16 +11,18 @@ class Events:
     d'état des ressources (e.g., transaction.approved, payment_method.created).
     """
 
-    def __init__(self, api_url: str, logger):
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
         """
         Initialise le service Events.
 
         Args:
             api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
             logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
         """
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _get_all_events(
         self, params: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None
@@ -41,17 +41,12 @@ class Events:
         self._logger.info(
             "Récupération de la liste des événements (Events) avec filtres optionnels."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/events", params=params
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/events",
+            api_key=api_key,
+            params=params,
+        )
         return EventListResponse(**data) if data else None
 
     async def _get_event_by_id(self, event_id: str, api_key: Optional[str] = None):
@@ -67,16 +62,10 @@ class Events:
             EventResponse: L'objet Événement (Event) détaillé.
         """
         self._logger.info(f"Récupération des détails de l'événement ID : {event_id}.")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/events/{event_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/events/{event_id}",
+            api_key=api_key,
+        )
         event = data.get("v1/event", None)
         return EventResponse(**event) if event else None
@@ -0,0 +1,343 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Sequence, get_args
+
+from fedapay_connector.enums import ExportFormat
+from fedapay_connector.exceptions import ConfigError
+from fedapay_connector.models import (
+    ExportCheckpoint,
+    Transaction,
+    TransactionExportSummary,
+)
+from .http_client import HttpClient
+
+DEFAULT_TRANSACTION_COLUMNS = (
+    "id",
+    "reference",
+    "merchant_reference",
+    "amount",
+    "fees",
+    "commission",
+    "amount_transferred",
+    "status",
+    "mode",
+    "operation",
+    "description",
+    "customer_id",
+    "currency_id",
+    "created_at",
+    "approved_at",
+    "canceled_at",
+    "declined_at",
+    "refunded_at",
+    "transferred_at",
+    "last_error_code",
+    "custom_metadata",
+)
+
+_EXTENSIONS = {
+    ExportFormat.CSV: "csv",
+    ExportFormat.JSONL: "jsonl",
+    ExportFormat.PARQUET: "parquet",
+}
+
+
+def _cell(value: Any) -> Any:
+    # valeurs imbriquées (métadonnées, client...) aplaties en JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
+
+
+class _CsvFile:
+    def __init__(self, path: str, columns: Sequence[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: list[list[Any]]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _JsonLinesFile:
+    def __init__(self, path: str, columns: Sequence[str]):
+        self._file = open(path, "w", encoding="utf-8")
+        self._columns = columns
+
+    def write(self, rows: list[list[Any]]):
+        self._file.writelines(
+            json.dumps(dict(zip(self._columns, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetFile:
+    def __init__(self, path: str, columns: Sequence[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ConfigError(
+                "L'export Parquet nécessite pyarrow : pip install fedapay_connector[parquet]"
+            ) from e
+        self._pa = pyarrow
+        self._path = path
+        self._columns = columns
+        self._parquet = pyarrow.parquet
+        self._schema = pyarrow.schema(
+            [(column, self._arrow_type(column)) for column in columns]
+        )
+        self._writer = None
+
+    def _arrow_type(self, column: str):
+        # schéma fixe déduit du modèle Transaction : les pages successives restent compatibles
+        field = Transaction.model_fields.get(column)
+        types = (get_args(field.annotation) or (field.annotation,)) if field else ()
+        if int in types:
+            return self._pa.int64()
+        if float in types:
+            return self._pa.float64()
+        return self._pa.string()
+
+    def write(self, rows: list[list[Any]]):
+        # une page = un groupe de lignes : seule la page courante est en mémoire
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(
+            self._pa.Table.from_pydict(
+                {
+                    column: [row[index] for row in rows]
+                    for index, column in enumerate(self._columns)
+                },
+                schema=self._schema,
+            )
+        )
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+_WRITERS = {
+    ExportFormat.CSV: _CsvFile,
+    ExportFormat.JSONL: _JsonLinesFile,
+    ExportFormat.PARQUET: _ParquetFile,
+}
+
+
+class TransactionExporter:
+    """
+    Export en masse de l'historique des transactions vers des fichiers CSV, JSON Lines ou Parquet.
+
+    Les pages de `/v1/transactions/search` sont téléchargées en parallèle (au plus `concurrency`
+    à la fois) puis écrites dans l'ordre, sans passer par les modèles pydantic : chaque
+    transaction est convertie directement en ligne à partir du JSON reçu. Seules les pages en
+    cours de téléchargement sont en mémoire, quel que soit le nombre total de transactions.
+
+    Les lignes sont réparties en fichiers d'environ `rows_per_file` lignes, écrits sous un nom
+    temporaire puis renommés une fois complets. Après chaque fichier, un point de reprise
+    (`checkpoint_path`) enregistre la prochaine page à exporter : un export interrompu reprend
+    au dernier fichier terminé.
+    """
+
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
+        """
+        Initialise le service d'export.
+
+        Args:
+            api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
+            logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
+        """
+        self.fedapay_api_url = api_url
+        self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
+
+    async def _fetch_page(
+        self,
+        page: int,
+        params: Dict[str, Any],
+        per_page: int,
+        api_key: Optional[str],
+    ) -> dict:
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/transactions/search",
+            api_key=api_key,
+            params={**params, "page": page, "per_page": per_page},
+        )
+        return data or {}
+
+    def _load_checkpoint(
+        self, checkpoint_path: Optional[str], expected: ExportCheckpoint
+    ) -> ExportCheckpoint:
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return expected
+        with open(checkpoint_path, encoding="utf-8") as file:
+            checkpoint = ExportCheckpoint.model_validate_json(file.read())
+        if (
+            checkpoint.params != expected.params
+            or checkpoint.per_page != expected.per_page
+            or checkpoint.export_format != expected.export_format
+            or checkpoint.columns != expected.columns
+        ):
+            raise ConfigError(
+                f"Le point de reprise {checkpoint_path} correspond à un autre export : supprimez-le ou changez de chemin"
+            )
+        self._logger.info(
+            f"Reprise de l'export à la page {checkpoint.next_page} ({checkpoint.rows} transaction(s) déjà exportée(s))"
+        )
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Optional[str], checkpoint: ExportCheckpoint):
+        if not checkpoint_path:
+            return
+        temporary = f"{checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(checkpoint.model_dump_json())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, checkpoint_path)
+
+    async def _export(
+        self,
+        directory: str,
+        params: Optional[Dict[str, Any]] = None,
+        export_format: ExportFormat = ExportFormat.CSV,
+        columns: Optional[Sequence[str]] = None,
+        per_page: int = 100,
+        concurrency: int = 4,
+        rows_per_file: int = 100_000,
+        checkpoint_path: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> TransactionExportSummary:
+        """
+        Exporte toutes les transactions correspondant à `params` dans `directory`.
+
+        Args:
+            directory (str): Dossier de destination des fichiers `transactions-00000.<ext>`.
+            params (Optional[Dict[str, Any]]): Filtres de recherche (ex: période). Fixer une période
+                passée garantit des pages stables pendant l'export et lors d'une reprise.
+            export_format (ExportFormat): CSV, JSONL ou PARQUET (nécessite pyarrow).
+            columns (Optional[Sequence[str]]): Champs exportés, `DEFAULT_TRANSACTION_COLUMNS` par défaut.
+            per_page (int): Nombre de transactions par page demandée.
+            concurrency (int): Nombre maximum de pages téléchargées simultanément.
+            rows_per_file (int): Nombre de lignes au-delà duquel un nouveau fichier est commencé.
+            checkpoint_path (Optional[str]): Fichier du point de reprise ; supprimé à la fin de l'export.
+            api_key (Optional[str]): Clé API du compte marchand pour l'authentification.
+
+        Returns:
+            TransactionExportSummary: Fichiers produits, nombre de transactions et de pages exportées.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency doit être supérieur ou égal à 1")
+        started_at = time.perf_counter()
+        params = dict(params or {})
+        columns = list(columns or DEFAULT_TRANSACTION_COLUMNS)
+        writer_class = _WRITERS[export_format]
+        extension = _EXTENSIONS[export_format]
+        os.makedirs(directory, exist_ok=True)
+
+        checkpoint = self._load_checkpoint(
+            checkpoint_path,
+            ExportCheckpoint(
+                params=params,
+                per_page=per_page,
+                export_format=export_format,
+                columns=columns,
+            ),
+        )
+        resumed_from_page = checkpoint.next_page
+        pages = 0
+
+        first = await self._fetch_page(checkpoint.next_page, params, per_page, api_key)
+        total_pages = (first.get("meta") or {}).get("total_pages") or 0
+        self._logger.info(
+            f"Export des transactions : pages {checkpoint.next_page} à {total_pages} ({export_format.value})"
+        )
+
+        loop = asyncio.get_running_loop()
+        in_flight: deque[asyncio.Future] = deque()
+        first_future = loop.create_future()
+        first_future.set_result(first)
+        in_flight.append(first_future)
+        next_to_fetch = checkpoint.next_page + 1
+
+        current = None
+        current_path = None
+        rows_in_file = 0
+        try:
+            while in_flight or next_to_fetch <= total_pages:
+                # fenêtre glissante : les pages suivantes se téléchargent pendant l'écriture
+                while len(in_flight) < concurrency and next_to_fetch <= total_pages:
+                    in_flight.append(
+                        asyncio.create_task(
+                            self._fetch_page(next_to_fetch, params, per_page, api_key)
+                        )
+                    )
+                    next_to_fetch += 1
+
+                data = await in_flight.popleft()
+                transactions = data.get("v1/transactions") or []
+                if transactions:
+                    if current is None:
+                        current_path = os.path.join(
+                            directory,
+                            f"transactions-{checkpoint.file_index:05d}.{extension}",
+                        )
+                        current = writer_class(f"{current_path}.part", columns)
+                    rows = [
+                        [_cell(transaction.get(column)) for column in columns]
+                        for transaction in transactions
+                    ]
+                    await loop.run_in_executor(None, current.write, rows)
+                    rows_in_file += len(rows)
+                    checkpoint.rows += len(rows)
+                checkpoint.next_page += 1
+                pages += 1
+
+                finished = not in_flight and next_to_fetch > total_pages
+                if current is not None and (rows_in_file >= rows_per_file or finished):
+                    current.close()
+                    current = None
+                    os.replace(f"{current_path}.part", current_path)
+                    checkpoint.files.append(current_path)
+                    checkpoint.file_index += 1
+                    rows_in_file = 0
+                    self._save_checkpoint(checkpoint_path, checkpoint)
+                    self._logger.info(
+                        f"Fichier d'export terminé : {current_path} ({checkpoint.rows} transaction(s) au total)"
+                    )
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            if current is not None:
+                # fichier incomplet : il sera réécrit depuis le point de reprise
+                current.close()
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        summary = TransactionExportSummary(
+            files=checkpoint.files,
+            rows=checkpoint.rows,
+            pages=pages,
+            resumed_from_page=resumed_from_page,
+            duration=time.perf_counter() - started_at,
+        )
+        self._logger.info(
+            f"Export terminé : {summary.rows} transaction(s) dans {len(summary.files)} fichier(s) en {summary.duration:.1f}s"
+        )
+        return summary
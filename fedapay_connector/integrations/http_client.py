@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from fedapay_connector import utils
+from fedapay_connector.models import RateLimitLaneStats, RetryStats, SingleFlightStats
+from .rate_limiter import RateLimiter, parse_retry_after
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+
+
+class HttpClient:
+    """
+    Client HTTP partagé par tous les services d'intégration FedaPay.
+
+    Il maintient une unique `aiohttp.ClientSession` adossée à un pool de connexions
+    (`aiohttp.TCPConnector`) afin de réutiliser les connexions TCP/TLS déjà établies
+    au lieu d'en ouvrir une nouvelle à chaque appel de l'API.
+
+    La session est créée paresseusement au premier appel (elle doit l'être dans une boucle
+    asyncio active) et doit être fermée via `close()` à l'arrêt de l'application.
+
+    Les requêtes GET identiques (même URL, mêmes paramètres, même clé API) lancées simultanément
+    sont regroupées : une seule requête réseau est émise et son résultat est partagé par tous
+    les appelants (`coalesce_reads`).
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: Optional[int] = 300,
+        request_timeout: Optional[float] = 60,
+        coalesce_reads: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Initialise le client HTTP partagé.
+
+        Args:
+            logger: Instance de logger pour l'enregistrement des événements.
+            pool_limit (int): Nombre maximal de connexions simultanées du pool (0 = illimité).
+            pool_limit_per_host (int): Nombre maximal de connexions simultanées vers un même hôte (0 = illimité).
+            keepalive_timeout (float): Durée (en secondes) de conservation d'une connexion inactive dans le pool.
+            dns_cache_ttl (Optional[int]): Durée de vie (en secondes) du cache DNS (None = cache permanent).
+            request_timeout (Optional[float]): Délai maximal total (en secondes) d'une requête.
+            coalesce_reads (bool): Regroupe les requêtes GET identiques simultanées en une seule requête réseau.
+            rate_limiter (Optional[RateLimiter]): Régulateur de débit et de concurrence appliqué à chaque requête émise.
+            retry_policy (Optional[RetryPolicy]): Politique de reprise des erreurs transitoires (None = aucune nouvelle tentative).
+        """
+        self._logger = logger
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self._single_flight: Optional[SingleFlight] = (
+            SingleFlight() if coalesce_reads else None
+        )
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Retourne la session partagée, en la créant si nécessaire.
+        """
+        if not self.closed:
+            return self._session
+
+        async with self._session_lock:
+            if self.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_limit,
+                    limit_per_host=self.pool_limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    raise_for_status=True,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                )
+                self._logger.info(
+                    f"Session HTTP partagée créée (pool: {self.pool_limit}, par hôte: {self.pool_limit_per_host}, keep-alive: {self.keepalive_timeout}s)."
+                )
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        api_key: Optional[str] = None,
+        json_body: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        recover: Optional[Callable[[], Awaitable[Optional[Tuple[int, Any]]]]] = None,
+        settled_statuses: Tuple[int, ...] = (),
+    ) -> Tuple[int, Any]:
+        """
+        Exécute une requête authentifiée sur la session partagée.
+
+        Args:
+            method (str): Méthode HTTP (GET, POST, PUT, DELETE).
+            url (str): URL complète de l'endpoint.
+            api_key (Optional[str]): Clé API du compte marchand pour l'authentification.
+            json_body (Optional[Any]): Corps JSON de la requête.
+            params (Optional[Dict[str, Any]]): Paramètres de requête.
+            recover (Optional[Callable]): Lecture de rattrapage d'une requête non idempotente, appelée
+                avant de la rejouer après une erreur transitoire : la réponse (statut, corps) qu'elle
+                retourne est retenue à la place d'une nouvelle tentative, None la laisse rejouer.
+            settled_statuses (Tuple[int, ...]): Statuts d'erreur qui, reçus sur une tentative rejouée,
+                signifient que la tentative précédente a abouti (ex: 404 sur un DELETE) : le statut est
+                alors retourné (corps None) au lieu de lever l'erreur.
+
+        Returns:
+            Tuple[int, Any]: Le code de statut HTTP et le corps JSON décodé (None si vide).
+
+        Raises:
+            aiohttp.ClientResponseError: Si le statut de la réponse est >= 400.
+
+        Note:
+            Le corps décodé d'une requête GET regroupée est le même objet pour tous les appelants :
+            il doit être traité en lecture seule.
+        """
+
+        attempts = 0
+
+        def send():
+            nonlocal attempts
+            attempts += 1
+            return self._send(method, url, api_key, json_body, params)
+
+        async def call():
+            if self._retry_policy is None:
+                return await send()
+            try:
+                return await self._retry_policy.run(
+                    method, url, send, self._logger, recover=recover
+                )
+            except aiohttp.ClientResponseError as e:
+                if attempts > 1 and e.status in settled_statuses:
+                    self._logger.info(
+                        f"{method} {url} : statut {e.status} sur une tentative rejouée, la tentative précédente a abouti."
+                    )
+                    return e.status, None
+                raise
+
+        if self._single_flight is not None and method.upper() == "GET":
+            key = (
+                url,
+                api_key,
+                tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            )
+            return await self._single_flight.do(key, call)
+        return await call()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        api_key: Optional[str],
+        json_body: Optional[Any],
+        params: Optional[Dict[str, Any]],
+    ) -> Tuple[int, Any]:
+        if self._rate_limiter is None:
+            return await self._perform(method, url, api_key, json_body, params)
+
+        lane = self._rate_limiter.lane(api_key, method, url)
+        await lane.acquire()
+        try:
+            result = await self._perform(method, url, api_key, json_body, params)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 429:
+                retry_after = parse_retry_after(e.headers)
+                self._logger.warning(
+                    f"Limite de débit FedaPay atteinte ({lane.name}) : concurrence réduite"
+                    + (f", reprise dans {retry_after:.1f}s." if retry_after else ".")
+                )
+                lane.release(success=False, overloaded=True, retry_after=retry_after)
+            else:
+                lane.release(success=False)
+            raise
+        except asyncio.TimeoutError:
+            lane.release(success=False, overloaded=True)
+            raise
+        except BaseException:
+            lane.release(success=False)
+            raise
+        lane.release()
+        return result
+
+    async def _perform(
+        self,
+        method: str,
+        url: str,
+        api_key: Optional[str],
+        json_body: Optional[Any],
+        params: Optional[Dict[str, Any]],
+    ) -> Tuple[int, Any]:
+        header = utils.get_auth_header(api_key)
+        session = await self.get_session()
+
+        async with session.request(
+            method, url, headers=header, json=json_body, params=params
+        ) as response:
+            body = await response.read()
+            return response.status, json.loads(body) if body else None
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        api_key: Optional[str] = None,
+        json_body: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        recover: Optional[Callable[[], Awaitable[Optional[Tuple[int, Any]]]]] = None,
+    ) -> Any:
+        """
+        Identique à `request` mais ne retourne que le corps JSON décodé.
+        """
+        _, data = await self.request(
+            method,
+            url,
+            api_key=api_key,
+            json_body=json_body,
+            params=params,
+            recover=recover,
+        )
+        return data
+
+    def single_flight_stats(self) -> Optional[SingleFlightStats]:
+        """
+        Retourne les compteurs de regroupement des requêtes GET, ou None s'il est désactivé.
+        """
+        if self._single_flight is None:
+            return None
+        return self._single_flight.stats()
+
+    def retry_stats(self) -> Optional[RetryStats]:
+        """
+        Retourne les compteurs de la politique de reprise, ou None si elle n'est pas configurée.
+        """
+        if self._retry_policy is None:
+            return None
+        return self._retry_policy.stats()
+
+    def rate_limit_stats(self) -> Optional[list[RateLimitLaneStats]]:
+        """
+        Retourne l'état des voies du régulateur de débit, ou None s'il n'est pas configuré.
+        """
+        if self._rate_limiter is None:
+            return None
+        return self._rate_limiter.stats()
+
+    async def close(self):
+        """
+        Ferme la session partagée et libère les connexions du pool.
+        """
+        if not self.closed:
+            await self._session.close()
+            self._logger.info("Session HTTP partagée fermée.")
+        self._session = None
@@ -1,9 +1,7 @@
 from typing import Any, Dict, Optional
 
-import aiohttp
-
-from fedapay_connector import utils
 from fedapay_connector.models import LogListResponse, LogResponse
+from .http_client import HttpClient
 
 
 class Logs:
@@ -12,16 +10,18 @@ class Logs:
     sur l'API FedaPay. Les logs contiennent les requêtes API envoyées et les réponses reçues.
     """
 
-    def __init__(self, api_url: str, logger):
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
         """
         Initialise le service Logs.
 
         Args:
             api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
             logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
         """
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _get_all_logs(
         self, params: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None
@@ -40,17 +40,12 @@ class Logs:
         self._logger.info(
             "Récupération de la liste des journaux (Logs) avec filtres optionnels."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/logs", params=params
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/logs",
+            api_key=api_key,
+            params=params,
+        )
         return LogListResponse(**data) if data else None
 
     async def _get_log_by_id(self, log_id: str, api_key: Optional[str] = None):
@@ -66,16 +61,10 @@ class Logs:
             LogResponse: L'objet Journal (Log) détaillé.
         """
         self._logger.info(f"Récupération des détails du journal (Log) ID : {log_id}.")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/logs/{log_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/logs/{log_id}",
+            api_key=api_key,
+        )
         log = data.get("v1/log", None)
         return LogResponse(**log) if log else None
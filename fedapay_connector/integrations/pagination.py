@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+PageFetcher = Callable[[Dict[str, Any]], Awaitable[Optional[BaseModel]]]
+
+
+async def iter_paginated(
+    fetch_page: PageFetcher,
+    items_field: str,
+    params: Optional[Dict[str, Any]] = None,
+    per_page: int = 100,
+) -> AsyncIterator[Any]:
+    """
+    Parcourt tous les éléments d'un endpoint de liste FedaPay en suivant `meta.next_page`.
+
+    La page suivante est demandée dès réception de la page courante et se charge pendant que
+    celle-ci est consommée. Au plus deux pages sont en mémoire à la fois, quel que soit le
+    nombre total de résultats.
+
+    Args:
+        fetch_page (PageFetcher): Récupère une page à partir des paramètres de requête.
+        items_field (str): Nom du champ de la réponse contenant les éléments (ex: 'transactions').
+        params (Optional[Dict[str, Any]]): Paramètres de filtrage ; 'page' fixe la page de départ.
+        per_page (int): Nombre d'éléments demandés par page.
+
+    Yields:
+        Les éléments de chaque page, dans l'ordre de l'API.
+    """
+    params = {**(params or {}), "per_page": per_page}
+    params.setdefault("page", 1)
+    next_page: Optional[asyncio.Task] = asyncio.create_task(fetch_page(params))
+    try:
+        while next_page is not None:
+            response = await next_page
+            next_page = None
+            if response is None:
+                return
+
+            meta = getattr(response, "meta", None)
+            if (
+                meta is not None
+                and meta.next_page
+                and meta.next_page > meta.current_page
+            ):
+                next_page = asyncio.create_task(
+                    fetch_page({**params, "page": meta.next_page})
+                )
+
+            for item in getattr(response, items_field):
+                yield item
+    finally:
+        if next_page is not None:
+            # parcours interrompu : la page préchargée n'est plus attendue
+            next_page.cancel()
+            await asyncio.gather(next_page, return_exceptions=True)
@@ -0,0 +1,299 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from urllib.parse import urlsplit
+
+from fedapay_connector.models import RateLimitLaneStats
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Convertit l'en-tête `Retry-After` (secondes ou date HTTP) en délai en secondes.
+    """
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def endpoint_class(method: str, url: str) -> str:
+    """
+    Classe d'endpoint d'une requête : ressource (premier segment après la version) et nature
+    de l'appel, ex: 'transactions:read' ou 'transactions:write'.
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if segments and segments[0].startswith("v") and segments[0][1:].isdigit():
+        segments = segments[1:]
+    resource = segments[0] if segments else ""
+    return f"{resource}:{'read' if method.upper() == 'GET' else 'write'}"
+
+
+class TokenBucket:
+    """
+    Seau à jetons : au plus `rate` requêtes par seconde en régime établi, avec des rafales de `burst`.
+
+    Chaque appel réserve son jeton (le solde peut devenir négatif) puis attend son tour :
+    les appelants sont servis dans leur ordre d'arrivée, sans scrutation.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+
+    def _reserve(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._tokens += 1
+                raise
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de requêtes simultanées ajustée par AIMD (augmentation additive, diminution multiplicative).
+
+    Chaque succès augmente la limite d'environ un emplacement par « aller-retour » complet
+    (+1/limite par réponse) jusqu'à `max_limit` ; une surcharge signalée par l'API (429, délai
+    dépassé) la multiplie par `decrease_factor`, au plus une fois par `decrease_cooldown` secondes
+    afin qu'une même rafale de refus ne l'effondre pas.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 100,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial_limit or max_limit)
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def idle(self) -> bool:
+        return self._in_flight == 0 and not self._waiters
+
+    async def acquire(self):
+        if self._in_flight < int(self.limit) and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # emplacement accordé pendant l'annulation : il est rendu
+                self._in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def _wake(self):
+        while self._waiters and self._in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def release(self, success: bool = True, overloaded: bool = False):
+        self._in_flight -= 1
+        if overloaded:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.decrease_cooldown:
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        elif success:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+
+class RateLimitLane:
+    """
+    Régulation d'une classe d'endpoints pour une clé API : seau à jetons optionnel, limite de
+    concurrence adaptative et pause imposée par `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: Optional[float],
+        burst: Optional[float],
+        concurrency: AdaptiveConcurrencyLimiter,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = concurrency
+        self._paused_until = 0.0
+        self._requests = 0
+        self._throttled = 0
+        self.last_used = time.monotonic()
+
+    def is_idle(self, now: float) -> bool:
+        """
+        Indique si la voie n'a ni requête en cours, ni requête en attente, ni pause `Retry-After` active.
+        """
+        return self.concurrency.idle and self._paused_until <= now
+
+    async def acquire(self):
+        await self.concurrency.acquire()
+        try:
+            # vérifiée après l'obtention de l'emplacement : une requête libérée pendant la pause
+            # l'attend aussi, et la pause peut être prolongée par un nouveau 429 pendant l'attente
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if self.bucket is not None:
+                await self.bucket.acquire()
+        except asyncio.CancelledError:
+            self.concurrency.release(success=False)
+            raise
+        self._requests += 1
+
+    def release(
+        self,
+        success: bool = True,
+        overloaded: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        if overloaded:
+            self._throttled += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self.concurrency.release(success=success, overloaded=overloaded)
+
+    def stats(self) -> RateLimitLaneStats:
+        return RateLimitLaneStats(
+            lane=self.name,
+            rate=self.bucket.rate if self.bucket else None,
+            concurrency_limit=int(self.concurrency.limit),
+            in_flight=self.concurrency.in_flight,
+            requests=self._requests,
+            throttled=self._throttled,
+            paused_for=max(0.0, self._paused_until - time.monotonic()),
+        )
+
+
+class RateLimiter:
+    """
+    Régulateur de débit partagé par tous les services d'intégration.
+
+    Une voie (`RateLimitLane`) est tenue par clé API et par classe d'endpoint (voir
+    `endpoint_class`) : un seau à jetons borne le débit si `rate` est fourni, et une limite de
+    concurrence AIMD s'adapte aux réponses de l'API. Une réponse 429 réduit la concurrence de
+    la voie et suspend ses requêtes pendant la durée indiquée par `Retry-After`.
+
+    Les voies inutilisées depuis `lane_idle_ttl` secondes sont évincées, ainsi que les moins
+    récemment utilisées au-delà de `max_lanes` voies ; une voie ayant des requêtes en cours,
+    en attente ou en pause n'est jamais évincée.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_concurrency: int = 100,
+        min_concurrency: int = 1,
+        decrease_factor: float = 0.5,
+        max_lanes: int = 10_000,
+        lane_idle_ttl: float = 3600,
+    ):
+        """
+        Args:
+            rate (Optional[float]): Nombre maximal de requêtes par seconde et par voie (None = pas de limite de débit).
+            burst (Optional[float]): Nombre de requêtes pouvant partir en rafale (par défaut : `rate`).
+            max_concurrency (int): Limite haute (et initiale) de requêtes simultanées par voie.
+            min_concurrency (int): Limite basse de requêtes simultanées par voie.
+            decrease_factor (float): Facteur appliqué à la limite de concurrence en cas de surcharge.
+            max_lanes (int): Nombre maximal de voies conservées (les moins récemment utilisées sont évincées).
+            lane_idle_ttl (float): Durée (en secondes) au-delà de laquelle une voie inutilisée est évincée.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.decrease_factor = decrease_factor
+        self.max_lanes = max_lanes
+        self.lane_idle_ttl = lane_idle_ttl
+        # ordre d'utilisation : les voies les moins récemment utilisées en tête
+        self._lanes: OrderedDict[tuple[Optional[str], str], RateLimitLane] = (
+            OrderedDict()
+        )
+
+    def _evict(self, now: float):
+        # appelée avant la création d'une voie. Au plus un passage sur les voies : une voie
+        # occupée est replacée en fin d'ordre
+        for _ in range(len(self._lanes)):
+            key, lane = next(iter(self._lanes.items()))
+            if (
+                len(self._lanes) < self.max_lanes
+                and now - lane.last_used < self.lane_idle_ttl
+            ):
+                break
+            if lane.is_idle(now):
+                del self._lanes[key]
+            else:
+                self._lanes.move_to_end(key)
+
+    def lane(self, api_key: Optional[str], method: str, url: str) -> RateLimitLane:
+        endpoint = endpoint_class(method, url)
+        now = time.monotonic()
+        lane = self._lanes.get((api_key, endpoint))
+        if lane is not None:
+            self._lanes.move_to_end((api_key, endpoint))
+        else:
+            self._evict(now)
+            # la clé API n'apparaît jamais en clair dans les métriques
+            suffix = f"…{api_key[-4:]}" if api_key else "-"
+            lane = self._lanes[(api_key, endpoint)] = RateLimitLane(
+                name=f"{suffix} {endpoint}",
+                rate=self.rate,
+                burst=self.burst,
+                concurrency=AdaptiveConcurrencyLimiter(
+                    max_limit=self.max_concurrency,
+                    min_limit=self.min_concurrency,
+                    decrease_factor=self.decrease_factor,
+                ),
+            )
+        lane.last_used = now
+        return lane
+
+    def stats(self) -> list[RateLimitLaneStats]:
+        """
+        Retourne l'état de chaque voie (débit, limite de concurrence courante, refus 429 reçus).
+        """
+        return [lane.stats() for lane in self._lanes.values()]
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+
+from fedapay_connector.models import RetryStats
+from .rate_limiter import parse_retry_after
+
+Call = Callable[[], Awaitable[Any]]
+
+
+class RetryPolicy:
+    """
+    Politique de reprise des requêtes HTTP face aux erreurs transitoires : connexion interrompue,
+    délai dépassé, réponse 429 ou 5xx (`retry_statuses`).
+
+    Seules les méthodes idempotentes (`idempotent_methods`, GET et DELETE par défaut) sont
+    rejouées d'office, au plus `max_retries` fois, après un délai exponentiel avec gigue complète
+    (`uniform(0, min(backoff_max, backoff_base * 2**n))`) qui évite que les appelants ne relancent
+    tous au même instant. Une réponse 429 est rejouée quelle que soit la méthode, la requête
+    ayant été refusée avant d'être traitée ; un `Retry-After` supérieur à `backoff_max` n'est pas
+    attendu et l'erreur est remontée. Une requête non idempotente (création) n'est rejouée que si
+    l'appelant fournit une lecture de rattrapage (`recover`) : elle est appelée avant chaque
+    nouvelle tentative et retrouve la ressource éventuellement créée par la tentative échouée.
+
+    Avec `hedge_after`, une requête GET restée sans réponse après ce délai est doublée d'une
+    seconde requête identique : la première réponse reçue est retenue, l'autre est annulée.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 5.0,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        idempotent_methods: tuple[str, ...] = ("GET", "DELETE"),
+        hedge_after: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_retries (int): Nombre maximal de nouvelles tentatives après la première.
+            backoff_base (float): Délai de base (en secondes) du backoff exponentiel.
+            backoff_max (float): Délai maximal (en secondes) entre deux tentatives.
+            retry_statuses (tuple[int, ...]): Statuts HTTP considérés comme transitoires.
+            idempotent_methods (tuple[str, ...]): Méthodes rejouées sans lecture de rattrapage.
+            hedge_after (Optional[float]): Délai (en secondes) au-delà duquel une requête GET est doublée (None = désactivé).
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.idempotent_methods = tuple(method.upper() for method in idempotent_methods)
+        self.hedge_after = hedge_after
+        self._retries = 0
+        self._gave_up = 0
+        self._recovered = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def is_transient(self, error: BaseException) -> bool:
+        """
+        Indique si l'erreur peut disparaître d'elle-même (surcharge, coupure réseau, délai dépassé).
+        """
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in self.retry_statuses
+        return isinstance(
+            error,
+            (
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                asyncio.TimeoutError,
+            ),
+        )
+
+    def backoff(
+        self, attempt: int, error: Optional[BaseException] = None
+    ) -> Optional[float]:
+        """
+        Délai avant la tentative `attempt + 1`, ou None si le `Retry-After` imposé par l'API
+        dépasse `backoff_max`.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if isinstance(error, aiohttp.ClientResponseError):
+            retry_after = parse_retry_after(error.headers)
+            if retry_after is not None:
+                if retry_after > self.backoff_max:
+                    return None
+                delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        method: str,
+        url: str,
+        send: Call,
+        logger: logging.Logger,
+        recover: Optional[Call] = None,
+    ) -> Any:
+        """
+        Exécute `send()` en appliquant la politique de reprise.
+
+        Args:
+            method (str): Méthode HTTP de la requête.
+            url (str): URL de la requête (journalisation).
+            send (Call): Émet une tentative de la requête.
+            logger (logging.Logger): Logger des tentatives rejouées.
+            recover (Optional[Call]): Lecture de rattrapage d'une requête non idempotente ; retourne
+                la réponse à retenir, ou None si la requête doit être rejouée.
+        """
+        method = method.upper()
+        idempotent = method in self.idempotent_methods
+        attempt = 0
+        while True:
+            try:
+                if self.hedge_after is not None and method == "GET":
+                    return await self._send_hedged(send)
+                return await send()
+            except Exception as error:
+                throttled = (
+                    isinstance(error, aiohttp.ClientResponseError)
+                    and error.status == 429
+                )
+                if not self.is_transient(error) or not (
+                    idempotent or throttled or recover is not None
+                ):
+                    raise
+                delay = self.backoff(attempt, error)
+                if attempt >= self.max_retries or delay is None:
+                    self._gave_up += 1
+                    raise
+                attempt += 1
+                self._retries += 1
+                # jamais le repr complet : il contient les en-têtes, dont la clé API
+                reason = (
+                    f"HTTP {error.status}"
+                    if isinstance(error, aiohttp.ClientResponseError)
+                    else type(error).__name__
+                )
+                logger.warning(
+                    f"Erreur transitoire sur {method} {url} ({reason}) : nouvelle tentative {attempt}/{self.max_retries} dans {delay:.2f}s."
+                )
+                await asyncio.sleep(delay)
+
+                if not idempotent and not throttled:
+                    # la tentative échouée a pu aboutir côté FedaPay : vérifié avant de la rejouer
+                    existing = await recover()
+                    if existing is not None:
+                        self._recovered += 1
+                        logger.info(
+                            f"{method} {url} : ressource déjà créée par une tentative précédente, réutilisée."
+                        )
+                        return existing
+
+    async def _send_hedged(self, send: Call) -> Any:
+        primary = asyncio.ensure_future(send())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done:
+                return primary.result()
+
+            self._hedged += 1
+            hedge = asyncio.ensure_future(send())
+            tasks.append(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # requête perdante (ou appelant annulé) : elle n'est plus attendue
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> RetryStats:
+        """
+        Retourne le nombre de tentatives rejouées, d'abandons, de créations retrouvées et de requêtes doublées.
+        """
+        return RetryStats(
+            retries=self._retries,
+            gave_up=self._gave_up,
+            recovered=self._recovered,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+        )
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from fedapay_connector.models import SingleFlightStats
+
+
+class SingleFlight:
+    """
+    Regroupe les appels concurrents identiques en une seule exécution (single-flight).
+
+    Tant qu'un appel pour une clé donnée est en cours, les appels suivants pour la même clé
+    n'exécutent rien : ils attendent le résultat (ou l'erreur) de l'appel en cours. Dès que
+    celui-ci se termine, la clé est libérée et l'appel suivant déclenche une nouvelle exécution.
+
+    L'exécution a lieu dans une tâche dédiée : l'annulation d'un des appelants n'interrompt
+    pas la requête attendue par les autres.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._calls = 0
+        self._executed = 0
+        self._merged = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute `call()` pour `key`, ou rejoint l'exécution déjà en cours pour cette clé.
+        """
+        self._calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self._executed += 1
+            task = asyncio.get_running_loop().create_task(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self._merged += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # évite l'avertissement "exception was never retrieved" si tous les appelants ont été annulés
+            task.exception()
+
+    def stats(self) -> SingleFlightStats:
+        """
+        Retourne le nombre d'appels reçus, d'exécutions réelles et d'appels regroupés.
+        """
+        return SingleFlightStats(
+            calls=self._calls,
+            executed=self._executed,
+            merged=self._merged,
+            in_flight=len(self._in_flight),
+        )
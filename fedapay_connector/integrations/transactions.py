@@ -1,8 +1,9 @@
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
 import aiohttp
-from fedapay_connector import utils
+
 from fedapay_connector.models import (
     PaiementSetup,
     TransactionDeleteStatus,
@@ -13,12 +14,19 @@ from fedapay_connector.models import (
     Transaction,
 )
 from fedapay_connector.utils import get_currency
+from .http_client import HttpClient
 
 
 class Transactions:
-    def __init__(self, api_url: str, logger: logging.Logger):
+    def __init__(
+        self,
+        api_url: str,
+        logger: logging.Logger,
+        http_client: Optional[HttpClient] = None,
+    ):
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _create_transaction(
         self,
@@ -46,9 +54,13 @@ class Transactions:
 
         Returns:
             Transaction: Instance du modèle Transaction
+
+        Note:
+            `merchant_reference` sert de clé d'idempotence : si la création échoue sur une erreur
+            transitoire, la transaction est recherchée par sa référence avant toute nouvelle tentative,
+            ce qui évite un doublon lorsque la première requête a abouti côté FedaPay.
         """
         self._logger.info("Initialisation de la transaction avec FedaPay.")
-        header = utils.get_auth_header(api_key=api_key)
 
         body = {
             "description": f"Transaction pour {client_infos.prenom} {client_infos.nom}"
@@ -72,20 +84,38 @@ class Transactions:
             "merchant_reference": merchant_reference,
         }
 
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.post(
-                f"{self.fedapay_api_url}/v1/transactions", json=body
-            ) as response:
-                response.raise_for_status()
-                init_response = await response.json()
+        init_response = await self._http.request_json(
+            "POST",
+            f"{self.fedapay_api_url}/v1/transactions",
+            api_key=api_key,
+            json_body=body,
+            recover=(
+                lambda: self._find_created_transaction(merchant_reference, api_key)
+            )
+            if merchant_reference
+            else None,
+        )
 
         self._logger.info(f"Transaction initialisée avec succès: {init_response}")
         init_response = init_response.get("v1/transaction")
 
         return Transaction(**init_response)
 
+    async def _find_created_transaction(
+        self, merchant_reference: str, api_key: Optional[str]
+    ) -> Optional[Tuple[int, Any]]:
+        # même forme de réponse que la création ({"v1/transaction": {...}}) : substituable telle quelle
+        try:
+            return await self._http.request(
+                "GET",
+                f"{self.fedapay_api_url}/v1/transactions/merchant/{merchant_reference}",
+                api_key=api_key,
+            )
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                return None
+            raise
+
     async def _get_token_and_payment_link(
         self, id_transaction: int, api_key: Optional[str] = os.getenv("FEDAPAY_API_KEY")
     ):
@@ -106,16 +136,11 @@ class Transactions:
         self._logger.info(
             f"Récupération du token pour la transaction ID: {id_transaction}"
         )
-        header = utils.get_auth_header(api_key=api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.post(
-                f"{self.fedapay_api_url}/v1/transactions/{id_transaction}/token"
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await self._http.request_json(
+            "POST",
+            f"{self.fedapay_api_url}/v1/transactions/{id_transaction}/token",
+            api_key=api_key,
+        )
 
         self._logger.info(f"Token récupéré avec succès: {data}")
 
@@ -147,21 +172,17 @@ class Transactions:
         self._logger.info(
             f"Définition de la méthode de paiement pour le token: {token}"
         )
-        header = utils.get_auth_header(api_key=api_key)
-
         body = {
             "token": token,
             "phone_number": {"number": client_infos.tel, "country": setup.pays.value},
         }
 
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.post(
-                f"{self.fedapay_api_url}/v1/{setup.method.name}", json=body
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await self._http.request_json(
+            "POST",
+            f"{self.fedapay_api_url}/v1/{setup.method.name}",
+            api_key=api_key,
+            json_body=body,
+        )
 
         self._logger.info(f"Méthode de paiement définie avec succès: {data}")
         data = data.get("v1/payment_intent")
@@ -181,17 +202,11 @@ class Transactions:
             Transaction: L'objet Transaction complet correspondant à l'ID.
         """
         self._logger.info(f"Récupération de la transaction FedaPay ID: {fedapay_id}")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}",
+            api_key=api_key,
+        )
         return Transaction(**data.get("v1/transaction"))
 
     async def _get_transaction_by_merchant_reference(
@@ -214,18 +229,13 @@ class Transactions:
         self._logger.info(
             f"Recherche de transaction par merchant_reference: {merchant_reference}"
         )
-        header = utils.get_auth_header(api_key)
-
         # La recherche par défaut utilise l'endpoint de recherche avec un paramètre 'q'
 
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/transactions/merchant/{merchant_reference}"
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/transactions/merchant/{merchant_reference}",
+            api_key=api_key,
+        )
         return Transaction(**data.get("v1/transaction"))
 
     async def _delete_transaction(
@@ -240,27 +250,33 @@ class Transactions:
 
         Returns:
             TransactionDeleteStatus: Objet indiquant le statut de la tentative de suppression (succès ou échec).
+
+        Raises:
+            aiohttp.ClientResponseError: Si l'API refuse la suppression (ex: 403 si la transaction n'est plus en attente, y compris sur une tentative rejouée).
         """
         self._logger.warning(
             f"Tentative de suppression de la transaction FedaPay ID: {fedapay_id}"
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header,
-            raise_for_status=True,
-        ) as session:
-            async with session.delete(
-                f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}"
-            ) as response:
-                if response.status in [200, 204]:
-                    self._logger.info(
-                        f"Transaction {fedapay_id} supprimée/annulée avec succès."
-                    )
-                    return TransactionDeleteStatus(
-                        delete_status=True, status_code=response.status
-                    )
-                response.raise_for_status()
+        # une tentative rejouée après une coupure peut trouver la transaction déjà supprimée
+        # par la précédente : 404 signifie alors que la suppression a abouti. Un 403 indique en
+        # revanche que la transaction n'est plus en attente (ex: approuvée entre-temps) et est levé
+        status, _ = await self._http.request(
+            "DELETE",
+            f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}",
+            api_key=api_key,
+            settled_statuses=(404,),
+        )
+        if status in [200, 204, 404]:
+            self._logger.info(
+                f"Transaction {fedapay_id} supprimée/annulée avec succès."
+            )
+            return TransactionDeleteStatus(delete_status=True, status_code=status)
+
+        message = f"Suppression de la transaction {fedapay_id} non confirmée par FedaPay (statut: {status})."
+        self._logger.warning(message)
+        return TransactionDeleteStatus(
+            delete_status=False, status_code=status, message=message
+        )
 
     async def _update_transaction(
         self,
@@ -280,16 +296,12 @@ class Transactions:
             Transaction: L'objet Transaction mis à jour.
         """
         self._logger.info(f"Mise à jour de la transaction FedaPay ID: {fedapay_id}")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.put(
-                f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}", json=data_to_update
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await self._http.request_json(
+            "PUT",
+            f"{self.fedapay_api_url}/v1/transactions/{fedapay_id}",
+            api_key=api_key,
+            json_body=data_to_update,
+        )
         transaction = data.get("v1/transaction", None)
         return Transaction(**transaction)
 
@@ -308,14 +320,10 @@ class Transactions:
             TransactionListResponse: Objet contenant la liste des transactions (`v1/transactions`) et les métadonnées de pagination.
         """
         self._logger.info("Récupération de toutes les transactions.")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/transactions/search", params=params
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/transactions/search",
+            api_key=api_key,
+            params=params,
+        )
         return TransactionListResponse(**data) if data else None
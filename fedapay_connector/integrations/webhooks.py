@@ -1,9 +1,7 @@
 from typing import Any, Dict, Optional
 
-import aiohttp
-
-from fedapay_connector import utils
 from fedapay_connector.models import WebhookListResponse, WebhookResponse
+from .http_client import HttpClient
 
 
 class Webhooks:  # Correction du nom de la classe
@@ -13,16 +11,18 @@ class Webhooks:  # Correction du nom de la classe
     asynchrone des événements.
     """
 
-    def __init__(self, api_url: str, logger):
+    def __init__(self, api_url: str, logger, http_client: Optional[HttpClient] = None):
         """
         Initialise le service Webhooks.
 
         Args:
             api_url (str): L'URL de base de l'API FedaPay (ex: https://sandbox-api.fedapay.com/v1).
             logger: Instance de logger pour l'enregistrement des événements.
+            http_client (Optional[HttpClient]): Client HTTP partagé (pool de connexions). Un client dédié est créé si non fourni.
         """
         self.fedapay_api_url = api_url
         self._logger = logger
+        self._http = http_client or HttpClient(logger=logger)
 
     async def _get_all_webhooks(
         self, params: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None
@@ -40,17 +40,12 @@ class Webhooks:  # Correction du nom de la classe
         self._logger.info(
             "Récupération de la liste des webhooks avec filtres optionnels."
         )
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/webhooks", params=params
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/webhooks",
+            api_key=api_key,
+            params=params,
+        )
         return WebhookListResponse(**data) if data else None
 
     async def _get_webhook_by_id(self, webhook_id: str, api_key: Optional[str] = None):
@@ -65,17 +60,11 @@ class Webhooks:  # Correction du nom de la classe
             WebhookResponse: L'objet Webhook détaillé.
         """
         self._logger.info(f"Récupération des détails du webhook ID : {webhook_id}.")
-        header = utils.get_auth_header(api_key)
-
-        async with aiohttp.ClientSession(
-            headers=header, raise_for_status=True
-        ) as session:
-            async with session.get(
-                f"{self.fedapay_api_url}/v1/webhooks/{webhook_id}"
-            ) as response:
-                response.raise_for_status()
-
-                data = await response.json()
+        data = await self._http.request_json(
+            "GET",
+            f"{self.fedapay_api_url}/v1/webhooks/{webhook_id}",
+            api_key=api_key,
+        )
 
         # Correction de l'erreur: Utiliser "v1/webhook" au lieu de "v1/currency"
         webhook = data.get("v1/webhook", None)
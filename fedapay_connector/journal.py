@@ -0,0 +1,275 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from pydantic import BaseModel
+
+from .db_models import StoredListeningProcess
+from .enums import PersistenceDurability
+from .event_storage import ProcessOperation, ProcessPersistance
+
+# délai maximal (en secondes) entre deux nouvelles tentatives d'écriture d'un lot en échec
+_MAX_RETRY_DELAY = 5.0
+
+# Résultat de la composition de deux opérations successives sur une même transaction.
+# Une sauvegarde étant un upsert, la ligne peut exister avant elle : une sauvegarde suivie
+# d'une suppression se réduit donc à la suppression, et non à une absence d'opération.
+_COALESCE = {
+    (None, ProcessOperation.SAVE): ProcessOperation.SAVE,
+    (None, ProcessOperation.UPDATE): ProcessOperation.UPDATE,
+    (None, ProcessOperation.DELETE): ProcessOperation.DELETE,
+    (ProcessOperation.SAVE, ProcessOperation.SAVE): ProcessOperation.SAVE,
+    (ProcessOperation.SAVE, ProcessOperation.UPDATE): ProcessOperation.SAVE,
+    (ProcessOperation.SAVE, ProcessOperation.DELETE): ProcessOperation.DELETE,
+    (ProcessOperation.UPDATE, ProcessOperation.SAVE): ProcessOperation.REPLACE,
+    (ProcessOperation.UPDATE, ProcessOperation.UPDATE): ProcessOperation.UPDATE,
+    (ProcessOperation.UPDATE, ProcessOperation.DELETE): ProcessOperation.DELETE,
+    (ProcessOperation.DELETE, ProcessOperation.SAVE): ProcessOperation.REPLACE,
+    (ProcessOperation.DELETE, ProcessOperation.UPDATE): ProcessOperation.DELETE,
+    (ProcessOperation.DELETE, ProcessOperation.DELETE): ProcessOperation.DELETE,
+    (ProcessOperation.REPLACE, ProcessOperation.SAVE): ProcessOperation.REPLACE,
+    (ProcessOperation.REPLACE, ProcessOperation.UPDATE): ProcessOperation.REPLACE,
+    (ProcessOperation.REPLACE, ProcessOperation.DELETE): ProcessOperation.DELETE,
+}
+
+
+class ProcessJournal:
+    """
+    Journal d'écriture différée (write-behind) devant `ProcessPersistance`.
+
+    Les opérations save/update/delete sont regroupées par ID de transaction puis écrites
+    dans une seule transaction de base de données : seule la composition des opérations
+    d'une transaction atteint la base (une sauvegarde suivie d'une suppression se réduit à
+    la suppression). Un lot est écrit immédiatement dès que `max_batch_size` transactions
+    sont en attente.
+
+    Le niveau de durabilité (`PersistenceDurability`) détermine quand les appels rendent la main :
+    - SYNC : chaque opération est écrite immédiatement (un commit par opération) ;
+    - GROUP_COMMIT : l'appel attend le commit du lot qui contient son opération. Le lot est
+      écrit au tour de boucle suivant si aucune écriture n'est en cours, sinon il se remplit
+      pendant l'écriture précédente (aucune latence ajoutée pour un appelant isolé) ;
+    - ASYNC : l'appel rend la main immédiatement, le lot est écrit au bout de `flush_interval` secondes.
+      Un lot dont l'écriture échoue est remis dans le journal et réécrit après un délai croissant ;
+      l'erreur est levée par le prochain `flush()` ou `close()` si l'écriture échoue encore.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        storage: ProcessPersistance,
+        durability: PersistenceDurability = PersistenceDurability.GROUP_COMMIT,
+        flush_interval: float = 0.005,
+        max_batch_size: int = 200,
+    ):
+        self._logger = logger
+        self._storage = storage
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._pending: dict[int, tuple[ProcessOperation, Optional[BaseModel]]] = {}
+        self._batch_future: Optional[asyncio.Future] = None
+        self._flush_timer: Optional[asyncio.Handle] = None
+        self._flushing = False
+        # écriture lancée mais pas encore commencée (en attente du verrou)
+        self._flush_queued = False
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._failures = 0
+
+    @property
+    def pending_operations(self) -> int:
+        return len(self._pending)
+
+    def _enqueue(
+        self,
+        transaction_id: int,
+        operation: ProcessOperation,
+        process_data: Optional[BaseModel] = None,
+    ):
+        previous = self._pending.pop(transaction_id, (None, None))[0]
+        self._pending[transaction_id] = (_COALESCE[(previous, operation)], process_data)
+
+    def _requeue(self, failed: dict[int, tuple[ProcessOperation, Optional[BaseModel]]]):
+        # les opérations reçues pendant l'écriture échouée sont plus récentes : elles se composent après celles du lot
+        newer, self._pending = self._pending, dict(failed)
+        for transaction_id, (operation, process_data) in newer.items():
+            self._enqueue(transaction_id, operation, process_data)
+
+    async def _record(
+        self,
+        transaction_id: int,
+        operation: ProcessOperation,
+        process_data: Optional[BaseModel] = None,
+    ):
+        self._enqueue(transaction_id, operation, process_data)
+        await self._wait_for_batch()
+
+    async def _wait_for_batch(self):
+        if self.durability == PersistenceDurability.GROUP_COMMIT:
+            if self._batch_future is None:
+                self._batch_future = asyncio.get_running_loop().create_future()
+            batch_future = self._batch_future
+            self._schedule_flush()
+            await asyncio.shield(batch_future)
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flushing or self._flush_queued:
+            # une écriture est déjà lancée, ou en cours et reprogrammée à sa fin
+            return
+        if len(self._pending) >= self.max_batch_size and not self._failures:
+            self._start_flush()
+            return
+        if self._flush_timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.durability == PersistenceDurability.GROUP_COMMIT:
+            self._flush_timer = loop.call_soon(self._start_flush)
+        else:
+            delay = min(self.flush_interval * 2**self._failures, _MAX_RETRY_DELAY)
+            self._flush_timer = loop.call_later(delay, self._start_flush)
+
+    def _start_flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._flush_queued = True
+        task = asyncio.get_running_loop().create_task(self._flush(raise_errors=False))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self):
+        """
+        Écrit immédiatement toutes les opérations en attente dans une seule transaction.
+
+        Raises:
+            Exception: Erreur de la base de persistance. En mode ASYNC, les opérations du lot
+                restent dans le journal et seront réécrites.
+        """
+        await self._flush(raise_errors=True)
+
+    async def _flush(self, raise_errors: bool):
+        async with self._flush_lock:
+            self._flush_queued = False
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, {}
+            batch_future, self._batch_future = self._batch_future, None
+            self._flushing = True
+
+            try:
+                if pending:
+                    await self._storage.apply_batch(
+                        [
+                            (transaction_id, operation, process_data)
+                            for transaction_id, (
+                                operation,
+                                process_data,
+                            ) in pending.items()
+                        ]
+                    )
+                    self._logger.debug(
+                        f"{len(pending)} opération(s) de persistance écrite(s) en un lot"
+                    )
+            except Exception as e:
+                self._logger.error(
+                    f"Erreur lors de l'écriture d'un lot de {len(pending)} opération(s) de persistance : {e}"
+                )
+                if batch_future and not batch_future.done():
+                    batch_future.set_exception(e)
+                    # évite l'avertissement "exception was never retrieved" si personne n'attend plus
+                    batch_future.add_done_callback(lambda f: f.exception())
+                elif self.durability == PersistenceDurability.ASYNC:
+                    # aucun appelant n'attend ce lot : il est conservé pour une nouvelle tentative
+                    self._requeue(pending)
+                    self._failures += 1
+                if raise_errors:
+                    raise
+            else:
+                self._failures = 0
+                if batch_future and not batch_future.done():
+                    batch_future.set_result(None)
+            finally:
+                self._flushing = False
+                if self._pending or self._batch_future is not None:
+                    # opérations reçues pendant l'écriture : elles forment le lot suivant
+                    self._schedule_flush()
+
+    async def save_process(
+        self, transaction_id: int, process_data: Optional[BaseModel] = None
+    ):
+        """Sauvegarde un processus d'ecoute dans la base"""
+        if self.durability == PersistenceDurability.SYNC:
+            return await self._storage.save_process(transaction_id, process_data)
+        await self._record(transaction_id, ProcessOperation.SAVE, process_data)
+
+    async def save_processes(self, processes: list[tuple[int, BaseModel]]):
+        """Sauvegarde plusieurs processus d'ecoute en un seul lot"""
+        if self.durability == PersistenceDurability.SYNC:
+            return await self._storage.apply_batch(
+                [
+                    (transaction_id, ProcessOperation.SAVE, process_data)
+                    for transaction_id, process_data in processes
+                ]
+            )
+        for transaction_id, process_data in processes:
+            self._enqueue(transaction_id, ProcessOperation.SAVE, process_data)
+        await self._wait_for_batch()
+
+    async def update_process(self, transaction_id: int, process_data: BaseModel):
+        """Met à jour un processus d'ecoute"""
+        if self.durability == PersistenceDurability.SYNC:
+            return await self._storage.update_process(transaction_id, process_data)
+        await self._record(transaction_id, ProcessOperation.UPDATE, process_data)
+
+    async def delete_process(self, transaction_id: int):
+        """Supprime un processus d'ecoute"""
+        if self.durability == PersistenceDurability.SYNC:
+            return await self._storage.delete_process(transaction_id)
+        await self._record(transaction_id, ProcessOperation.DELETE)
+
+    async def delete_processes(self, transaction_ids: list[int]):
+        """Supprime plusieurs processus d'ecoute en un seul lot"""
+        if self.durability == PersistenceDurability.SYNC:
+            return await self._storage.apply_batch(
+                [
+                    (transaction_id, ProcessOperation.DELETE, None)
+                    for transaction_id in transaction_ids
+                ]
+            )
+        for transaction_id in transaction_ids:
+            self._enqueue(transaction_id, ProcessOperation.DELETE)
+        await self._wait_for_batch()
+
+    async def load_processes(self) -> list[StoredListeningProcess]:
+        """Charge tous les processus d'ecoute de la base après écriture des opérations en attente"""
+        await self.flush()
+        return await self._storage.load_processes()
+
+    async def count_processes(self) -> int:
+        """Retourne le nombre de processus d'ecoute persistés après écriture des opérations en attente"""
+        await self.flush()
+        return await self._storage.count_processes()
+
+    async def iter_processes(
+        self, chunk_size: int = 500
+    ) -> AsyncIterator[list[StoredListeningProcess]]:
+        """Parcourt les processus d'ecoute persistés par lots après écriture des opérations en attente"""
+        await self.flush()
+        async for page in self._storage.iter_processes(chunk_size):
+            yield page
+
+    async def close(self):
+        """Écrit les opérations en attente puis libère les ressources de persistance"""
+        try:
+            await self.flush()
+        finally:
+            if self._flush_tasks:
+                await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+            # nouvelle tentative programmée par un lot en échec : la base va être fermée
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            await self._storage.close()
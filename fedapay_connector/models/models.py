@@ -2,7 +2,13 @@ from typing import Any, Optional, List, Dict
 from datetime import datetime
 from pydantic import Field, model_validator, EmailStr
 from ..maps import Paiement_Map
-from ..enums import Pays, MethodesPaiement, TypesPaiement, TransactionStatus
+from ..enums import (
+    ExportFormat,
+    Pays,
+    MethodesPaiement,
+    TypesPaiement,
+    TransactionStatus,
+)
 from ..exceptions import InvalidCountryPaymentCombination
 import json
 from .base import Base
@@ -200,6 +206,8 @@ class Transaction(Base):
     merchant_reference: Optional[str] = None
     account_id: Optional[int] = None
     balance_id: Optional[int] = None
+    payment_token: Optional[str] = None
+    payment_url: Optional[str] = None
     customer: Optional[Customer] = None
     currency: Optional[Currency] = None
     payment_method: Optional[Dict] = None
@@ -220,6 +228,89 @@ class WebhookTransaction(Base):
     entity: Optional[Transaction] = None
     account: Optional[Account] = None
 
+    @property
+    def id_transaction(self) -> Optional[int]:
+        return self.entity.id if self.entity else None
+
+
+class WebhookEntityHeader(Base):
+    id: Optional[int] = None
+    status: Optional[TransactionStatus] = None
+
+
+class WebhookTransactionHeader(Base):
+    """
+    Vue minimale d'un webhook : seuls les champs de routage (`name`, `entity.id`, `entity.status`)
+    sont validés, les autres (compte, client, métadonnées...) sont ignorés.
+    """
+
+    name: Optional[str] = None
+    entity: Optional[WebhookEntityHeader] = None
+
+
+class LazyWebhookTransaction:
+    """
+    Webhook reçu dont la validation complète est différée.
+
+    Seul l'en-tête (`WebhookTransactionHeader`) est validé à la réception ; le corps brut est conservé
+    et n'est validé en `WebhookTransaction` (transaction et compte complets) qu'au premier accès à `full`
+    ou à un attribut absent de l'en-tête. Le résultat est alors mis en cache.
+    """
+
+    __slots__ = ("raw", "header", "_full")
+
+    def __init__(
+        self,
+        raw: bytes | str | dict,
+        header: Optional[WebhookTransactionHeader] = None,
+    ):
+        self._full: Optional[WebhookTransaction] = None
+        self.raw = raw
+        if header is None:
+            header = (
+                WebhookTransactionHeader.model_validate(raw)
+                if isinstance(raw, dict)
+                else WebhookTransactionHeader.model_validate_json(raw)
+            )
+        self.header = header
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.header.name
+
+    @property
+    def id_transaction(self) -> Optional[int]:
+        return self.header.entity.id if self.header.entity else None
+
+    @property
+    def status(self) -> Optional[TransactionStatus]:
+        return self.header.entity.status if self.header.entity else None
+
+    def validate(self, model: type[WebhookTransaction] = WebhookTransaction):
+        """
+        Valide le corps brut en une seule passe dans `model` (ex: `WebhookHistory`).
+        """
+        if isinstance(self.raw, dict):
+            return model.model_validate(self.raw)
+        return model.model_validate_json(self.raw)
+
+    @property
+    def full(self) -> WebhookTransaction:
+        if self._full is None:
+            self._full = self.validate()
+        return self._full
+
+    def model_dump_json(self) -> str:
+        # le corps reçu est retransmis tel quel, sans validation ni resérialisation
+        if isinstance(self.raw, bytes):
+            return self.raw.decode("utf-8")
+        if isinstance(self.raw, str):
+            return self.raw
+        return self.full.model_dump_json()
+
+    def __getattr__(self, item):
+        return getattr(self.full, item)
+
 
 class TransactionPaymentMethodResponse(Base):
     reference: Optional[str] = Field(
@@ -296,6 +387,12 @@ class PaiementSetup(Base):
 class ListeningProcessData(Base):
     id_transaction: int
     received_webhooks: Optional[list[WebhookTransaction]] = None
+    created_at: Optional[float] = Field(
+        None, description="Timestamp de création du processus d'écoute."
+    )
+    deadline: Optional[float] = Field(
+        None, description="Timestamp d'expiration du processus d'écoute."
+    )
 
 
 class PaidCustomerMetadata(Base):
@@ -615,16 +712,174 @@ class WebhookListResponse(Base):
     meta: ListMeta
 
 
+class PaymentStagesLatency(Base):
+    """
+    Durées (en secondes) des différentes étapes de `FedapayConnector.fedapay_pay`.
+    Une étape à `None` n'a pas nécessité d'appel réseau.
+    """
+
+    create_transaction: float
+    get_token: Optional[float] = None
+    set_payment_method: Optional[float] = None
+    total: float
+
+
+class DeduplicationStats(Base):
+    """
+    Métriques du registre des événements webhook déjà traités (`DeduplicationStore`).
+    """
+
+    entries: int
+    max_entries: int
+    ttl: float
+    hits: int
+    evicted_expired: int
+    evicted_capacity: int
+    approx_memory_bytes: int
+
+
+class TransactionCacheStats(Base):
+    """
+    Métriques du cache des transactions (`TransactionCache`).
+    """
+
+    entries: int
+    max_entries: int
+    ttl: float
+    final_ttl: Optional[float] = None
+    hits: int
+    misses: int
+    webhook_updates: int
+    evicted_expired: int
+    evicted_capacity: int
+
+
+class SingleFlightStats(Base):
+    """
+    Compteurs du regroupement des requêtes GET identiques simultanées (`SingleFlight`).
+    """
+
+    calls: int
+    executed: int
+    merged: int
+    in_flight: int
+
+
+class RateLimitLaneStats(Base):
+    """
+    État d'une voie du régulateur de débit (`RateLimiter`) : clé API (masquée) et classe d'endpoint.
+    """
+
+    lane: str
+    rate: Optional[float] = None
+    concurrency_limit: int
+    in_flight: int
+    requests: int
+    throttled: int
+    paused_for: float
+
+
+class RetryStats(Base):
+    """
+    Compteurs de la politique de reprise du client HTTP (`RetryPolicy`).
+    """
+
+    retries: int
+    gave_up: int
+    recovered: int
+    hedged: int
+    hedge_wins: int
+
+
+class ExportCheckpoint(Base):
+    """
+    Point de reprise d'un export de transactions (`TransactionExporter`) : paramètres de l'export
+    et progression au dernier fichier terminé.
+    """
+
+    params: Dict[str, Any]
+    per_page: int
+    export_format: ExportFormat
+    columns: List[str]
+    next_page: int = 1
+    file_index: int = 0
+    rows: int = 0
+    files: List[str] = Field(default_factory=list)
+
+
+class TransactionExportSummary(Base):
+    """
+    Bilan d'un export de transactions.
+    """
+
+    files: List[str]
+    rows: int
+    pages: int
+    resumed_from_page: int
+    duration: float
+
+
+class WebhookQueueStats(Base):
+    """
+    Métriques de la file d'ingestion des webhooks (`WebhookIngestionQueue`).
+    """
+
+    queue_depth: int
+    spilled: int
+    max_size: int
+    workers: int
+    received: int
+    processed: int
+    failed: int
+    rejected: int
+    max_depth_seen: int
+
+
 class FedapayPay(Base):
     transaction_data: Transaction
     link_and_token_data: TransactionToken
     set_methode_data: Optional[TransactionPaymentMethodResponse]
     status: TransactionStatus
+    latency: Optional[PaymentStagesLatency] = None
 
 
 class PaymentHistory(FedapayPay):
     pass
 
 
+class PaymentRequest(Base):
+    """
+    Paramètres d'un paiement à initier via `fedapay_pay_many` (mêmes champs que `fedapay_pay`).
+    """
+
+    setup: PaiementSetup
+    client_infos: Optional[UserData] = None
+    montant_paiement: int
+    callback_url: Optional[str] = None
+    api_key: Optional[str] = None
+    merchant_reference: Optional[str] = None
+    custom_metadata: Optional[dict[str, str]] = None
+    description: Optional[str] = None
+
+
+class PaymentBatchResult(Base):
+    """
+    Résultat d'un paiement initié par `fedapay_pay_many` : `result` en cas de succès, `error` sinon.
+    `index` est la position de la demande dans la liste fournie.
+    """
+
+    index: int
+    request: PaymentRequest
+    result: Optional[FedapayPay] = None
+    error: Optional[Exception] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
 class WebhookHistory(WebhookTransaction):
     pass
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Optional
+
+from .enums import TransactionStatus
+from .models import LazyWebhookTransaction, Transaction, WebhookTransaction
+
+
+class ReceivedEvent:
+    """
+    Trace compacte d'un webhook reçu pour une transaction : nom, statut et date de réception.
+
+    Le webhook lui-même (`payload`) n'est conservé que si la conservation des webhooks complets
+    est activée ; sinon `to_model()` reconstruit un `WebhookTransaction` partiel (nom, id, statut).
+    """
+
+    __slots__ = ("name", "status", "received_at", "payload")
+
+    def __init__(
+        self,
+        name: Optional[str],
+        status: Optional[TransactionStatus],
+        received_at: float,
+        payload: Optional[WebhookTransaction | LazyWebhookTransaction] = None,
+    ):
+        self.name = name
+        self.status = status
+        self.received_at = received_at
+        self.payload = payload
+
+    @classmethod
+    def from_webhook(
+        cls,
+        data: WebhookTransaction | LazyWebhookTransaction,
+        keep_payload: bool = True,
+    ) -> "ReceivedEvent":
+        if isinstance(data, LazyWebhookTransaction):
+            status = data.status
+        else:
+            status = data.entity.status if data.entity else None
+        return cls(data.name, status, time.time(), data if keep_payload else None)
+
+    def to_model(self, id_transaction: int) -> WebhookTransaction:
+        if isinstance(self.payload, LazyWebhookTransaction):
+            return self.payload.full
+        if self.payload is not None:
+            return self.payload
+        return WebhookTransaction(
+            name=self.name,
+            entity=Transaction(id=id_transaction, status=self.status)
+            if self.status
+            else None,
+        )
+
+
+class PendingRecord:
+    """
+    État en mémoire d'une transaction suivie par `FedapayEvent` : future d'écoute et son échéance,
+    webhooks reçus et nombre de tentatives de rechargement. Un enregistrement vide est supprimé.
+    """
+
+    __slots__ = ("future", "deadline", "events", "retry_attempts")
+
+    def __init__(self):
+        self.future: Optional[asyncio.Future] = None
+        self.deadline: Optional[float] = None
+        self.events: Optional[list[ReceivedEvent]] = None
+        self.retry_attempts = 0
+
+    def is_empty(self) -> bool:
+        return self.future is None and not self.events and not self.retry_attempts
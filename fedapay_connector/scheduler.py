@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+class TimeoutScheduler:
+    """
+    Ordonnanceur unique des délais d'expiration des processus d'écoute.
+
+    Remplace une tâche `asyncio.sleep` par transaction par un tas (heap) trié par échéance
+    et un seul `TimerHandle` armé sur l'échéance la plus proche. L'annulation est en O(1) amorti :
+    l'entrée est retirée de l'index et l'élément correspondant du tas est ignoré
+    lorsqu'il arrive en tête (suppression paresseuse) ; le tas est reconstruit dès que les
+    éléments annulés y deviennent majoritaires.
+
+    Les échéances sont exprimées en temps "mur" (`time.time()`) afin de pouvoir être
+    persistées et recalculées après un redémarrage.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        on_timeout: Callable[[Hashable], Awaitable[None]],
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self._logger = logger
+        self._on_timeout = on_timeout
+        self._loop = loop
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._entries: dict[Hashable, tuple[int, float]] = {}
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: Optional[float] = None
+        self._running_tasks: set[asyncio.Task] = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        return self._loop
+
+    def get_deadline(self, key: Hashable) -> Optional[float]:
+        """Retourne l'échéance (timestamp) programmée pour `key`, ou None."""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def schedule(self, key: Hashable, timeout: float) -> float:
+        """
+        Programme l'expiration de `key` dans `timeout` secondes.
+
+        Returns:
+            float: L'échéance absolue (timestamp) programmée.
+        """
+        deadline = time.time() + timeout
+        self.schedule_at(key, deadline)
+        return deadline
+
+    def schedule_at(self, key: Hashable, deadline: float):
+        """
+        Programme l'expiration de `key` à l'échéance absolue `deadline` (timestamp).
+        Une échéance déjà passée expire au prochain tour de boucle.
+        Reprogrammer une clé existante remplace son échéance précédente.
+        """
+        loop = self._get_loop()
+        when = loop.time() + max(0.0, deadline - time.time())
+        seq = next(self._counter)
+        replaced = key in self._entries
+        self._entries[key] = (seq, deadline)
+        heapq.heappush(self._heap, (when, seq, key))
+        if self._timer_when is None or when < self._timer_when:
+            self._arm(when)
+        if replaced:
+            self._compact()
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Annule l'expiration programmée de `key` en O(1) amorti.
+
+        Returns:
+            bool: True si une échéance était programmée.
+        """
+        if self._entries.pop(key, None) is None:
+            return False
+        self._compact()
+        return True
+
+    def _arm(self, when: float):
+        if self._timer:
+            self._timer.cancel()
+        self._timer_when = when
+        self._timer = self._get_loop().call_at(when, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        self._timer_when = None
+        loop = self._get_loop()
+        now = loop.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != seq:
+                # entrée annulée ou reprogrammée entre temps
+                continue
+            del self._entries[key]
+            task = loop.create_task(self._on_timeout(key))
+            self._running_tasks.add(task)
+            task.add_done_callback(self._handle_timeout_task_done)
+
+        self._compact()
+        if self._heap:
+            self._arm(self._heap[0][0])
+
+    def _compact(self):
+        # les entrées annulées ou reprogrammées restent dans le tas jusqu'à leur échéance :
+        # on reconstruit le tas lorsqu'elles deviennent majoritaires. Une reconstruction en O(n)
+        # retire au moins n/2 éléments, son coût est donc amorti sur les annulations
+        if not self._entries:
+            self._heap.clear()
+            return
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [
+                item
+                for item in self._heap
+                if self._entries.get(item[2], (None,))[0] == item[1]
+            ]
+            heapq.heapify(self._heap)
+
+    def _handle_timeout_task_done(self, task: asyncio.Task):
+        self._running_tasks.discard(task)
+        if task.cancelled():
+            return
+        exception = task.exception()
+        if exception:
+            self._logger.error(
+                f"Erreur lors du traitement d'une expiration programmée : {exception}"
+            )
+
+    def stop(self):
+        """
+        Arrête l'ordonnanceur : plus aucune expiration ne sera déclenchée.
+        Les traitements d'expiration déjà lancés sont annulés.
+        """
+        if self._timer:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+        self._heap.clear()
+        self._entries.clear()
+        for task in list(self._running_tasks):
+            task.cancel()
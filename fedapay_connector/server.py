@@ -1,8 +1,9 @@
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import APIRouter, FastAPI, HTTPException, Request, status
 from typing import Optional
 import os, logging, uvicorn, threading  # noqa: E401
+from .enums import WebhookServerMode
 from .utils import verify_signature
 
 
@@ -15,13 +16,27 @@ class WebhookServer:
         fedapay_auth_key: Optional[str] = os.getenv("FEDAPAY_AUTH_KEY"),
         shutdown_timeout: int = 10,
         thread_join_timeout: int = 1,
+        mode: WebhookServerMode = WebhookServerMode.THREAD,
+        owner_loop: Optional[asyncio.AbstractEventLoop] = None,
     ):
+        """
+        Args:
+            mode (WebhookServerMode): THREAD lance uvicorn dans un thread dédié avec sa propre boucle asyncio ;
+                IN_LOOP le lance comme une tâche de la boucle asyncio de l'application (aucun passage entre threads).
+            owner_loop (Optional[asyncio.AbstractEventLoop]): Boucle asyncio propriétaire des futures et verrous du connecteur.
+                En mode THREAD, le traitement des webhooks y est délégué.
+        """
         self.logger = logger
         self.fedapay_auth_key = fedapay_auth_key
         if self.fedapay_auth_key:
             self.server_thread = None
+            self.server = None
+            self._server_task: Optional[asyncio.Task] = None
+            self.mode = mode
+            self.owner_loop = owner_loop
             self.endpoint = endpoint
             self.port = port
+            self.router: Optional[APIRouter] = None
             self.app = FastAPI(lifespan=self._fastapi_lifespan)
             self.logger.info(
                 f"Webhook server initialized on {self.endpoint}:{self.port}"
@@ -48,11 +63,12 @@ class WebhookServer:
         self.logger.info("Fastapi is starting...")
         # mettre tout ce qu'on veut faire executer par fastapi dans son thread au demarrage ici
 
-        asyncio.create_task(
-            self._watch_shutdown_signal()
-        )  # pour ne pas interferer avec
-        # la boucle d'event de fastapi en creant une manuellement pour le thread serveur on passe la fonction a
-        # fastapi pour qu'il l'execute lui meme dans la boucle asyncio de fastapi ainsi on est sur que le code est au bon endroit
+        if self.mode == WebhookServerMode.THREAD:
+            asyncio.create_task(
+                self._watch_shutdown_signal()
+            )  # pour ne pas interferer avec
+            # la boucle d'event de fastapi en creant une manuellement pour le thread serveur on passe la fonction a
+            # fastapi pour qu'il l'execute lui meme dans la boucle asyncio de fastapi ainsi on est sur que le code est au bon endroit
 
         yield
         self.logger.info("Fastapi is shutting down.")
@@ -66,10 +82,41 @@ class WebhookServer:
             await asyncio.sleep(0.1)
         await self._shutdown_webhook_server()
 
-    def _setup_routes(self):
+    async def _process_webhook(self, event: bytes) -> bool:
+        """
+        Transmet un webhook au connecteur dans la boucle asyncio propriétaire de ses futures et verrous.
+
+        Returns:
+            bool: False si la file d'ingestion du connecteur est saturée.
+        """
         from .connector import FedapayConnector
 
-        @self.app.post(f"/{self.endpoint}", status_code=status.HTTP_200_OK)
+        coroutine = FedapayConnector().fedapay_enqueue_webhook_data(event)
+        if (
+            self.owner_loop is not None
+            and self.owner_loop.is_running()
+            and self.owner_loop is not asyncio.get_running_loop()
+        ):
+            # mode thread : le traitement est exécuté dans la boucle de l'application
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(coroutine, self.owner_loop)
+            )
+        return await coroutine
+
+    def get_router(self) -> APIRouter:
+        """
+        Retourne le routeur FastAPI de réception des webhooks.
+
+        Il peut être monté dans l'application FastAPI hôte (`app.include_router(...)`) afin que
+        les webhooks soient traités dans la boucle asyncio de l'application, sans serveur dédié.
+        """
+        if self.router is None:
+            self.router = APIRouter()
+            self._setup_routes()
+        return self.router
+
+    def _setup_routes(self):
+        @self.router.post(f"/{self.endpoint}", status_code=status.HTTP_200_OK)
         async def receive_webhooks(request: Request):
             header = request.headers
             agregateur = str(header.get("agregateur"))
@@ -84,18 +131,27 @@ class WebhookServer:
                 payload, header.get("x-fedapay-signature"), self.fedapay_auth_key
             )
 
-            event = await request.json()
-            await FedapayConnector().fedapay_save_webhook_data(event)
+            # le corps brut est validé directement (model_validate_json) : un seul parsing JSON
+            if not await self._process_webhook(payload):
+                raise HTTPException(
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                    "File de traitement des webhooks saturée",
+                    headers={"Retry-After": "1"},
+                )
 
             return {"ok"}
 
-    def _start_webhook_server(self):
-        self._setup_routes()
+    def _create_server(self):
+        if self.router is None:
+            self.app.include_router(self.get_router())
         config = uvicorn.Config(
             app=self.app, host="localhost", port=self.port, log_level="info"
         )
         self.server = uvicorn.Server(config)
 
+    def _start_webhook_server(self):
+        self._create_server()
+
         try:
             self.logger.info(
                 f"Webhook server is starting at {self.endpoint}:{self.port}"
@@ -130,6 +186,9 @@ class WebhookServer:
             self.logger.warning("Webhook server is already running")
             return
 
+        if self.mode == WebhookServerMode.IN_LOOP:
+            return self._start_in_loop()
+
         try:
             self.server_thread = threading.Thread(
                 target=self._start_webhook_server, daemon=True
@@ -142,6 +201,62 @@ class WebhookServer:
             self.logger.error(f"Error starting webhook server: {e}")
             raise e
 
+    def _start_in_loop(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError as e:
+            self.logger.error(
+                "Webhook server in-loop mode requires a running asyncio event loop"
+            )
+            raise e
+
+        self._create_server()
+        self.logger.info(
+            f"Webhook server is starting at {self.endpoint}:{self.port} in the application event loop"
+        )
+        self._server_task = loop.create_task(self.server.serve())
+        self._server_task.add_done_callback(self._handle_server_task_done)
+        self.is_running = True
+
+    def _handle_server_task_done(self, task: asyncio.Task):
+        self.is_running = False
+        if task.cancelled():
+            return
+        exception = task.exception()
+        if exception:
+            self.logger.error(f"Error in webhook server: {exception}")
+        else:
+            self.logger.info("Webhook server stopped successfully.")
+
+    async def stop_webhook_listenning_async(self):
+        """
+        Arrête le serveur webhook sans bloquer la boucle asyncio de l'application.
+        """
+        if self.mode == WebhookServerMode.THREAD:
+            # l'arrêt du thread attend la fin des requêtes en cours, qui peuvent elles-mêmes
+            # attendre la boucle de l'application : il ne doit donc pas la bloquer
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.stop_webhook_listenning
+            )
+            return
+
+        if not self.is_running or self._server_task is None:
+            self.logger.warning("Webhook server is not running")
+            return
+        self.server.should_exit = True
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._server_task), self.shutdown_timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                "Le serveur webhook n'a pas pu être arrêté proprement dans le délai imparti"
+            )
+            self._server_task.cancel()
+        finally:
+            self.is_running = False
+            self._server_task = None
+
     def stop_webhook_listenning(self):
         """
         Stop the webhook server.
@@ -150,6 +265,10 @@ class WebhookServer:
         if not self.is_running:
             self.logger.warning("Webhook server is not running")
             return
+        if self.mode == WebhookServerMode.IN_LOOP:
+            # l'arrêt effectif a lieu dans la boucle : utiliser stop_webhook_listenning_async pour l'attendre
+            self.server.should_exit = True
+            return
         try:
             if self.server_thread and self.server_thread.is_alive():
                 self.shutdown_event.set()
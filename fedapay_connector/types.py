@@ -7,5 +7,7 @@ WebhookCallback = Callable[[WebhookHistory], Awaitable[None]]
 RunBeforeTimemoutCallback = Callable[[int], Awaitable[bool]]
 RunAtPersistedProcessReloadCallback = Callable[[ListeningProcessData], Awaitable[None]]
 OnPersistedProcessReloadFinishedCallback = Callable[[EventFutureStatus,list[WebhookTransaction] | None], Awaitable[None]]
+PersistedProcessReloadProgressCallback = Callable[[int, int], Awaitable[None]]
+RunAtPersistedProcessesBatchReloadCallback = Callable[[list[ListeningProcessData]], Awaitable[None]]
 
 
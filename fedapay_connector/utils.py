@@ -1,6 +1,7 @@
 import inspect
 import os, logging, hmac, hashlib, time  # noqa: E401
-from typing import Callable, Optional
+from functools import lru_cache
+from typing import Callable, Optional, Union
 from fastapi import HTTPException
 from logging.handlers import TimedRotatingFileHandler
 from .enums import Pays
@@ -69,20 +70,29 @@ def get_currency(pays: Pays):
     return Monnaies_Map.get(pays).value
 
 
-def verify_signature(payload: bytes, sig_header: str, secret: str):
+@lru_cache(maxsize=8)
+def _hmac_template(secret: str) -> "hmac.HMAC":
+    # l'état initial du HMAC (clé déjà dérivée) est calculé une fois puis copié à chaque requête
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def verify_signature(
+    payload: Union[bytes, bytearray, memoryview, str], sig_header: str, secret: str
+):
     # Extraire le timestamp et la signature depuis le header
     try:
         parts = sig_header.split(",")
         timestamp = int(parts[0].split("=")[1])
         received_signature = parts[1].split("=")[1]
-    except (IndexError, ValueError):
+    except (IndexError, ValueError, AttributeError):
         raise HTTPException(status_code=400, detail="Malformed signature header")
 
-    # Calculer la signature HMAC-SHA256
-    signed_payload = f"{timestamp}.{payload.decode('utf-8')}".encode("utf-8")
-    expected_signature = hmac.new(
-        secret.encode("utf-8"), signed_payload, hashlib.sha256
-    ).hexdigest()
+    # Calculer la signature HMAC-SHA256 de "{timestamp}.{payload}" de façon incrémentale,
+    # directement sur les octets reçus (sans décodage ni copie du corps)
+    mac = _hmac_template(secret).copy()
+    mac.update(b"%d." % timestamp)
+    mac.update(payload.encode("utf-8") if isinstance(payload, str) else payload)
+    expected_signature = mac.hexdigest()
 
     # Vérifier si la signature correspond
     if not hmac.compare_digest(expected_signature, received_signature):
@@ -0,0 +1,428 @@
+"""
+Micro-benchmarks des chemins critiques de fedapay-connector.
+
+Ne nécessite ni clé API ni accès réseau : chaque benchmark compare l'ancienne
+implémentation (reproduite ici) à l'implémentation actuelle sur des données synthétiques.
+
+Usage:
+    python test/benchmark.py
+"""
+
+import asyncio
+import gc
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+try:
+    from fedapay_connector.enums import (
+        EventFutureStatus,
+        ExceptionOnProcessReloadBehavior,
+    )
+    from fedapay_connector.event import FedapayEvent
+    from fedapay_connector.event_storage import ProcessPersistance
+    from fedapay_connector.integrations.export import (
+        DEFAULT_TRANSACTION_COLUMNS,
+        _cell,
+    )
+    from fedapay_connector.journal import ProcessJournal
+    from fedapay_connector.models import (
+        LazyWebhookTransaction,
+        ListeningProcessData,
+        TransactionListResponse,
+        WebhookTransaction,
+        WebhookTransactionHeader,
+    )
+    from fedapay_connector.pending import PendingRecord, ReceivedEvent
+    from fedapay_connector.utils import verify_signature
+except ImportError as e:
+    print(f"❌ Erreur d'importation: {e}. Vérifiez votre PYTHONPATH.")
+    sys.exit(1)
+
+SECRET = "wh_sandbox_benchmark_secret"
+ITERATIONS = 20_000
+PENDING_SCALES = (10_000, 100_000, 1_000_000)
+# au-delà, une représentation n'est pas mesurée à l'échelle suivante (estimation d'après l'échelle précédente)
+MEMORY_BUDGET = 1024 * 1024 * 1024
+CONCURRENT_FINALISATIONS = 5_000
+REGISTRY_ROUNDS = 4
+EXPORT_PAGE_SIZE = 100
+
+logger = logging.getLogger("fedapay_benchmark")
+logger.setLevel(logging.WARNING)
+
+
+def build_webhook_payload(transaction_id: int = 123456) -> bytes:
+    """Construit un corps de webhook FedaPay représentatif (transaction approuvée avec client)."""
+    event = {
+        "name": "transaction.approved",
+        "object": "transaction",
+        "entity": {
+            "klass": "v1/transaction",
+            "id": transaction_id,
+            "reference": f"trx_{transaction_id}_benchmark",
+            "amount": 25000,
+            "description": "Paiement de la commande #A-2048 — livraison Cotonou",
+            "callback_url": "https://example.com/paiement/retour",
+            "status": "approved",
+            "customer_id": 4242,
+            "currency_id": 1,
+            "mode": "mtn_open",
+            "operation": "payment",
+            "metadata": {
+                "paid_customer": {"firstname": "Dayane", "lastname": "ASSOGBA"}
+            },
+            "commission": 0.018,
+            "fees": 450,
+            "fixed_commission": 0,
+            "amount_transferred": 24550,
+            "created_at": "2025-10-17T10:00:00.000Z",
+            "updated_at": "2025-10-17T10:01:12.000Z",
+            "approved_at": "2025-10-17T10:01:12.000Z",
+            "merchant_reference": f"CMD-{transaction_id}",
+            "transaction_key": "0KJAU01",
+            "customer": {
+                "klass": "v1/customer",
+                "id": 4242,
+                "firstname": "Dayane",
+                "lastname": "ASSOGBA",
+                "full_name": "Dayane ASSOGBA",
+                "email": "test.dayane.connector@example.com",
+                "account_id": 1,
+                "created_at": "2025-01-01T00:00:00.000Z",
+                "updated_at": "2025-01-01T00:00:00.000Z",
+            },
+        },
+    }
+    return json.dumps(event, ensure_ascii=False).encode("utf-8")
+
+
+def sign(payload: bytes, timestamp: int) -> str:
+    signature = hmac.new(
+        SECRET.encode("utf-8"),
+        f"{timestamp}.{payload.decode('utf-8')}".encode("utf-8"),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"t={timestamp},s={signature}"
+
+
+def legacy_webhook_path(payload: bytes, sig_header: str):
+    """Chemin d'origine : décodage + ré-encodage pour le HMAC, json.loads puis model_validate."""
+    parts = sig_header.split(",")
+    timestamp = int(parts[0].split("=")[1])
+    received_signature = parts[1].split("=")[1]
+    signed_payload = f"{timestamp}.{payload.decode('utf-8')}".encode("utf-8")
+    expected_signature = hmac.new(
+        SECRET.encode("utf-8"), signed_payload, hashlib.sha256
+    ).hexdigest()
+    assert hmac.compare_digest(expected_signature, received_signature)
+    return WebhookTransaction.model_validate(json.loads(payload))
+
+
+def current_webhook_path(payload: bytes, sig_header: str):
+    """Chemin actuel : HMAC incrémental sur les octets bruts puis model_validate_json."""
+    verify_signature(payload, sig_header, SECRET)
+    return WebhookTransaction.model_validate_json(payload)
+
+
+def report(name: str, legacy: float, current: float, iterations: int):
+    legacy_us = legacy / iterations * 1e6
+    current_us = current / iterations * 1e6
+    print(
+        f"{name:<40} avant: {legacy_us:8.2f} µs/req   après: {current_us:8.2f} µs/req   "
+        f"gain: {(1 - current_us / legacy_us) * 100:5.1f}%"
+    )
+
+
+def benchmark_webhook_ingestion():
+    payload = build_webhook_payload()
+    sig_header = sign(payload, int(time.time()))
+    assert legacy_webhook_path(payload, sig_header) == current_webhook_path(
+        payload, sig_header
+    )
+
+    legacy = min(
+        timeit.repeat(
+            lambda: legacy_webhook_path(payload, sig_header),
+            number=ITERATIONS,
+            repeat=3,
+        )
+    )
+    current = min(
+        timeit.repeat(
+            lambda: current_webhook_path(payload, sig_header),
+            number=ITERATIONS,
+            repeat=3,
+        )
+    )
+    report(f"Ingestion webhook ({len(payload)} octets)", legacy, current, ITERATIONS)
+
+
+def benchmark_webhook_decoding():
+    payload = build_webhook_payload()
+    full = WebhookTransaction.model_validate_json(payload)
+    lazy = LazyWebhookTransaction(payload)
+    assert (lazy.name, lazy.id_transaction, lazy.status) == (
+        full.name,
+        full.entity.id,
+        full.entity.status,
+    )
+
+    legacy = min(
+        timeit.repeat(
+            lambda: WebhookTransaction.model_validate_json(payload),
+            number=ITERATIONS,
+            repeat=3,
+        )
+    )
+    current = min(
+        timeit.repeat(
+            lambda: LazyWebhookTransaction(
+                payload, WebhookTransactionHeader.model_validate_json(payload)
+            ),
+            number=ITERATIONS,
+            repeat=3,
+        )
+    )
+    report("Décodage webhook (en-tête seul)", legacy, current, ITERATIONS)
+
+
+def build_transactions_page(size: int = EXPORT_PAGE_SIZE) -> dict:
+    """Construit une page de `/v1/transactions/search` telle que décodée par le client HTTP."""
+    transactions = []
+    for index in range(size):
+        entity = json.loads(build_webhook_payload(100_000 + index))["entity"]
+        entity["custom_metadata"] = {"order_id": str(index)}
+        transactions.append(entity)
+    return {
+        "v1/transactions": transactions,
+        "meta": {
+            "current_page": 1,
+            "next_page": 2,
+            "per_page": size,
+            "total_pages": 10,
+            "total_count": 10 * size,
+        },
+    }
+
+
+def legacy_export_rows(page: dict) -> list[list]:
+    response = TransactionListResponse(**page)
+    rows = []
+    for transaction in response.transactions:
+        data = transaction.model_dump(mode="json")
+        rows.append([_cell(data.get(column)) for column in DEFAULT_TRANSACTION_COLUMNS])
+    return rows
+
+
+def export_rows(page: dict) -> list[list]:
+    return [
+        [_cell(transaction.get(column)) for column in DEFAULT_TRANSACTION_COLUMNS]
+        for transaction in page["v1/transactions"]
+    ]
+
+
+def benchmark_export_rows():
+    page = build_transactions_page()
+    iterations = ITERATIONS // EXPORT_PAGE_SIZE
+    legacy = min(
+        timeit.repeat(lambda: legacy_export_rows(page), number=iterations, repeat=3)
+    )
+    current = min(timeit.repeat(lambda: export_rows(page), number=iterations, repeat=3))
+    report(
+        f"Export d'une page de {EXPORT_PAGE_SIZE} transactions",
+        legacy,
+        current,
+        iterations,
+    )
+
+
+def legacy_pending_state(loop: asyncio.AbstractEventLoop, count: int):
+    """État d'origine : trois dictionnaires parallèles et des `WebhookTransaction` complets."""
+    futures, event_data, retry_attempts = {}, {}, {}
+    for i in range(count):
+        futures[i] = loop.create_future()
+        event_data[i] = [
+            WebhookTransaction.model_validate_json(build_webhook_payload(i))
+        ]
+    return futures, event_data, retry_attempts
+
+
+def pending_state(loop: asyncio.AbstractEventLoop, count: int, keep_payload: bool):
+    """État actuel : un `PendingRecord` par transaction."""
+    pending = {}
+    for i in range(count):
+        record = PendingRecord()
+        record.future = loop.create_future()
+        record.deadline = time.time() + 600
+        record.events = [
+            ReceivedEvent.from_webhook(
+                LazyWebhookTransaction(build_webhook_payload(i)), keep_payload
+            )
+        ]
+        pending[i] = record
+    return pending
+
+
+def measure_bytes_per_item(build, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    state = build(count)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    gc.collect()
+    return allocated / count
+
+
+def benchmark_pending_memory():
+    """Octets par transaction en attente (future + un webhook reçu), selon la représentation."""
+    loop = asyncio.new_event_loop()
+    variants = {
+        "dicts + WebhookTransaction": lambda n: legacy_pending_state(loop, n),
+        "PendingRecord + webhook brut": lambda n: pending_state(loop, n, True),
+        "PendingRecord compact": lambda n: pending_state(loop, n, False),
+    }
+    print("\nMémoire par transaction en attente (future + 1 webhook reçu)")
+    print(f"{'':<30}" + "".join(f"{scale:>14,}" for scale in PENDING_SCALES))
+    for name, build in variants.items():
+        line, per_item = f"{name:<30}", None
+        for scale in PENDING_SCALES:
+            if per_item is not None and per_item * scale > MEMORY_BUDGET:
+                line += f"{'—':>14}"
+                continue
+            per_item = measure_bytes_per_item(build, scale)
+            line += f"{per_item:>12,.0f} o"
+        print(line)
+    loop.close()
+
+
+class LegacyFutureRegistry:
+    """
+    Registre d'origine : dictionnaire protégé par un `asyncio.Lock`, résultat posé via
+    `call_soon_threadsafe`, annulation globale séquentielle. La journalisation d'origine est conservée.
+    """
+
+    def __init__(self, journal: ProcessJournal):
+        self._lock = asyncio.Lock()
+        self._futures: dict[int, asyncio.Future] = {}
+        self._journal = journal
+        self._loop = asyncio.get_running_loop()
+
+    async def create_future(self, id_transaction: int) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        async with self._lock:
+            self._futures[id_transaction] = future
+        await self._journal.save_process(
+            id_transaction,
+            ListeningProcessData(id_transaction=id_transaction, created_at=time.time()),
+        )
+        return future
+
+    async def resolve(self, id_transaction: int):
+        logger.info(f"Resolving future for id_transaction '{id_transaction}'")
+        async with self._lock:
+            future = self._futures.pop(id_transaction, None)
+        if future and not future.done():
+            self._loop.call_soon_threadsafe(
+                future.set_result, EventFutureStatus.RESOLVED
+            )
+            await self._journal.delete_process(id_transaction)
+            logger.info(f"Future for id_transaction '{id_transaction}' resolved")
+
+    async def cancel(self, id_transaction: int, lock_acquire: bool = True):
+        logger.info(f"Cancelling future for id_transaction '{id_transaction}'")
+        if lock_acquire:
+            async with self._lock:
+                future = self._futures.pop(id_transaction, None)
+        else:
+            future = self._futures.pop(id_transaction, None)
+        if future and not future.done():
+            self._loop.call_soon_threadsafe(
+                future.set_result, EventFutureStatus.CANCELLED
+            )
+            await self._journal.delete_process(id_transaction)
+            logger.info(f"Future for id_transaction '{id_transaction}' cancelled")
+
+    async def cancel_all(self, reason: str = ""):
+        async with self._lock:
+            for id_transaction in list(self._futures):
+                await self.cancel(id_transaction, False)
+
+
+async def run_registry_scenario(registry, count: int) -> tuple[float, float]:
+    """Retourne les durées de `count` finalisations concurrentes puis d'une annulation globale de `count` écoutes."""
+    futures = await asyncio.gather(*(registry.create_future(i) for i in range(count)))
+    start = time.perf_counter()
+    await asyncio.gather(*(registry.resolve(i) for i in range(count)), *futures)
+    finalise = time.perf_counter() - start
+
+    futures = await asyncio.gather(
+        *(registry.create_future(i) for i in range(count, 2 * count))
+    )
+    start = time.perf_counter()
+    await registry.cancel_all("benchmark")
+    await asyncio.gather(*futures)
+    cancel_all = time.perf_counter() - start
+    return finalise, cancel_all
+
+
+async def benchmark_future_registry_async(directory: str):
+    count = CONCURRENT_FINALISATIONS
+    journal = ProcessJournal(
+        logger=logger,
+        storage=ProcessPersistance(
+            logger=logger, db_url=f"sqlite:///{os.path.join(directory, 'legacy.db')}"
+        ),
+    )
+    event_manager = FedapayEvent(
+        logger,
+        5,
+        ExceptionOnProcessReloadBehavior.KEEP_AND_RETRY,
+        ["transaction.approved"],
+        db_url=f"sqlite:///{os.path.join(directory, 'current.db')}",
+    )
+    registries = {"legacy": LegacyFutureRegistry(journal), "current": event_manager}
+    best = {name: (float("inf"), float("inf")) for name in registries}
+    # passes alternées, meilleure mesure retenue : la seconde exécution d'une passe est pénalisée
+    # par les déchets de la première, l'ordre ne doit pas décider du résultat
+    for round_index in range(REGISTRY_ROUNDS):
+        names = list(registries)
+        if round_index % 2:
+            names.reverse()
+        for name in names:
+            gc.collect()
+            finalise, cancel_all = await run_registry_scenario(registries[name], count)
+            best[name] = (min(best[name][0], finalise), min(best[name][1], cancel_all))
+    await journal.close()
+    await event_manager.close()
+    legacy, current = best["legacy"], best["current"]
+
+    print(f"\nRegistre des écoutes ({count} transactions, persistance SQLite)")
+    report(f"{count} finalisations concurrentes", legacy[0], current[0], count)
+    report(f"Annulation globale de {count} écoutes", legacy[1], current[1], count)
+
+
+def benchmark_future_registry():
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(benchmark_future_registry_async(directory))
+
+
+def main():
+    print(f"Python {sys.version.split()[0]} — {ITERATIONS} itérations par mesure\n")
+    benchmark_webhook_ingestion()
+    benchmark_webhook_decoding()
+    benchmark_export_rows()
+    benchmark_future_registry()
+    benchmark_pending_memory()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Outils communs des tests unitaires : aucun ne nécessite de clé API ni d'accès à FedaPay.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import pytest
+from aiohttp import web
+
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import ExceptionOnProcessReloadBehavior
+from fedapay_connector.event import FedapayEvent
+
+logger = logging.getLogger("fedapay_connector_tests")
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Chaque test repart d'un connecteur et d'un gestionnaire d'événements neufs."""
+    FedapayConnector._instance = None
+    FedapayEvent._instance = None
+    yield
+    FedapayConnector._instance = None
+    FedapayEvent._instance = None
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path}/processes.db"
+
+
+@asynccontextmanager
+async def fake_server(routes: web.RouteTableDef):
+    """
+    Démarre un serveur HTTP local sur un port libre et retourne son URL de base.
+    """
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def make_event_manager(db_url: str, **kwargs) -> FedapayEvent:
+    """Gestionnaire d'événements autonome ; à construire dans une boucle asyncio active."""
+    kwargs.setdefault(
+        "on_listening_reload_exception",
+        ExceptionOnProcessReloadBehavior.DROP_AND_REMOVE_PERSISTANCE,
+    )
+    return FedapayEvent(
+        logger=logger,
+        max_reload_attempts=3,
+        final_event_names=[
+            "transaction.approved",
+            "transaction.declined",
+            "transaction.canceled",
+        ],
+        db_url=db_url,
+        **kwargs,
+    )
+
+
+def webhook_payload(
+    transaction_id: int, name: str = "transaction.approved", **entity
+) -> bytes:
+    """Corps brut minimal d'un webhook de transaction FedaPay."""
+    entity.setdefault("status", name.split(".", 1)[1])
+    return json.dumps(
+        {
+            "name": name,
+            "object": "transaction",
+            "entity": {"klass": "v1/transaction", "id": transaction_id, **entity},
+        }
+    ).encode("utf-8")
+
+
+def sign(payload: bytes, secret: str, timestamp: Optional[int] = None) -> str:
+    """En-tête `x-fedapay-signature` d'un corps de webhook."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(
+        secret.encode("utf-8"), b"%d." % timestamp + payload, hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},s={signature}"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
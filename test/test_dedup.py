@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from conftest import logger
+from fedapay_connector.dedup import DeduplicationStore
+from fedapay_connector.event_storage import ProcessPersistance
+
+
+def test_keys_expire_after_ttl():
+    async def scenario():
+        store = DeduplicationStore(logger, ttl=0.02)
+        await store.add("1.transaction.approved")
+        assert "1.transaction.approved" in store
+        await asyncio.sleep(0.03)
+        return store
+
+    store = asyncio.run(scenario())
+    assert "1.transaction.approved" not in store
+    assert store.stats().evicted_expired == 1
+
+
+def test_oldest_keys_are_evicted_beyond_capacity():
+    async def scenario():
+        store = DeduplicationStore(logger, max_entries=3)
+        for key in range(5):
+            await store.add(str(key))
+        return store
+
+    store = asyncio.run(scenario())
+    assert len(store) == 3
+    assert "0" not in store and "1" not in store
+    assert all(str(key) in store for key in (2, 3, 4))
+    stats = store.stats()
+    assert stats.evicted_capacity == 2
+    assert stats.hits == 3
+
+
+def test_persisted_keys_survive_a_restart(db_url):
+    async def scenario():
+        storage = ProcessPersistance(logger=logger, db_url=db_url)
+        store = DeduplicationStore(logger, storage=storage)
+        await store.add("7.transaction.approved")
+        # clé déjà expirée en base : non rechargée
+        await storage.save_processed_event("8.transaction.declined", time.time() - 1)
+
+        reloaded = DeduplicationStore(logger, storage=storage)
+        await reloaded.load()
+        await storage.close()
+        return reloaded
+
+    reloaded = asyncio.run(scenario())
+    assert "7.transaction.approved" in reloaded
+    assert "8.transaction.declined" not in reloaded
+    assert len(reloaded) == 1
@@ -0,0 +1,74 @@
+import asyncio
+
+from conftest import logger, webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import EventFutureStatus
+from fedapay_connector.event_bus import SQLiteEventBus
+from fedapay_connector.models import LazyWebhookTransaction
+
+
+def test_bus_event_received_before_listening_resolves_later_finalise(tmp_path):
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False, db_url=f"sqlite:///{tmp_path}/p.db"
+        )
+        # webhook publié par un autre worker avant que ce worker n'écoute la transaction
+        await connector._on_bus_event(LazyWebhookTransaction(webhook_payload(12)))
+        result, events = await asyncio.wait_for(
+            connector._await_external_event(12, timeout_return=60), timeout=5
+        )
+        await connector._event_manager.close()
+        return result, events
+
+    result, events = asyncio.run(scenario())
+    assert result == EventFutureStatus.RESOLVED
+    assert [event.name for event in events] == ["transaction.approved"]
+
+
+def test_bus_events_without_listener_stay_in_a_bounded_memory_buffer(tmp_path):
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False, db_url=f"sqlite:///{tmp_path}/p.db"
+        )
+        manager = connector._event_manager
+        manager.remote_events_max_entries = 3
+        for id_transaction in range(1, 11):
+            await connector._on_bus_event(
+                LazyWebhookTransaction(webhook_payload(id_transaction))
+            )
+        persisted = await manager._event_persit_storage.count_processes()
+        state = (len(manager._pending), list(manager._remote_events), persisted)
+        await manager.close()
+        return state
+
+    pending, buffered, persisted = asyncio.run(scenario())
+    # ni enregistrement suivi ni écriture en base : seules les dernières transactions sont gardées
+    assert (pending, persisted) == (0, 0)
+    assert buffered == [8, 9, 10]
+
+
+def test_sqlite_bus_delivers_only_other_workers_events(tmp_path):
+    db_path = str(tmp_path / "bus.db")
+
+    async def scenario():
+        received = []
+
+        async def handler(event):
+            received.append(event.id_transaction)
+
+        publisher = SQLiteEventBus(logger, db_path=db_path, poll_interval=0.01)
+        subscriber = SQLiteEventBus(logger, db_path=db_path, poll_interval=0.01)
+        await publisher.start(handler)
+        await subscriber.start(handler)
+        await publisher.publish(LazyWebhookTransaction(webhook_payload(5)))
+        for _ in range(200):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await publisher.close()
+        await subscriber.close()
+        return received
+
+    # seul l'abonné (autre worker) reçoit l'événement, une seule fois
+    assert asyncio.run(scenario()) == [5]
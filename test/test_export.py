@@ -0,0 +1,140 @@
+import asyncio
+import csv
+import json
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from conftest import fake_server
+from fedapay_connector.enums import ExportFormat
+from fedapay_connector.integration import Integration
+
+TOTAL_PAGES = 5
+PER_PAGE = 2
+
+
+def search_routes(requested: list, failing_page: int = 0) -> web.RouteTableDef:
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/transactions/search")
+    async def search(request):
+        page = int(request.query["page"])
+        requested.append(page)
+        if page == failing_page:
+            return web.json_response({"message": "erreur"}, status=400)
+        return web.json_response(
+            {
+                "v1/transactions": [
+                    {
+                        "id": (page - 1) * PER_PAGE + index + 1,
+                        "status": "approved",
+                        "custom_metadata": {"page": page},
+                    }
+                    for index in range(PER_PAGE)
+                ],
+                "meta": {
+                    "current_page": page,
+                    "next_page": page + 1 if page < TOTAL_PAGES else None,
+                    "per_page": PER_PAGE,
+                    "total_pages": TOTAL_PAGES,
+                    "total_count": TOTAL_PAGES * PER_PAGE,
+                },
+            }
+        )
+
+    return routes
+
+
+async def export(routes, directory, **kwargs):
+    async with fake_server(routes) as base_url:
+        async with Integration(api_url=base_url, default_api_key="sk_test") as api:
+            return await api.export_transactions(
+                str(directory),
+                columns=["id", "status", "custom_metadata"],
+                per_page=PER_PAGE,
+                rows_per_file=4,
+                **kwargs,
+            )
+
+
+def read_csv(paths: list[str]) -> list[list[str]]:
+    rows = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as file:
+            rows.extend(list(csv.reader(file))[1:])
+    return rows
+
+
+def test_csv_export_is_split_into_ordered_files(tmp_path):
+    summary = asyncio.run(export(search_routes([]), tmp_path, concurrency=3))
+
+    assert [os.path.basename(path) for path in summary.files] == [
+        "transactions-00000.csv",
+        "transactions-00001.csv",
+        "transactions-00002.csv",
+    ]
+    assert (summary.rows, summary.pages) == (10, TOTAL_PAGES)
+    rows = read_csv(summary.files)
+    assert [int(row[0]) for row in rows] == list(range(1, 11))
+    # valeurs imbriquées aplaties en JSON
+    assert rows[0][1:] == ["approved", '{"page":1}']
+
+
+def test_interrupted_export_resumes_from_the_last_finished_file(tmp_path):
+    checkpoint_path = str(tmp_path / "export.checkpoint")
+    requested = []
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(
+            export(
+                search_routes(requested, failing_page=4),
+                tmp_path,
+                concurrency=1,
+                checkpoint_path=checkpoint_path,
+            )
+        )
+    # seul le premier fichier (pages 1 et 2) est terminé ; le fichier en cours n'est pas publié
+    assert sorted(os.listdir(tmp_path)) == [
+        "export.checkpoint",
+        "transactions-00000.csv",
+        "transactions-00001.csv.part",
+    ]
+
+    requested.clear()
+    summary = asyncio.run(
+        export(
+            search_routes(requested),
+            tmp_path,
+            concurrency=1,
+            checkpoint_path=checkpoint_path,
+        )
+    )
+    assert requested == [3, 4, 5]
+    assert summary.resumed_from_page == 3
+    assert summary.rows == 10
+    assert [int(row[0]) for row in read_csv(summary.files)] == list(range(1, 11))
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_jsonl_and_parquet_exports_hold_the_same_rows(tmp_path):
+    jsonl = asyncio.run(
+        export(search_routes([]), tmp_path / "jsonl", export_format=ExportFormat.JSONL)
+    )
+    ids = []
+    for path in jsonl.files:
+        with open(path, encoding="utf-8") as file:
+            ids.extend(json.loads(line)["id"] for line in file)
+    assert ids == list(range(1, 11))
+
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    parquet = asyncio.run(
+        export(
+            search_routes([]), tmp_path / "parquet", export_format=ExportFormat.PARQUET
+        )
+    )
+    ids = []
+    for path in parquet.files:
+        ids.extend(pyarrow_parquet.read_table(path).column("id").to_pylist())
+    assert ids == list(range(1, 11))
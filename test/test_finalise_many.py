@@ -0,0 +1,95 @@
+import asyncio
+
+from conftest import webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import EventFutureStatus, FinaliseReturnWhen
+
+
+def make_connector(tmp_path) -> FedapayConnector:
+    return FedapayConnector(save_log_to_file=False, db_url=f"sqlite:///{tmp_path}/p.db")
+
+
+async def close(connector: FedapayConnector):
+    await connector._event_manager.cancel_all("fin du test")
+    await connector._http_client.close()
+    await connector._event_manager.close()
+
+
+def test_all_completed_waits_every_transaction(tmp_path):
+    async def scenario():
+        connector = make_connector(tmp_path)
+        event_manager = connector._event_manager
+        # webhook final reçu avant la mise en place de l'écoute
+        await connector._process_webhook_data(webhook_payload(1))
+        waiting = asyncio.create_task(
+            connector.fedapay_finalise_many([1, 2, 3, 2], timeout=60)
+        )
+        while not event_manager.has_future(3):
+            await asyncio.sleep(0)
+        await connector._process_webhook_data(webhook_payload(2))
+        await connector._process_webhook_data(
+            webhook_payload(3, name="transaction.declined")
+        )
+        results = await asyncio.wait_for(waiting, timeout=5)
+        # toutes finalisées : plus aucun processus d'écoute persisté
+        persisted = await event_manager._event_persit_storage.count_processes()
+        await close(connector)
+        return persisted, results
+
+    persisted, results = asyncio.run(scenario())
+    assert persisted == 0
+    assert sorted(results) == [1, 2, 3]
+    assert {status for status, _ in results.values()} == {EventFutureStatus.RESOLVED}
+    assert [event.name for event in results[3][1]] == ["transaction.declined"]
+
+
+def test_first_completed_leaves_the_others_listening(tmp_path):
+    async def scenario():
+        connector = make_connector(tmp_path)
+        event_manager = connector._event_manager
+        waiting = asyncio.create_task(
+            connector.fedapay_finalise_many(
+                [1, 2, 3], timeout=60, return_when=FinaliseReturnWhen.FIRST_COMPLETED
+            )
+        )
+        while not event_manager.has_future(3):
+            await asyncio.sleep(0)
+        await connector._process_webhook_data(webhook_payload(2))
+        results = await asyncio.wait_for(waiting, timeout=5)
+        listening = [event_manager.has_future(i) for i in (1, 2, 3)]
+        await close(connector)
+        return results, listening
+
+    results, listening = asyncio.run(scenario())
+    assert list(results) == [2]
+    assert listening == [True, False, True]
+
+
+def test_cancelling_the_iteration_cancels_the_remaining_listeners(tmp_path):
+    async def scenario():
+        connector = make_connector(tmp_path)
+        event_manager = connector._event_manager
+        finalised = []
+
+        async def consume():
+            async for id_transaction, status, _ in connector.as_finalised(
+                [1, 2], timeout=60
+            ):
+                finalised.append((id_transaction, status))
+
+        task = asyncio.create_task(consume())
+        while not event_manager.has_future(2):
+            await asyncio.sleep(0)
+        await connector._process_webhook_data(webhook_payload(1))
+        while not finalised:
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        listening = event_manager.has_future(2)
+        persisted = await event_manager._event_persit_storage.count_processes()
+        await close(connector)
+        return finalised, listening, persisted
+
+    finalised, listening, persisted = asyncio.run(scenario())
+    assert finalised == [(1, EventFutureStatus.RESOLVED)]
+    assert not listening and persisted == 0
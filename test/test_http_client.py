@@ -0,0 +1,55 @@
+import asyncio
+
+from aiohttp import web
+
+from conftest import fake_server, logger
+from fedapay_connector.integrations import HttpClient
+
+
+def test_session_is_shared_and_recreated_after_close():
+    async def scenario():
+        client = HttpClient(logger)
+        assert client.closed
+        first = await client.get_session()
+        assert await client.get_session() is first
+        await client.close()
+        assert client.closed
+        second = await client.get_session()
+        assert second is not first
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_first_calls_create_a_single_session():
+    async def scenario():
+        client = HttpClient(logger)
+        sessions = await asyncio.gather(*(client.get_session() for _ in range(20)))
+        assert len({id(session) for session in sessions}) == 1
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_request_reuses_pooled_connection():
+    routes = web.RouteTableDef()
+    peers = []
+
+    @routes.get("/v1/ping")
+    async def ping(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"ok": True})
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            client = HttpClient(logger, coalesce_reads=False)
+            for _ in range(3):
+                status, body = await client.request(
+                    "GET", f"{base_url}/v1/ping", api_key="sk_test"
+                )
+                assert (status, body) == (200, {"ok": True})
+            await client.close()
+
+    asyncio.run(scenario())
+    # keep-alive : une seule connexion TCP pour les trois requêtes
+    assert len(set(peers)) == 1
@@ -0,0 +1,160 @@
+import asyncio
+import os
+
+from conftest import logger, webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.event import FedapayEvent
+from fedapay_connector.inbox import WebhookInbox
+
+
+async def replay_all(inbox: WebhookInbox) -> list:
+    return [record async for records in inbox.replay() for record in records]
+
+
+def segment_files(directory) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+def test_torn_tail_record_is_not_replayed(tmp_path):
+    async def write():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        await inbox.append(b"first")
+        await inbox.append(b"second")
+        await inbox.close()
+
+    async def read():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        records = await replay_all(inbox)
+        await inbox.close()
+        return records
+
+    asyncio.run(write())
+    # arrêt brutal au milieu de l'écriture du dernier enregistrement
+    segment = tmp_path / segment_files(tmp_path)[0]
+    segment.write_bytes(segment.read_bytes()[:-3])
+
+    records = asyncio.run(read())
+    assert [payload for _, payload in records] == [b"first"]
+
+
+def test_acked_webhooks_are_not_replayed(tmp_path):
+    async def write():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        positions = [await inbox.append(b"%d" % i) for i in range(3)]
+        inbox.ack(positions[0])
+        inbox.ack(positions[2])
+        await inbox.close()
+
+    async def replay_and_ack():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        records = await replay_all(inbox)
+        for position, _ in records:
+            inbox.ack(position)
+        await inbox.close()
+        return [payload for _, payload in records]
+
+    asyncio.run(write())
+    assert asyncio.run(replay_and_ack()) == [b"1"]
+    # plus rien à restituer : le segment consommé est supprimé avec son fichier d'acquittement
+    assert asyncio.run(replay_and_ack()) == []
+    assert os.listdir(tmp_path) == []
+
+
+def test_connector_restores_an_unprocessed_webhook_once(tmp_path):
+    inbox_dir = str(tmp_path / "inbox")
+
+    def make_connector() -> FedapayConnector:
+        return FedapayConnector(
+            save_log_to_file=False,
+            db_url=f"sqlite:///{tmp_path}/p.db",
+            webhook_inbox_dir=inbox_dir,
+        )
+
+    async def crash_after_append():
+        connector = make_connector()
+        # webhook journalisé puis arrêt brutal avant son traitement
+        await connector._webhook_inbox.append(webhook_payload(7))
+        await connector._webhook_inbox.close()
+        await connector._event_manager.close()
+
+    async def restart():
+        # nouveau processus : singletons neufs
+        FedapayConnector._instance = None
+        FedapayEvent._instance = None
+        connector = make_connector()
+        await connector._replay_webhook_inbox()
+        restored = connector._event_manager._pending.get(7)
+        await connector._webhook_inbox.close()
+        await connector._event_manager.close()
+        return restored is not None and restored.events is not None
+
+    asyncio.run(crash_after_append())
+    assert asyncio.run(restart())
+    # deuxième redémarrage : le webhook déjà restitué n'est plus relu
+    assert not asyncio.run(restart())
+
+
+def test_directly_saved_webhook_is_journaled_and_consumed(tmp_path):
+    inbox_dir = str(tmp_path / "inbox")
+
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False,
+            db_url=f"sqlite:///{tmp_path}/p.db",
+            webhook_inbox_dir=inbox_dir,
+        )
+        await connector.fedapay_save_webhook_data(webhook_payload(8))
+        await connector._webhook_inbox.close()
+        await connector._event_manager.close()
+
+        inbox = WebhookInbox(logger, directory=inbox_dir)
+        records = await replay_all(inbox)
+        await inbox.close()
+        return records
+
+    # écrit dans l'inbox avant traitement, puis acquitté : rien à restituer au redémarrage
+    assert asyncio.run(scenario()) == []
+    assert segment_files(inbox_dir) == []
+
+
+class FailingSegment:
+    """Segment dont la prochaine écriture n'aboutit qu'en partie (ex: disque plein)."""
+
+    def __init__(self, file):
+        self._file = file
+        self.name = file.name
+
+    def write(self, data):
+        self._file.write(bytes(data[: len(data) // 2]))
+        raise OSError(28, "No space left on device")
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def test_partially_written_batch_is_truncated_before_the_next_append(tmp_path):
+    async def write():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        await inbox.append(b"first")
+        segment = inbox._file
+        inbox._file = FailingSegment(segment)
+        try:
+            await inbox.append(b"lost")
+        except OSError:
+            pass
+        inbox._file = segment
+        await inbox.append(b"third")
+        await inbox.close()
+
+    async def read():
+        inbox = WebhookInbox(logger, directory=str(tmp_path))
+        records = await replay_all(inbox)
+        await inbox.close()
+        return [payload for _, payload in records]
+
+    asyncio.run(write())
+    # l'enregistrement suivant l'échec reste lisible
+    assert asyncio.run(read()) == [b"first", b"third"]
@@ -0,0 +1,113 @@
+import asyncio
+
+from conftest import logger, webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import EventFutureStatus
+from fedapay_connector.ingestion import WebhookIngestionQueue
+
+
+def payloads(count: int) -> list[bytes]:
+    return [b'{"n": %d}' % i for i in range(count)]
+
+
+def test_spilled_webhooks_survive_a_restart_in_order(tmp_path):
+    spill_path = str(tmp_path / "spill.bin")
+    processed = []
+
+    async def blocked(payload: bytes):
+        await asyncio.Event().wait()
+
+    async def record(payload: bytes):
+        processed.append(payload)
+
+    async def scenario():
+        # premier démarrage : un seul worker bloqué, file de 2 places, le reste déborde sur disque
+        queue = WebhookIngestionQueue(
+            logger, blocked, max_size=2, workers=1, spill_path=spill_path
+        )
+        await queue.start()
+        for payload in payloads(6):
+            assert queue.submit(payload)
+        await asyncio.sleep(0.01)
+        # un webhook en cours de traitement, un en file, quatre sur disque
+        stats = queue.stats()
+        assert (stats.queue_depth, stats.spilled) == (1, 4)
+        await queue.close(timeout=0.01)
+
+        # redémarrage : tout est traité, webhook interrompu compris, dans l'ordre d'arrivée
+        queue = WebhookIngestionQueue(
+            logger, record, max_size=2, workers=1, spill_path=spill_path
+        )
+        await queue.start()
+        await queue.close(timeout=5)
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert processed == payloads(6)
+    assert queue.stats().processed == 6
+
+
+def test_full_queue_without_spill_file_rejects():
+    async def blocked(payload: bytes):
+        await asyncio.Event().wait()
+
+    async def scenario():
+        queue = WebhookIngestionQueue(logger, blocked, max_size=1, workers=1)
+        await queue.start()
+        accepted = [queue.submit(payload) for payload in payloads(3)]
+        stats = queue.stats()
+        await queue.close(timeout=0.01)
+        return accepted, stats
+
+    accepted, stats = asyncio.run(scenario())
+    # un webhook en mémoire, les deux suivants refusés (503 côté route)
+    assert accepted == [True, False, False]
+    assert stats.rejected == 2
+
+
+def test_torn_spill_record_is_truncated(tmp_path):
+    spill_path = tmp_path / "spill.bin"
+    processed = []
+
+    async def record(payload: bytes):
+        processed.append(payload)
+
+    async def scenario():
+        queue = WebhookIngestionQueue(
+            logger, record, max_size=1, workers=1, spill_path=str(spill_path)
+        )
+        await queue.start()
+        await queue.close(timeout=1)
+
+    # un enregistrement complet suivi d'un enregistrement tronqué par un arrêt brutal
+    spill_path.write_bytes(b"\x00\x00\x00\x02ok" + b"\x00\x00\x00\x10trunc")
+    asyncio.run(scenario())
+    assert processed == [b"ok"]
+    assert spill_path.read_bytes() == b""
+
+
+def test_shutdown_drains_queued_webhooks_before_cancelling_listeners(tmp_path):
+    handled = []
+
+    async def webhook_callback(event):
+        await asyncio.sleep(0.05)
+        handled.append(event.entity.id)
+
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False,
+            db_url=f"sqlite:///{tmp_path}/p.db",
+            use_listen_server=False,
+            webhook_queue_size=10,
+            webhook_queue_workers=1,
+        )
+        connector.set_webhook_callback_function(webhook_callback)
+        future = await connector._event_manager.create_future(3, timeout=60)
+        assert await connector.fedapay_enqueue_webhook_data(webhook_payload(3))
+        # arrêt demandé alors que le webhook est encore dans la file
+        await connector.shutdown_cleanup()
+        return future.result()
+
+    result = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert result == EventFutureStatus.RESOLVED
+    assert handled == [3]
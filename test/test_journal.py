@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+
+import pytest
+
+from conftest import logger
+from fedapay_connector.enums import PersistenceDurability
+from fedapay_connector.event_storage import ProcessOperation, ProcessPersistance
+from fedapay_connector.journal import _COALESCE, ProcessJournal
+from fedapay_connector.models import ListeningProcessData
+
+OPERATIONS = (ProcessOperation.SAVE, ProcessOperation.UPDATE, ProcessOperation.DELETE)
+ABSENT = "absent"
+
+
+def apply(state, operation, data):
+    """Effet d'une opération sur une ligne, tel qu'appliqué par ProcessPersistance._apply_batch."""
+    if operation is None:
+        return state
+    if operation in (ProcessOperation.SAVE, ProcessOperation.REPLACE):
+        return data
+    if operation == ProcessOperation.UPDATE:
+        return ABSENT if state == ABSENT else data
+    return ABSENT
+
+
+@pytest.mark.parametrize("initial", [ABSENT, "stored"])
+@pytest.mark.parametrize("length", [1, 2, 3])
+def test_coalesced_operation_matches_sequential_writes(initial, length):
+    for sequence in itertools.product(OPERATIONS, repeat=length):
+        expected = initial
+        composed = None
+        for step, operation in enumerate(sequence):
+            expected = apply(expected, operation, f"v{step}")
+            composed = _COALESCE[(composed, operation)]
+        # la donnée retenue par le journal est celle de la dernière opération
+        assert apply(initial, composed, f"v{length - 1}") == expected, sequence
+
+
+class FlakyStorage(ProcessPersistance):
+    """Persistance dont les `failures` premières écritures par lot échouent."""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    async def apply_batch(self, operations):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("base indisponible")
+        await super().apply_batch(operations)
+
+
+def test_save_then_delete_removes_an_existing_row(db_url):
+    async def scenario():
+        storage = ProcessPersistance(logger=logger, db_url=db_url)
+        await storage.save_process(1, ListeningProcessData(id_transaction=1))
+        journal = ProcessJournal(logger=logger, storage=storage)
+        await asyncio.gather(
+            journal.save_process(1, ListeningProcessData(id_transaction=1)),
+            journal.delete_process(1),
+        )
+        count = await journal.count_processes()
+        await journal.close()
+        return count
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_burst_above_max_batch_size_starts_a_single_flush(db_url):
+    async def scenario():
+        storage = ProcessPersistance(logger=logger, db_url=db_url)
+        journal = ProcessJournal(logger=logger, storage=storage, max_batch_size=50)
+        writes = [asyncio.ensure_future(journal.delete_process(i)) for i in range(1000)]
+        # tous les ajouts ont eu lieu, l'écriture lancée n'a pas encore commencé
+        await asyncio.sleep(0)
+        started = len(journal._flush_tasks)
+        await asyncio.gather(*writes)
+        await journal.close()
+        return started
+
+    # une seule écriture pour le lot, et non une par ajout au-delà de max_batch_size
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) == 1
+
+
+def test_async_failed_batch_is_requeued_and_written_later(db_url):
+    async def scenario():
+        storage = FlakyStorage(failures=2, logger=logger, db_url=db_url)
+        journal = ProcessJournal(
+            logger=logger,
+            storage=storage,
+            durability=PersistenceDurability.ASYNC,
+            flush_interval=0.001,
+        )
+        await journal.save_process(1, ListeningProcessData(id_transaction=1))
+        await journal.save_process(2, ListeningProcessData(id_transaction=2))
+        await asyncio.sleep(0.002)
+        while storage.failures:
+            await asyncio.sleep(0.001)
+        # opération reçue après l'échec : composée après celles du lot conservé
+        await journal.delete_process(2)
+        await journal.close()
+        check = ProcessPersistance(logger=logger, db_url=db_url)
+        processes = await check.load_processes()
+        await check.close()
+        return [p.StoredListeningProcess_transaction_id for p in processes]
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=5)) == [1]
+
+
+def test_async_persistent_failure_is_raised_by_close(db_url):
+    async def scenario():
+        storage = FlakyStorage(failures=100, logger=logger, db_url=db_url)
+        journal = ProcessJournal(
+            logger=logger,
+            storage=storage,
+            durability=PersistenceDurability.ASYNC,
+            flush_interval=0.001,
+        )
+        await journal.save_process(1, ListeningProcessData(id_transaction=1))
+        await asyncio.sleep(0.01)
+        assert journal.pending_operations == 1
+        with pytest.raises(RuntimeError):
+            await journal.close()
+
+    asyncio.run(scenario())
+
+
+def test_group_commit_failure_is_raised_to_the_caller(db_url):
+    async def scenario():
+        storage = FlakyStorage(failures=1, logger=logger, db_url=db_url)
+        journal = ProcessJournal(logger=logger, storage=storage)
+        with pytest.raises(RuntimeError):
+            await journal.save_process(1, ListeningProcessData(id_transaction=1))
+        await journal.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+import json
+
+import pydantic
+import pytest
+
+from conftest import webhook_payload
+from fedapay_connector.enums import TransactionStatus
+from fedapay_connector.models import (
+    LazyWebhookTransaction,
+    WebhookHistory,
+    WebhookTransaction,
+)
+
+
+def test_header_is_read_without_validating_the_rest():
+    # compte invalide : seul l'accès au webhook complet doit échouer
+    body = json.loads(webhook_payload(7, reference="ref-7"))
+    body["account"] = {"id": "pas-un-entier"}
+    raw = json.dumps(body).encode("utf-8")
+
+    webhook = LazyWebhookTransaction(raw)
+    assert webhook.name == "transaction.approved"
+    assert webhook.id_transaction == 7
+    assert webhook.status == TransactionStatus.approved
+    # le corps reçu est retransmis tel quel
+    assert webhook.model_dump_json() == raw.decode("utf-8")
+    with pytest.raises(pydantic.ValidationError):
+        webhook.full
+
+
+@pytest.mark.parametrize("kind", [bytes, str, dict])
+def test_full_validation_matches_eager_model(kind):
+    raw = webhook_payload(8, reference="ref-8", amount=1500)
+    if kind is str:
+        raw = raw.decode("utf-8")
+    elif kind is dict:
+        raw = json.loads(raw)
+
+    webhook = LazyWebhookTransaction(raw)
+    eager = (
+        WebhookTransaction.model_validate(raw)
+        if kind is dict
+        else WebhookTransaction.model_validate_json(raw)
+    )
+    assert webhook.full == eager
+    # attributs absents de l'en-tête : délégués au webhook complet, validé une seule fois
+    assert webhook.entity.reference == "ref-8"
+    assert webhook.full is webhook.full
+    assert isinstance(webhook.validate(WebhookHistory), WebhookHistory)
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+tomllib = pytest.importorskip("tomllib")
+
+PYPROJECT = os.path.join(os.path.dirname(__file__), os.pardir, "pyproject.toml")
+
+
+def load_project() -> dict:
+    with open(PYPROJECT, "rb") as file:
+        return tomllib.load(file)["project"]
+
+
+def test_project_metadata_is_well_formed():
+    project = load_project()
+
+    assert project["license-files"] == ["LICEN[CS]E*"]
+    assert set(project["optional-dependencies"]) == {"parquet"}
+
+
+def test_every_dependency_is_a_valid_requirement():
+    requirements = pytest.importorskip("packaging.requirements")
+    project = load_project()
+
+    declared = list(project["dependencies"])
+    for extra in project["optional-dependencies"].values():
+        declared.extend(extra)
+    for requirement in declared:
+        requirements.Requirement(requirement)
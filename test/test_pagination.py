@@ -0,0 +1,81 @@
+import asyncio
+
+from aiohttp import web
+
+from conftest import fake_server
+from fedapay_connector.integration import Integration
+from fedapay_connector.integrations.pagination import iter_paginated
+from fedapay_connector.models import TransactionListResponse
+
+TOTAL_PAGES = 3
+PER_PAGE = 2
+
+
+def page_body(page: int) -> dict:
+    return {
+        "v1/transactions": [
+            {"id": (page - 1) * PER_PAGE + index + 1, "status": "approved"}
+            for index in range(PER_PAGE)
+        ],
+        "meta": {
+            "current_page": page,
+            "next_page": page + 1 if page < TOTAL_PAGES else None,
+            "per_page": PER_PAGE,
+            "total_pages": TOTAL_PAGES,
+            "total_count": TOTAL_PAGES * PER_PAGE,
+        },
+    }
+
+
+def test_iter_transactions_walks_every_page(tmp_path):
+    routes = web.RouteTableDef()
+    requested = []
+
+    @routes.get("/v1/transactions/search")
+    async def search(request):
+        requested.append(dict(request.query))
+        return web.json_response(page_body(int(request.query["page"])))
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            async with Integration(api_url=base_url, default_api_key="sk_test") as api:
+                return [
+                    transaction.id
+                    async for transaction in api.iter_transactions(
+                        {"status": "approved"}, per_page=PER_PAGE
+                    )
+                ]
+
+    assert asyncio.run(scenario()) == list(range(1, TOTAL_PAGES * PER_PAGE + 1))
+    assert [query["page"] for query in requested] == ["1", "2", "3"]
+    assert {(query["status"], query["per_page"]) for query in requested} == {
+        ("approved", str(PER_PAGE))
+    }
+
+
+def test_next_page_is_prefetched_and_cancelled_on_early_stop():
+    started = []
+    cancelled = []
+
+    async def fetch_page(params):
+        started.append(params["page"])
+        try:
+            await asyncio.sleep(0 if params["page"] == 1 else 60)
+        except asyncio.CancelledError:
+            cancelled.append(params["page"])
+            raise
+        return TransactionListResponse(**page_body(params["page"]))
+
+    async def scenario():
+        pages = iter_paginated(fetch_page, "transactions", per_page=PER_PAGE)
+        first = await pages.__anext__()
+        await asyncio.sleep(0)
+        # la page 2 se charge pendant la consommation de la page 1
+        prefetching = list(started)
+        await pages.aclose()
+        return first.id, prefetching
+
+    first, prefetching = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert first == 1
+    assert prefetching == [1, 2]
+    assert cancelled == [2]
@@ -0,0 +1,75 @@
+import asyncio
+import itertools
+
+from aiohttp import web
+
+from conftest import fake_server
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import Pays, TypesPaiement
+from fedapay_connector.models import PaiementSetup, PaymentRequest
+
+
+def test_listeners_are_registered_per_payment_and_survive_an_early_break(tmp_path):
+    routes = web.RouteTableDef()
+    ids = itertools.count(1)
+
+    @routes.post("/v1/transactions")
+    async def create(request):
+        id_transaction = next(ids)
+        # les paiements suivants restent en cours quand le premier est restitué
+        await asyncio.sleep(0 if id_transaction == 1 else 0.2)
+        return web.json_response(
+            {
+                "v1/transaction": {
+                    "id": id_transaction,
+                    "status": "pending",
+                    "payment_token": f"tok_{id_transaction}",
+                    "payment_url": f"https://checkout.fedapay.com/tok_{id_transaction}",
+                }
+            }
+        )
+
+    requests = [
+        PaymentRequest(
+            setup=PaiementSetup(
+                pays=Pays.benin, type_paiement=TypesPaiement.AVEC_REDIRECTION
+            ),
+            montant_paiement=1000,
+            description=f"Commande {index}",
+            api_key="sk_test",
+        )
+        for index in range(3)
+    ]
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+            )
+            event_manager = connector._event_manager
+            batch = connector.fedapay_pay_many(
+                requests, concurrency=3, register_listeners=True
+            )
+            async for item in batch:
+                # écoute en place et persistée avant même la restitution du résultat
+                first = item.result.transaction_data.id
+                listening = event_manager.has_future(first)
+                persisted = await event_manager._event_persit_storage.count_processes()
+                break
+            await batch.aclose()
+            # les paiements en cours ne sont pas annulés par l'interruption
+            await asyncio.wait_for(
+                asyncio.gather(*connector._callback_tasks), timeout=5
+            )
+            registered = [event_manager.has_future(i) for i in (1, 2, 3)]
+            await event_manager.cancel_all("fin du test")
+            await connector._http_client.close()
+            await event_manager.close()
+            return first, listening, persisted, registered
+
+    first, listening, persisted, registered = asyncio.run(scenario())
+    assert first == 1
+    assert listening and persisted == 1
+    assert registered == [True, True, True]
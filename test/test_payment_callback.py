@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from conftest import fake_server
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import Pays, TransactionStatus, TypesPaiement
+from fedapay_connector.models import (
+    PaiementSetup,
+    FedapayPay,
+    PaymentHistory,
+    PaymentStagesLatency,
+    Transaction,
+    TransactionPaymentMethodResponse,
+    TransactionToken,
+)
+
+
+def make_payment() -> FedapayPay:
+    return FedapayPay(
+        status=TransactionStatus.pending,
+        transaction_data=Transaction(
+            klass="v1/transaction",
+            id=1042,
+            reference="trx_test",
+            amount=1500,
+            status=TransactionStatus.pending,
+            created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            custom_metadata={"order": "A-1"},
+        ),
+        link_and_token_data=TransactionToken(
+            token="tok_test", url="https://checkout.fedapay.com/tok_test"
+        ),
+        set_methode_data=TransactionPaymentMethodResponse(
+            reference="trx_test", status=TransactionStatus.pending
+        ),
+        latency=PaymentStagesLatency(create_transaction=0.1, total=0.2),
+    )
+
+
+def test_constructed_copy_equals_validated_model():
+    result = make_payment()
+    constructed = PaymentHistory.model_construct(**dict(result))
+    validated = PaymentHistory.model_validate(result.model_dump(by_alias=True))
+    assert constructed == validated
+    assert constructed.model_dump() == validated.model_dump()
+
+
+def test_payment_callback_runs_outside_the_payment_path(tmp_path):
+    routes = web.RouteTableDef()
+    received = []
+    release = asyncio.Event()
+
+    @routes.post("/v1/transactions")
+    async def create(request):
+        return web.json_response(
+            {
+                "v1/transaction": {
+                    "id": 7,
+                    "status": "pending",
+                    "payment_token": "tok_7",
+                    "payment_url": "https://checkout.fedapay.com/tok_7",
+                }
+            }
+        )
+
+    async def callback(history: PaymentHistory):
+        # un callback lent ne doit pas retarder le retour de fedapay_pay
+        await release.wait()
+        received.append(history)
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+            )
+            connector.set_payment_callback_function(callback)
+            result = await asyncio.wait_for(
+                connector.fedapay_pay(
+                    setup=PaiementSetup(
+                        pays=Pays.benin, type_paiement=TypesPaiement.AVEC_REDIRECTION
+                    ),
+                    client_infos=None,
+                    montant_paiement=1000,
+                    description="Commande A-1",
+                    api_key="sk_test",
+                ),
+                timeout=5,
+            )
+            assert received == []
+            release.set()
+            await asyncio.gather(*connector._callback_tasks)
+            await connector._http_client.close()
+            return result
+
+    result = asyncio.run(scenario())
+    assert len(received) == 1
+    assert isinstance(received[0], PaymentHistory)
+    assert received[0].transaction_data == result.transaction_data
+    assert result.latency.get_token is None
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from conftest import logger, make_event_manager, webhook_payload
+from fedapay_connector.event_storage import ProcessPersistance
+from fedapay_connector.models import LazyWebhookTransaction, ListeningProcessData
+
+
+@pytest.fixture(params=["sqlite", "sqlite+aiosqlite"])
+def storage_url(request, tmp_path):
+    return f"{request.param}:///{tmp_path}/processes.db"
+
+
+def test_storage_round_trip_with_sync_and_async_drivers(storage_url):
+    async def scenario():
+        storage = ProcessPersistance(logger=logger, db_url=storage_url)
+        await storage.save_process(1, ListeningProcessData(id_transaction=1))
+        await storage.save_process(2, ListeningProcessData(id_transaction=2))
+        await storage.update_process(
+            2, ListeningProcessData(id_transaction=2, deadline=123.0)
+        )
+        await storage.delete_process(1)
+        processes = await storage.load_processes()
+        count = await storage.count_processes()
+        await storage.close()
+        return processes, count
+
+    processes, count = asyncio.run(scenario())
+    assert count == 1
+    assert [p.StoredListeningProcess_transaction_id for p in processes] == [2]
+    data = ListeningProcessData.model_validate_json(
+        processes[0].StoredListeningProcess_process_data
+    )
+    assert data.deadline == 123.0
+
+
+def test_sync_pop_event_data_deletes_persisted_process(db_url):
+    async def scenario():
+        manager = make_event_manager(db_url)
+        # processus persisté sans écoute active : seule la suppression par pop_event_data l'efface
+        await manager._event_persit_storage.save_process(
+            7, ListeningProcessData(id_transaction=7)
+        )
+        await manager.set_event_data(LazyWebhookTransaction(webhook_payload(7)))
+        # API synchrone des versions 2.0.x : pas d'await
+        events = manager.pop_event_data(7)
+        await manager.close()
+        storage = ProcessPersistance(logger=logger, db_url=db_url)
+        remaining = await storage.count_processes()
+        await storage.close()
+        return events, remaining
+
+    events, remaining = asyncio.run(scenario())
+    assert [event.name for event in events] == ["transaction.approved"]
+    assert remaining == 0
+
+
+def test_pop_event_data_async_returns_none_without_events(db_url):
+    async def scenario():
+        manager = make_event_manager(db_url)
+        events = await manager.pop_event_data_async(404)
+        await manager.close()
+        return events
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from conftest import fake_server, logger
+from fedapay_connector.integrations import HttpClient
+from fedapay_connector.integrations.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    TokenBucket,
+    endpoint_class,
+    parse_retry_after,
+)
+
+
+def test_retry_after_header_parsing():
+    assert parse_retry_after({"Retry-After": "2.5"}) == 2.5
+    assert parse_retry_after({"Retry-After": "-3"}) == 0.0
+    http_date = formatdate(time.time() + 30, usegmt=True)
+    assert 25 < parse_retry_after({"Retry-After": http_date}) <= 30
+    assert parse_retry_after({"Retry-After": "bientôt"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
+
+
+def test_endpoint_class_groups_by_resource_and_kind():
+    url = "https://api.fedapay.com/v1/transactions/42/token"
+    assert endpoint_class("GET", url) == "transactions:read"
+    assert endpoint_class("post", url) == "transactions:write"
+    assert endpoint_class("GET", "https://api.fedapay.com/balances") == "balances:read"
+
+
+def test_aimd_limit_halves_once_per_cooldown_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, decrease_cooldown=60)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire()
+        # une même rafale de refus ne réduit la limite qu'une fois
+        limiter.release(overloaded=True)
+        limiter.release(overloaded=True)
+        reduced = limiter.limit
+        limiter.release()
+        return reduced
+
+    assert asyncio.run(scenario()) == 4
+    assert limiter.limit == pytest.approx(4.25)
+    assert limiter.in_flight == 0
+
+
+def test_concurrency_is_bounded_and_a_cancelled_waiter_frees_nothing():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=2)
+    peak = 0
+
+    async def request(duration: float):
+        nonlocal peak
+        await limiter.acquire()
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(duration)
+        limiter.release()
+
+    async def scenario():
+        tasks = [asyncio.create_task(request(0.01)) for _ in range(6)]
+        await asyncio.sleep(0)
+        # un appelant en attente annulé ne consomme ni ne rend d'emplacement
+        tasks[-1].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def scenario():
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # un jeton immédiat, puis un toutes les 20 ms
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def test_429_reduces_the_lane_and_pauses_it_for_retry_after():
+    routes = web.RouteTableDef()
+    answered = []
+
+    @routes.get("/v1/transactions/{id}")
+    async def get_transaction(request):
+        answered.append(time.monotonic())
+        if len(answered) == 1:
+            return web.json_response({}, status=429, headers={"Retry-After": "0.2"})
+        return web.json_response({"v1/transaction": {"id": 1}})
+
+    async def scenario():
+        limiter = RateLimiter(max_concurrency=8)
+        async with fake_server(routes) as base_url:
+            client = HttpClient(logger, coalesce_reads=False, rate_limiter=limiter)
+            url = f"{base_url}/v1/transactions/1"
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.request_json("GET", url, api_key="sk_test_1234")
+            stats = client.rate_limit_stats()[0]
+            await client.request_json("GET", url, api_key="sk_test_1234")
+            await client.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats.lane == "…1234 transactions:read"
+    assert (stats.concurrency_limit, stats.throttled) == (4, 1)
+    assert stats.paused_for > 0
+    # la requête suivante a attendu la fin de la pause
+    assert answered[1] - answered[0] >= 0.15
+
+
+def test_idle_lanes_are_evicted_but_busy_ones_are_kept():
+    limiter = RateLimiter(max_lanes=2, lane_idle_ttl=60)
+    url = "https://api.fedapay.com/v1/transactions"
+
+    async def scenario():
+        busy = limiter.lane("sk_busy", "GET", url)
+        await busy.acquire()
+        for index in range(5):
+            limiter.lane(f"sk_{index}", "GET", url)
+        lanes = [stats.lane for stats in limiter.stats()]
+        busy.release()
+        return lanes
+
+    # au-delà de deux voies, les moins récemment utilisées sont évincées, sauf la voie occupée
+    assert asyncio.run(scenario()) == [
+        "…busy transactions:read",
+        "…sk_4 transactions:read",
+    ]
+
+    limiter.lane_idle_ttl = 0
+    limiter.lane("sk_new", "POST", url)
+    # voies inutilisées au-delà de leur durée de vie : seule la nouvelle reste
+    assert [stats.lane for stats in limiter.stats()] == ["…_new transactions:write"]
@@ -0,0 +1,68 @@
+import asyncio
+
+from aiohttp import web
+
+from conftest import fake_server
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.models import ListeningProcessData
+
+PROCESSES = 300
+
+
+def test_status_requests_are_bounded_across_concurrent_chunks(tmp_path):
+    routes = web.RouteTableDef()
+    in_flight = 0
+    peak = 0
+    served = 0
+
+    @routes.get("/v1/transactions/{id}")
+    async def get_transaction(request):
+        nonlocal in_flight, peak, served
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        served += 1
+        return web.json_response(
+            {
+                "v1/transaction": {
+                    "id": int(request.match_info["id"]),
+                    "status": "approved",
+                }
+            }
+        )
+
+    finished = []
+
+    async def on_reload_finished(result, events):
+        finished.append(events[0].entity.id)
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+                reload_chunk_size=50,
+                reload_status_concurrency=4,
+            )
+            connector.default_api_key = "sk_test"
+            connector.set_on_persited_listening_processes_loading_finished_callback(
+                on_reload_finished
+            )
+            await connector._event_manager._event_persit_storage.save_processes(
+                [
+                    (i, ListeningProcessData(id_transaction=i))
+                    for i in range(1, PROCESSES + 1)
+                ]
+            )
+            await connector.load_persisted_listening_processes()
+            # les lots sont réconciliés en tâches de fond, tous en même temps
+            while len(finished) < PROCESSES:
+                await asyncio.sleep(0.01)
+            await connector._http_client.close()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=30))
+    assert served == PROCESSES
+    assert sorted(finished) == list(range(1, PROCESSES + 1))
+    assert peak <= 4
@@ -0,0 +1,111 @@
+import asyncio
+
+from conftest import make_event_manager
+from fedapay_connector.db_models import StoredListeningProcess
+from fedapay_connector.enums import ExceptionOnProcessReloadBehavior
+from fedapay_connector.models import ListeningProcessData
+
+
+async def persist(manager, count: int):
+    await manager._event_persit_storage.save_processes(
+        [(i, ListeningProcessData(id_transaction=i)) for i in range(1, count + 1)]
+    )
+
+
+def test_unit_reload_streams_all_processes_in_chunks(db_url):
+    reloaded = []
+    progress = []
+
+    async def reload_callback(data: ListeningProcessData):
+        reloaded.append(data.id_transaction)
+
+    async def on_progress(loaded: int, total: int):
+        progress.append((loaded, total))
+
+    async def scenario():
+        manager = make_event_manager(db_url, reload_chunk_size=4)
+        await persist(manager, 10)
+        manager.set_run_at_persisted_process_reload_callback(reload_callback)
+        manager.set_reload_progress_callback(on_progress)
+        await manager.load_persisted_processes()
+        await asyncio.sleep(0)
+        remaining = await manager._event_persit_storage.count_processes()
+        await manager.close()
+        return remaining
+
+    assert asyncio.run(scenario()) == 0
+    assert sorted(reloaded) == list(range(1, 11))
+    assert progress == [(4, 10), (8, 10), (10, 10)]
+
+
+def test_batch_reload_receives_one_call_per_chunk(db_url):
+    batches = []
+
+    async def batch_callback(processes: list[ListeningProcessData]):
+        batches.append([data.id_transaction for data in processes])
+
+    async def scenario():
+        manager = make_event_manager(db_url, reload_chunk_size=4)
+        await persist(manager, 10)
+        manager.set_run_at_persisted_processes_batch_reload_callback(batch_callback)
+        await manager.load_persisted_processes()
+        await asyncio.sleep(0)
+        remaining = await manager._event_persit_storage.count_processes()
+        await manager.close()
+        return remaining
+
+    assert asyncio.run(scenario()) == 0
+    assert batches == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+
+def test_reload_retry_counter_is_released_when_retries_end(db_url):
+    reloaded = []
+
+    async def reload_callback(data: ListeningProcessData):
+        reloaded.append(data.id_transaction)
+
+    async def scenario():
+        manager = make_event_manager(
+            db_url,
+            on_listening_reload_exception=ExceptionOnProcessReloadBehavior.KEEP_AND_RETRY,
+            sleeping_before_retry_delay=0,
+        )
+        manager.set_run_at_persisted_process_reload_callback(reload_callback)
+        storage = manager._event_persit_storage
+        delete_process = storage.delete_process
+        failures = {1: 1}
+
+        async def flaky_delete(transaction_id: int):
+            # le processus 1 échoue une fois puis se recharge ; le processus 2 n'est jamais lisible
+            if failures.get(transaction_id):
+                failures[transaction_id] -= 1
+                raise RuntimeError("base indisponible")
+            await delete_process(transaction_id=transaction_id)
+
+        storage.delete_process = flaky_delete
+        await manager._load_persisted_process(
+            StoredListeningProcess(
+                StoredListeningProcess_transaction_id=1,
+                StoredListeningProcess_process_data=ListeningProcessData(
+                    id_transaction=1, created_at=0
+                ).model_dump_json(),
+            )
+        )
+        await manager._load_persisted_process(
+            StoredListeningProcess(
+                StoredListeningProcess_transaction_id=2,
+                StoredListeningProcess_process_data="illisible",
+            )
+        )
+        # reprises différées : attendues jusqu'à leur fin
+        for _ in range(200):
+            if not manager._pending:
+                break
+            await asyncio.sleep(0.01)
+        pending = dict(manager._pending)
+        await manager.close()
+        return pending
+
+    # réussite après reprise comme abandon après le maximum : plus rien n'est retenu en mémoire
+    assert asyncio.run(asyncio.wait_for(scenario(), 5)) == {}
+    assert set(reloaded) == {1}
@@ -0,0 +1,219 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from conftest import fake_server, logger
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import Pays, TransactionStatus, TypesPaiement
+from fedapay_connector.integration import Integration
+from fedapay_connector.integrations import HttpClient, RetryPolicy
+from fedapay_connector.models import PaiementSetup
+
+
+async def with_integration(routes, scenario):
+    async with fake_server(routes) as base_url:
+        client = HttpClient(logger, retry_policy=RetryPolicy(backoff_base=0.01))
+        async with Integration(
+            api_url=base_url, default_api_key="sk_test", http_client=client
+        ) as api:
+            try:
+                return await scenario(api), client.retry_stats()
+            finally:
+                await client.close()
+
+
+def creation_routes(posts: list, created: dict) -> web.RouteTableDef:
+    routes = web.RouteTableDef()
+
+    @routes.post("/v1/transactions")
+    async def create(request):
+        body = await request.json()
+        posts.append(body)
+        # la transaction est créée mais la réponse se perd
+        created[body["merchant_reference"]] = {"id": 7, "status": "pending"}
+        return web.json_response({}, status=503)
+
+    @routes.get("/v1/transactions/merchant/{reference}")
+    async def by_reference(request):
+        transaction = created.get(request.match_info["reference"])
+        if transaction is None:
+            return web.json_response({}, status=404)
+        return web.json_response({"v1/transaction": transaction})
+
+    return routes
+
+
+def create(api: Integration, merchant_reference=None):
+    return api.create_transaction(
+        PaiementSetup(pays=Pays.benin, type_paiement=TypesPaiement.AVEC_REDIRECTION),
+        None,
+        1000,
+        merchant_reference=merchant_reference,
+        description="Commande test",
+    )
+
+
+def test_failed_creation_is_recovered_by_merchant_reference_without_a_second_post():
+    posts = []
+    created = {}
+
+    async def scenario(api):
+        return await create(api, merchant_reference="CMD-7")
+
+    transaction, stats = asyncio.run(
+        with_integration(creation_routes(posts, created), scenario)
+    )
+    assert transaction.id == 7
+    assert len(posts) == 1
+    assert (stats.retries, stats.recovered, stats.gave_up) == (1, 1, 0)
+
+
+def test_creation_without_merchant_reference_is_not_replayed():
+    posts = []
+
+    async def scenario(api):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await create(api)
+
+    asyncio.run(with_integration(creation_routes(posts, {}), scenario))
+    assert len(posts) == 1
+
+
+def delete_routes(answers: list, attempts: list) -> web.RouteTableDef:
+    routes = web.RouteTableDef()
+
+    @routes.delete("/v1/transactions/{id}")
+    async def delete(request):
+        attempts.append(request.match_info["id"])
+        status = answers[min(len(attempts), len(answers)) - 1]
+        return web.json_response({}, status=status)
+
+    return routes
+
+
+def test_retried_delete_finding_the_transaction_gone_is_a_success():
+    attempts = []
+
+    async def scenario(api):
+        return await api.delete_transaction("3")
+
+    result, stats = asyncio.run(
+        with_integration(delete_routes([503, 404], attempts), scenario)
+    )
+    assert attempts == ["3", "3"]
+    assert (result.delete_status, result.status_code) == (True, 404)
+    assert stats.retries == 1
+
+
+def test_retried_delete_refused_with_403_is_not_a_success():
+    attempts = []
+
+    async def scenario(api):
+        # 403 : transaction plus en attente (ex: approuvée entre les deux tentatives)
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await api.delete_transaction("3")
+        return error.value.status
+
+    status, _ = asyncio.run(
+        with_integration(delete_routes([503, 403], attempts), scenario)
+    )
+    assert attempts == ["3", "3"]
+    assert status == 403
+
+
+def test_delete_refused_on_first_attempt_still_raises():
+    async def scenario(api):
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await api.delete_transaction("3")
+        return error.value.status
+
+    status, _ = asyncio.run(with_integration(delete_routes([403], []), scenario))
+    assert status == 403
+
+
+def test_unexpected_success_status_is_reported_as_not_deleted():
+    async def scenario(api):
+        return await api.delete_transaction("3")
+
+    result, _ = asyncio.run(with_integration(delete_routes([202], []), scenario))
+    assert (result.delete_status, result.status_code) == (False, 202)
+    assert "202" in result.message
+
+
+def test_timeout_callback_handles_an_unexpected_delete_error(tmp_path):
+    routes = web.RouteTableDef()
+
+    @routes.get("/v1/transactions/{id}")
+    async def get_transaction(request):
+        return web.json_response(
+            {
+                "v1/transaction": {
+                    "id": int(request.match_info["id"]),
+                    "status": "pending",
+                }
+            }
+        )
+
+    @routes.delete("/v1/transactions/{id}")
+    async def delete(request):
+        return web.json_response({"message": "requête invalide"}, status=400)
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+            )
+            connector.default_api_key = "sk_test"
+            try:
+                return await connector._run_on_transaction_timeout_callback(11)
+            finally:
+                await connector._http_client.close()
+                await connector._event_manager.close()
+
+    # l'erreur laisse la transaction expirer au lieu de lever
+    assert asyncio.run(asyncio.wait_for(scenario(), 10)) is True
+
+
+def test_timeout_callback_resolves_a_payment_approved_during_the_delete_retry(
+    tmp_path,
+):
+    routes = web.RouteTableDef()
+    deletes = []
+
+    @routes.get("/v1/transactions/{id}")
+    async def get_transaction(request):
+        status = "approved" if deletes else "pending"
+        return web.json_response(
+            {"v1/transaction": {"id": int(request.match_info["id"]), "status": status}}
+        )
+
+    @routes.delete("/v1/transactions/{id}")
+    async def delete(request):
+        deletes.append(1)
+        return web.json_response({}, status=503 if len(deletes) == 1 else 403)
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+                http_retry_backoff=0.01,
+            )
+            connector.default_api_key = "sk_test"
+            try:
+                timed_out = await connector._run_on_transaction_timeout_callback(12)
+                return timed_out, connector._transaction_cache.get(12)
+            finally:
+                await connector._http_client.close()
+                await connector._event_manager.close()
+
+    timed_out, cached = asyncio.run(asyncio.wait_for(scenario(), 10))
+    # la transaction payée est résolue au lieu d'expirer
+    assert timed_out is False
+    assert len(deletes) == 2
+    assert cached.status == TransactionStatus.approved
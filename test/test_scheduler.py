@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+from conftest import logger
+from fedapay_connector.scheduler import TimeoutScheduler
+
+
+def run_scheduler(setup, wait: float = 0.2):
+    fired = []
+
+    async def on_timeout(key):
+        fired.append(key)
+
+    async def scenario():
+        scheduler = TimeoutScheduler(logger, on_timeout)
+        setup(scheduler)
+        await asyncio.sleep(wait)
+        return scheduler
+
+    return asyncio.run(scenario()), fired
+
+
+def test_timeouts_fire_in_deadline_order():
+    def setup(scheduler):
+        scheduler.schedule("c", 0.06)
+        scheduler.schedule("a", 0.02)
+        scheduler.schedule("b", 0.04)
+        # échéance déjà passée : expire au prochain tour de boucle
+        scheduler.schedule_at("now", time.time() - 10)
+
+    scheduler, fired = run_scheduler(setup)
+    assert fired == ["now", "a", "b", "c"]
+    assert len(scheduler) == 0
+
+
+def test_cancelled_timeout_never_fires():
+    def setup(scheduler):
+        scheduler.schedule("a", 0.02)
+        scheduler.schedule("b", 0.03)
+        assert scheduler.cancel("a") is True
+        assert scheduler.cancel("a") is False
+        assert "a" not in scheduler
+
+    scheduler, fired = run_scheduler(setup)
+    assert fired == ["b"]
+
+
+def test_rescheduling_replaces_previous_deadline():
+    def setup(scheduler):
+        scheduler.schedule("a", 0.02)
+        scheduler.schedule("b", 0.04)
+        scheduler.schedule("a", 0.08)
+        assert scheduler.get_deadline("a") > scheduler.get_deadline("b")
+
+    scheduler, fired = run_scheduler(setup, wait=0.15)
+    # "a" n'expire qu'une fois, à sa nouvelle échéance
+    assert fired == ["b", "a"]
+
+
+def test_cancelled_entries_are_compacted():
+    def setup(scheduler):
+        for key in range(200):
+            scheduler.schedule(key, 0.01 if key == 0 else 60)
+        for key in range(1, 200):
+            scheduler.cancel(key)
+
+    scheduler, fired = run_scheduler(setup, wait=0.05)
+    assert fired == [0]
+    assert len(scheduler) == 0
+    assert scheduler._heap == []
+
+
+def test_heap_is_compacted_on_cancel_before_any_deadline_fires():
+    def setup(scheduler):
+        for key in range(1000):
+            scheduler.schedule(key, 60)
+        # la plupart des écoutes se résolvent bien avant leur échéance
+        for key in range(990):
+            scheduler.cancel(key)
+        for _ in range(5):
+            scheduler.schedule(995, 60)
+
+    scheduler, fired = run_scheduler(setup, wait=0.01)
+    assert fired == []
+    assert len(scheduler) == 10
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+
+
+def test_stop_cancels_pending_timeouts():
+    def setup(scheduler):
+        scheduler.schedule("a", 0.02)
+        scheduler.stop()
+
+    scheduler, fired = run_scheduler(setup, wait=0.05)
+    assert fired == []
+    assert len(scheduler) == 0
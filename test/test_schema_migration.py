@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    inspect,
+    select,
+)
+
+from conftest import logger
+from fedapay_connector.event_storage import ProcessPersistance
+
+# schéma de la table avant la version indexée (ni index ni colonne d'échéance)
+baseline_metadata = MetaData()
+baseline_table = Table(
+    "StoredListeningProcess",
+    baseline_metadata,
+    Column("StoredEventWaitingProcess_id", Integer, primary_key=True),
+    Column("StoredListeningProcess_transaction_id", Integer, nullable=False),
+    Column("StoredListeningProcess_process_data", String, nullable=True),
+    Column(
+        "StoredListeningProcess_created_at",
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
+
+
+def test_baseline_table_with_duplicates_is_migrated(db_url):
+    engine = create_engine(db_url)
+    baseline_metadata.create_all(engine)
+    rows = [(1, "a-old"), (2, "b"), (1, "a-mid"), (3, "c-old"), (1, "a-new")]
+    rows += [(3, "c-new")]
+    with engine.begin() as connection:
+        connection.execute(
+            baseline_table.insert(),
+            [
+                {
+                    "StoredListeningProcess_transaction_id": transaction_id,
+                    "StoredListeningProcess_process_data": data,
+                    "StoredListeningProcess_created_at": datetime(2025, 1, 1),
+                }
+                for transaction_id, data in rows
+            ],
+        )
+    engine.dispose()
+
+    storage = ProcessPersistance(logger=logger, db_url=db_url)
+
+    engine = create_engine(db_url)
+    with engine.connect() as connection:
+        remaining = connection.execute(
+            select(
+                baseline_table.c.StoredListeningProcess_transaction_id,
+                baseline_table.c.StoredListeningProcess_process_data,
+            ).order_by(baseline_table.c.StoredListeningProcess_transaction_id)
+        ).all()
+        inspector = inspect(connection)
+        columns = {
+            column["name"] for column in inspector.get_columns("StoredListeningProcess")
+        }
+        indexes = {
+            index["name"]: index["unique"]
+            for index in inspector.get_indexes("StoredListeningProcess")
+        }
+    engine.dispose()
+
+    assert remaining == [(1, "a-new"), (2, "b"), (3, "c-new")]
+    assert "StoredListeningProcess_deadline" in columns
+    assert indexes["ix_StoredListeningProcess_transaction_id"]
+    assert "ix_StoredListeningProcess_created_at" in indexes
+
+    # la table migrée est utilisable : une sauvegarde met à jour la ligne existante
+    async def scenario():
+        await storage.save_process(1, None)
+        count = await storage.count_processes()
+        await storage.close()
+        return count
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_migration_is_idempotent(db_url):
+    ProcessPersistance(logger=logger, db_url=db_url)
+    # seconde initialisation sur une table déjà à jour : rien à migrer
+    storage = ProcessPersistance(logger=logger, db_url=db_url)
+
+    async def scenario():
+        count = await storage.count_processes()
+        await storage.close()
+        return count
+
+    assert asyncio.run(scenario()) == 0
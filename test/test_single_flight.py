@@ -0,0 +1,130 @@
+import asyncio
+import gc
+
+import pytest
+from aiohttp import web
+
+from conftest import fake_server, logger
+from fedapay_connector.integrations import HttpClient
+from fedapay_connector.integrations.single_flight import SingleFlight
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        executions = []
+
+        async def call():
+            executions.append(1)
+            await release.wait()
+            return "résultat"
+
+        first = asyncio.create_task(flight.do("clé", call))
+        second = asyncio.create_task(flight.do("clé", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        release.set()
+        result = await asyncio.wait_for(second, timeout=5)
+        return first.cancelled(), result, len(executions), flight.stats()
+
+    first_cancelled, result, executions, stats = asyncio.run(scenario())
+    assert first_cancelled
+    assert result == "résultat"
+    assert executions == 1
+    assert (stats.calls, stats.executed, stats.merged, stats.in_flight) == (2, 1, 1, 0)
+
+
+def test_call_abandoned_by_every_caller_completes_and_releases_its_key():
+    unretrieved = []
+
+    def exception_handler(loop, context):
+        unretrieved.append(context)
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(exception_handler)
+        flight = SingleFlight()
+        release = asyncio.Event()
+        finished = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            finished.set()
+            raise RuntimeError("erreur réseau")
+
+        callers = [asyncio.create_task(flight.do("clé", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        # la requête partagée va à son terme malgré l'annulation de tous ses appelants
+        release.set()
+        await asyncio.wait_for(finished.wait(), timeout=5)
+        await asyncio.sleep(0)
+        in_flight = flight.stats().in_flight
+
+        async def succeeding():
+            return "nouvelle exécution"
+
+        # clé libérée : l'appel suivant exécute une nouvelle requête
+        return in_flight, await flight.do("clé", succeeding)
+
+    in_flight, result = asyncio.run(scenario())
+    gc.collect()
+    assert in_flight == 0
+    assert result == "nouvelle exécution"
+    assert unretrieved == []
+
+
+def test_error_is_shared_by_all_waiting_callers():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("erreur réseau")
+
+        return await asyncio.gather(
+            *(flight.do("clé", failing) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(scenario())
+    assert len({id(error) for error in errors}) == 1
+    with pytest.raises(RuntimeError):
+        raise errors[0]
+
+
+def test_concurrent_identical_gets_send_one_request():
+    routes = web.RouteTableDef()
+    hits = []
+
+    @routes.get("/v1/balances")
+    async def balances(request):
+        hits.append(dict(request.query))
+        await asyncio.sleep(0.05)
+        return web.json_response({"v1/balances": []})
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            client = HttpClient(logger)
+            url = f"{base_url}/v1/balances"
+            same = await asyncio.gather(
+                *(
+                    client.request_json("GET", url, api_key="sk", params={"page": 1})
+                    for _ in range(5)
+                )
+            )
+            # une clé API différente n'est pas regroupée
+            other = await client.request_json(
+                "GET", url, api_key="sk_autre", params={"page": 1}
+            )
+            stats = client.single_flight_stats()
+            await client.close()
+            return same, other, stats
+
+    same, other, stats = asyncio.run(scenario())
+    assert same == [{"v1/balances": []}] * 5
+    assert other == {"v1/balances": []}
+    assert len(hits) == 2
+    assert (stats.executed, stats.merged) == (2, 4)
@@ -0,0 +1,134 @@
+import asyncio
+
+from aiohttp import web
+
+from conftest import fake_server, logger, webhook_payload
+from fedapay_connector.cache import TransactionCache
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import TransactionStatus
+from fedapay_connector.models import LazyWebhookTransaction, Transaction
+
+
+def transaction(id_transaction: int, status: str, **fields) -> Transaction:
+    return Transaction(id=id_transaction, status=status, **fields)
+
+
+def test_pending_entries_expire_and_final_ones_do_not():
+    cache = TransactionCache(logger, ttl=0)
+    cache.put(transaction(1, "pending"))
+    cache.put(transaction(2, "approved"))
+
+    assert cache.get(1) is None
+    assert cache.get(2).status == TransactionStatus.approved
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evicted_expired) == (1, 1, 1)
+
+
+def test_least_recently_read_entry_is_evicted():
+    cache = TransactionCache(logger, max_entries=2)
+    cache.put(transaction(1, "approved", merchant_reference="CMD-1"))
+    cache.put(transaction(2, "approved"))
+    assert cache.get_by_merchant_reference("CMD-1").id == 1
+    cache.put(transaction(3, "approved"))
+
+    assert cache.get(2) is None
+    assert [cache.get(1).id, cache.get(3).id] == [1, 3]
+    assert cache.stats().evicted_capacity == 1
+
+
+def test_webhook_replaces_the_cached_transaction():
+    cache = TransactionCache(logger)
+    cache.put(transaction(5, "pending"))
+    cache.update_from_webhook(
+        LazyWebhookTransaction(webhook_payload(5, merchant_reference="CMD-5"))
+    )
+
+    # transaction finale : servie même aux lectures qui exigent un statut final
+    cached = cache.get(5, final_only=True)
+    assert cached.status == TransactionStatus.approved
+    assert cache.get_by_merchant_reference("CMD-5").id == 5
+    assert cache.stats().webhook_updates == 1
+
+
+def test_late_pending_webhook_does_not_replace_a_final_status():
+    cache = TransactionCache(logger)
+    cache.put(transaction(6, "approved"))
+    cache.update_from_webhook(
+        LazyWebhookTransaction(webhook_payload(6, name="transaction.created"))
+    )
+    assert cache.get(6).status == TransactionStatus.approved
+
+    # un statut final plus récent (ex: remboursement) remplace bien l'entrée
+    cache.update_from_webhook(
+        LazyWebhookTransaction(webhook_payload(6, name="transaction.refunded"))
+    )
+    assert cache.get(6).status == TransactionStatus.refunded
+    assert cache.stats().webhook_updates == 1
+
+
+def test_final_entries_expire_after_final_ttl():
+    cache = TransactionCache(logger, final_ttl=0)
+    cache.put(transaction(8, "approved"))
+
+    assert cache.get(8) is None
+    assert cache.stats().evicted_expired == 1
+
+
+def test_bus_event_from_another_worker_updates_the_cache(tmp_path):
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False, db_url=f"sqlite:///{tmp_path}/p.db"
+        )
+        connector._transaction_cache.put(transaction(4, "approved"))
+        await connector._on_bus_event(
+            LazyWebhookTransaction(webhook_payload(4, name="transaction.refunded"))
+        )
+        cached = connector._transaction_cache.get(4)
+        await connector._http_client.close()
+        await connector._event_manager.close()
+        return cached
+
+    assert asyncio.run(scenario()).status == TransactionStatus.refunded
+
+
+def test_connector_reads_hit_the_api_once_then_follow_webhooks(tmp_path):
+    routes = web.RouteTableDef()
+    calls = []
+
+    @routes.get("/v1/transactions/{id}")
+    async def get_transaction(request):
+        calls.append(request.match_info["id"])
+        return web.json_response(
+            {
+                "v1/transaction": {
+                    "id": int(request.match_info["id"]),
+                    "status": "pending",
+                }
+            }
+        )
+
+    async def scenario():
+        async with fake_server(routes) as base_url:
+            connector = FedapayConnector(
+                fedapay_api_url=base_url,
+                save_log_to_file=False,
+                db_url=f"sqlite:///{tmp_path}/p.db",
+            )
+            statuses = []
+            for _ in range(2):
+                result = await connector.fedapay_get_transaction_data(9, api_key="sk")
+                statuses.append(result.status)
+            await connector._process_webhook_data(webhook_payload(9))
+            result = await connector.fedapay_get_transaction_data(9, api_key="sk")
+            statuses.append(result.status)
+            await connector._http_client.close()
+            await connector._event_manager.close()
+            return statuses
+
+    statuses = asyncio.run(scenario())
+    assert statuses == [
+        TransactionStatus.pending,
+        TransactionStatus.pending,
+        TransactionStatus.approved,
+    ]
+    assert calls == ["9"]
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import sign, webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.models import WebhookTransaction
+from fedapay_connector.utils import verify_signature
+
+SECRET = "wh_sandbox_test_secret"
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, bytes.decode])
+def test_signature_is_verified_on_raw_body(wrap):
+    payload = webhook_payload(1)
+    assert verify_signature(wrap(payload), sign(payload, SECRET), SECRET)
+
+
+@pytest.mark.parametrize(
+    "header, detail",
+    [
+        ("garbage", "Malformed signature header"),
+        ("t=1,s=deadbeef", "Signature verification failed"),
+    ],
+)
+def test_invalid_signatures_are_rejected(header, detail):
+    with pytest.raises(HTTPException) as error:
+        verify_signature(webhook_payload(1), header, SECRET)
+    assert error.value.detail == detail
+
+
+def test_stale_signature_is_rejected():
+    payload = webhook_payload(1)
+    with pytest.raises(HTTPException) as error:
+        verify_signature(payload, sign(payload, SECRET, int(time.time()) - 600), SECRET)
+    assert error.value.detail == "Request is too old"
+
+
+def test_save_webhook_data_accepts_bytes_str_and_dict(tmp_path):
+    async def scenario():
+        connector = FedapayConnector(
+            save_log_to_file=False, db_url=f"sqlite:///{tmp_path}/p.db"
+        )
+        await connector.fedapay_save_webhook_data(webhook_payload(1))
+        await connector.fedapay_save_webhook_data(webhook_payload(2).decode())
+        await connector.fedapay_save_webhook_data(json.loads(webhook_payload(3)))
+        events = [connector._event_manager.pop_event_data(i) for i in (1, 2, 3)]
+        await connector._event_manager.close()
+        return events
+
+    events = asyncio.run(scenario())
+    for id_transaction, received in zip((1, 2, 3), events):
+        assert len(received) == 1
+        assert isinstance(received[0], WebhookTransaction)
+        assert received[0].entity.id == id_transaction
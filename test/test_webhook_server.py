@@ -0,0 +1,58 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from conftest import free_port, sign, webhook_payload
+from fedapay_connector.connector import FedapayConnector
+from fedapay_connector.enums import WebhookServerMode
+
+SECRET = "wh_sandbox_test_secret"
+
+
+@pytest.mark.parametrize("mode", [WebhookServerMode.IN_LOOP, WebhookServerMode.THREAD])
+def test_webhooks_are_handled_on_the_application_loop(tmp_path, mode):
+    port = free_port()
+    handled_on = []
+
+    async def webhook_callback(event):
+        handled_on.append((asyncio.get_running_loop(), event.entity.id))
+
+    async def scenario():
+        connector = FedapayConnector(
+            use_listen_server=True,
+            listen_server_port=port,
+            listen_server_endpoint_name="webhooks",
+            listen_server_mode=mode,
+            fedapay_webhooks_secret_key=SECRET,
+            save_log_to_file=False,
+            db_url=f"sqlite:///{tmp_path}/p.db",
+        )
+        connector.set_webhook_callback_function(webhook_callback)
+        connector.start_webhook_server()
+        payload = webhook_payload(31)
+        url = f"http://localhost:{port}/webhooks"
+        async with aiohttp.ClientSession() as session:
+            for _ in range(100):
+                try:
+                    async with session.post(
+                        url,
+                        data=payload,
+                        headers={
+                            "agregateur": "Fedapay",
+                            "x-fedapay-signature": sign(payload, SECRET),
+                        },
+                    ) as response:
+                        status = response.status
+                    break
+                except aiohttp.ClientConnectionError:
+                    # serveur pas encore démarré
+                    await asyncio.sleep(0.05)
+            while not handled_on:
+                await asyncio.sleep(0.01)
+        await connector.webhook_server.stop_webhook_listenning_async()
+        return asyncio.get_running_loop(), status
+
+    loop, status = asyncio.run(asyncio.wait_for(scenario(), timeout=20))
+    assert status == 200
+    assert handled_on == [(loop, 31)]